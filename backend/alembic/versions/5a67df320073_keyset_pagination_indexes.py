@@ -0,0 +1,32 @@
+"""keyset pagination indexes
+
+Revision ID: 5a67df320073
+Revises: 62833f48640f
+Create Date: 2026-10-18 10:41:12.508913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a67df320073'
+down_revision: Union[str, None] = '62833f48640f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_client_created_at_id', 'client', ['created_at', 'id'], unique=False)
+    op.create_index('ix_item_created_at_id', 'item', ['created_at', 'id'], unique=False)
+    op.create_index('ix_user_created_at_id', 'user', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_created_at_id', table_name='user')
+    op.drop_index('ix_item_created_at_id', table_name='item')
+    op.drop_index('ix_client_created_at_id', table_name='client')
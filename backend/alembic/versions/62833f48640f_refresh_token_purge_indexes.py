@@ -0,0 +1,30 @@
+"""refresh token purge indexes
+
+Revision ID: 62833f48640f
+Revises: 2bac99479a12
+Create Date: 2026-10-18 10:02:47.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62833f48640f'
+down_revision: Union[str, None] = '2bac99479a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_refreshtoken_expires_at'), 'refreshtoken', ['expires_at'], unique=False)
+    op.create_index('ix_refreshtoken_revoked', 'refreshtoken', ['id'], unique=False, postgresql_where=sa.text('revoked'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refreshtoken_revoked', table_name='refreshtoken', postgresql_where=sa.text('revoked'))
+    op.drop_index(op.f('ix_refreshtoken_expires_at'), table_name='refreshtoken')
@@ -0,0 +1,45 @@
+"""client search indexes
+
+Revision ID: 97b4f7832649
+Revises: ce79d6c8d76d
+Create Date: 2026-10-18 12:05:13.774120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '97b4f7832649'
+down_revision: Union[str, None] = 'ce79d6c8d76d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CLIENT_SEARCH_DOCUMENT = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(notes, ''))"
+CONTACT_SEARCH_DOCUMENT = "to_tsvector('simple', first_name || ' ' || last_name || ' ' || coalesce(email, ''))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trusted extension since Postgres 13, so the database owner can create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_client_search_document', 'client', [sa.text(CLIENT_SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+    op.create_index('ix_client_name_trgm', 'client', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_client_ust_id_trgm', 'client', ['ust_id'], unique=False, postgresql_using='gin', postgresql_ops={'ust_id': 'gin_trgm_ops'})
+    op.create_index('ix_contact_person_search_document', 'contact_person', [sa.text(CONTACT_SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+    op.create_index('ix_contact_person_full_name_trgm', 'contact_person', [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")], unique=False, postgresql_using='gin')
+    op.create_index('ix_contact_person_email_trgm', 'contact_person', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_person_email_trgm', table_name='contact_person')
+    op.drop_index('ix_contact_person_full_name_trgm', table_name='contact_person')
+    op.drop_index('ix_contact_person_search_document', table_name='contact_person')
+    op.drop_index('ix_client_ust_id_trgm', table_name='client')
+    op.drop_index('ix_client_name_trgm', table_name='client')
+    op.drop_index('ix_client_search_document', table_name='client')
+    # pg_trgm is left installed; other objects may depend on it
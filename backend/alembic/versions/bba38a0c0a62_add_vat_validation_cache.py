@@ -0,0 +1,36 @@
+"""add vat_validation_cache
+
+Revision ID: bba38a0c0a62
+Revises: 97b4f7832649
+Create Date: 2026-10-18 13:14:52.090117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bba38a0c0a62'
+down_revision: Union[str, None] = '97b4f7832649'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vat_validation_cache',
+    sa.Column('vat_id', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('valid', sa.Boolean(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('address', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('checked_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('vat_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vat_validation_cache')
@@ -0,0 +1,28 @@
+"""unique item external_id
+
+Revision ID: ce79d6c8d76d
+Revises: 5a67df320073
+Create Date: 2026-10-18 11:27:40.331902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce79d6c8d76d'
+down_revision: Union[str, None] = '5a67df320073'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_item_external_id'), 'item', ['external_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_item_external_id'), table_name='item')
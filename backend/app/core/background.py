@@ -0,0 +1,32 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+_tasks: list[asyncio.Task] = []
+
+
+async def _run_periodic(name: str, interval: float, func: Callable[[], Awaitable[None]]):
+    while True:
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Background task '{name}' failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_periodic(name: str, interval: float, func: Callable[[], Awaitable[None]]) -> None:
+    """Run `func` every `interval` seconds until shutdown. Errors are logged, not raised."""
+    task = asyncio.create_task(_run_periodic(name, interval, func), name=name)
+    _tasks.append(task)
+    logger.debug(f"Started background task '{name}' (every {interval}s)")
+
+
+async def stop_background_tasks() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,63 @@
+import time
+from typing import Literal, Optional
+
+BreakerState = Literal["closed", "open", "half-open"]
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a dependency is down.
+
+    Opens after `threshold` consecutive failures; once `cooldown_seconds`
+    have passed a single probe call is let through, which closes the
+    breaker on success or re-opens it on failure. Only touched from the
+    event loop, so no locking.
+    """
+
+    def __init__(self, threshold: int, cooldown_seconds: float):
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # When the half-open probe was let through; a probe that never
+        # reports back (cancelled) is replaced after another cooldown
+        self._probe_started: Optional[float] = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open":
+            now = time.monotonic()
+            if self._probe_started is None or now - self._probe_started >= self.cooldown_seconds:
+                self._probe_started = now
+                return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probe_started is not None or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._probe_started = None
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+        }
@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import EmailStr, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,9 +15,90 @@ class Settings(BaseSettings):
 
     REFRESH_TOKEN_EXPIRE_DAYS: int = 14
 
+    # bcrypt runs in a dedicated pool so logins don't stall the event loop
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Per-worker cache of resolved users for get_current_user (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024
+
+    # How often each worker syncs revoked access tokens from the DB
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+
+    # Background purge of expired/revoked token rows
+    TOKEN_PURGE_INTERVAL_SECONDS: int = 60 * 60
+    TOKEN_PURGE_BATCH_SIZE: int = 1000
+
     DATABASE_URL: PostgresDsn
     SYNC_DATABASE_URL: PostgresDsn
 
+    # Connection pool (per worker)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 30 * 60
+    # Off by default: recycling handles stale connections without a ping per checkout
+    DB_POOL_PRE_PING: bool = False
+
+    # Prepared statements (asyncpg cache and SQLAlchemy's dialect-level cache)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_CACHE_LIFETIME_SECONDS: int = 300
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Optional streaming replica for GET endpoints
+    READ_DATABASE_URL: Optional[PostgresDsn] = None
+    READ_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    READ_REPLICA_CHECK_SECONDS: float = 5.0
+
+    # /status/ready probe
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    READINESS_CACHE_SECONDS: float = 1.0
+
+    # Rows fetched per round trip by the NDJSON export endpoints
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # Rows validated and COPY'd per transaction by the bulk client import
+    IMPORT_CHUNK_SIZE: int = 2000
+
+    # Background jobs (imports, VAT batches) store their progress in the
+    # background_job table every JOB_PROGRESS_SECONDS; one silent for
+    # JOB_STALE_SECONDS is reported as failed. Rows are kept for a day.
+    JOB_PROGRESS_SECONDS: float = 2.0
+    JOB_STALE_SECONDS: float = 60.0
+    JOB_RETENTION_SECONDS: int = 24 * 60 * 60
+    JOB_PURGE_INTERVAL_SECONDS: int = 60 * 60
+
+    # Rows per INSERT ... ON CONFLICT statement in the item upsert
+    ITEM_UPSERT_BATCH_SIZE: int = 1000
+
+    # Per-worker autocomplete index for /items/suggest: incremental sync
+    # from updated_at, plus a periodic full reload to pick up deletions
+    ITEM_SUGGEST_REFRESH_SECONDS: float = 10.0
+    ITEM_SUGGEST_FULL_RELOAD_SECONDS: float = 15 * 60
+
+    # Log lines on the console and in logs/app.log: "text" or "json"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Share of records below WARNING kept per logger (not its children),
+    # e.g. {"app.access": 0.1}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+    # Prometheus metrics at /status/metrics. Scrapers send METRICS_TOKEN as
+    # a bearer token; unset, the endpoint needs an admin login like the
+    # other status endpoints
+    METRICS_TOKEN: Optional[str] = None
+    # Multi-worker mode: all workers share this (initially empty) directory,
+    # write their metrics there and serve the sum
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5.0
+    METRICS_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+
+    # Opt-in watchdog thread: logs the stack and route of any callback that
+    # holds the event loop longer than the threshold
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_SECONDS: float = 0.1
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.1
+
     CORS_ORIGINS: List[str] = ["http://localhost:5173"]
     FRONTEND_URL: str = "http://localhost:5173"
 
@@ -29,15 +110,55 @@ class Settings(BaseSettings):
     EMAIL_PASSWORD: str
     EMAIL_USE_TLS: bool = True
     EMAIL_USE_SSL: bool = False
+    # Authenticated SMTP connections kept open per worker between sends
+    EMAIL_SMTP_CONNECTIONS: int = 2
+    EMAIL_SMTP_MAX_MESSAGES: int = 100
+    EMAIL_SMTP_IDLE_SECONDS: float = 60.0
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Outbound mail queue, drained by every worker
+    EMAIL_QUEUE_POLL_SECONDS: float = 2.0
+    EMAIL_QUEUE_BATCH_SIZE: int = 50
+    # A claimed message goes back to the queue if not settled within this
+    EMAIL_QUEUE_LEASE_SECONDS: float = 5 * 60
+    EMAIL_MAX_ATTEMPTS: int = 8
+    # Backoff before retry n is EMAIL_RETRY_DELAY_SECONDS * 2**(n-1), capped
+    EMAIL_RETRY_DELAY_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_DELAY_SECONDS: float = 60 * 60
 
     FILE_STORAGE_PATH: str = "./storage"
+    # Email and document templates in FILE_STORAGE_PATH/templates override
+    # the built-in ones. Compiled bytecode is kept here, unset uses
+    # FILE_STORAGE_PATH/cache/templates
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+    # How often loaded templates are checked for changed files
+    TEMPLATE_RELOAD_CHECK_SECONDS: float = 5.0
 
     ENABLE_EINVOICE: bool = True
     ENABLE_ELSTER: bool = False
     ENABLE_BANKING: bool = False
 
     # APIs
-    VIES_WSDL_URL: str = "https://ec.europa.eu/taxation_customs/vies/checkVatService.wsdl"
+    # WSDL is parsed once per worker; unset uses the vendored copy in
+    # app/resources/vies, a URL or path loads that document instead
+    VIES_WSDL_URL: Optional[str] = None
+    # Overrides the service address from the WSDL, e.g. a local stub
+    VIES_SERVICE_URL: Optional[str] = None
+    VIES_TIMEOUT_SECONDS: float = 10.0
+    VIES_MAX_CONNECTIONS: int = 10
+    VIES_RETRIES: int = 3
+    # Backoff before retry n is VIES_RETRY_DELAY_SECONDS * 2**(n-1)
+    VIES_RETRY_DELAY_SECONDS: float = 1.5
+    # Concurrent checkVat calls per member state, per worker
+    VIES_COUNTRY_CONCURRENCY: int = 2
+    # A member state is skipped for the cooldown after this many
+    # consecutive MS_UNAVAILABLE-type failures
+    VIES_BREAKER_THRESHOLD: int = 5
+    VIES_BREAKER_COOLDOWN_SECONDS: float = 60.0
+    # Batch revalidation writes results back every this many answers
+    VIES_BATCH_FLUSH_SIZE: int = 200
+    # Shared VIES result cache; invalid IDs are cached for a shorter time
+    VIES_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    VIES_NEGATIVE_CACHE_TTL_SECONDS: int = 60 * 60
 
     # Default admin credentials
     DEFAULT_ADMIN_EMAIL: EmailStr = "admin@example.com"
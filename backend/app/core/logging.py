@@ -1,18 +1,90 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
 from app.core.config import settings
 
 LOG_DIR = Path("logs")
 LOG_FILE = LOG_DIR / "app.log"
 
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a `rate` share of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or random.random() < self.rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Hand records to the listener thread without formatting them.
+
+    The stock QueueHandler renders the full line (timestamp, traceback)
+    before enqueueing. Only the %-message is resolved here, while its
+    arguments still hold the logged values; the handlers' formatters run
+    on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
 
 def init_logging():
+    """
+    Route all logging through a queue. Log calls only enqueue the record;
+    a background thread formats it and does the console and file I/O.
+    Safe to call again, the previous pipeline is flushed and replaced.
+    """
+    global _listener
     log_level = logging.DEBUG if settings.DEBUG else logging.INFO
     env = settings.ENVIRONMENT.upper()
 
+    json_format = JSONFormatter() if settings.LOG_FORMAT == "json" else None
+
     # Try creating the log directory
     file_handler = None
     try:
@@ -28,7 +100,7 @@ def init_logging():
             "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
             "%Y-%m-%d %H:%M:%S"
         )
-        file_handler.setFormatter(file_format)
+        file_handler.setFormatter(json_format or file_format)
     except Exception as e:
         print(f"Logging to file disabled: {e}")
 
@@ -39,19 +111,24 @@ def init_logging():
         f"[{env}] [%(levelname)s] %(asctime)s - %(message)s",
         "%Y-%m-%d %H:%M:%S"
     )
-    console_handler.setFormatter(console_format)
+    console_handler.setFormatter(json_format or console_format)
 
-    # Assemble handlers
-    handlers = [console_handler]
+    # Assemble handlers, run by the listener thread
+    handlers: list[logging.Handler] = [console_handler]
     if file_handler:
         handlers.append(file_handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
 
     # Global logger config
     logging.basicConfig(
         level=log_level,
-        handlers=handlers,
+        handlers=[_DeferredQueueHandler(log_queue)],
         force=True
     )
+    stop_logging()
+    _listener = listener
 
     # Silence noisy loggers
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -59,3 +136,24 @@ def init_logging():
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
+
+    # Sample high-volume loggers
+    for name, rate in settings.LOG_SAMPLE_RATES.items():
+        logger = logging.getLogger(name)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+        if rate < 1:
+            logger.addFilter(SamplingFilter(rate))
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,161 @@
+import time
+from bisect import bisect_left
+from typing import Sequence
+
+# Seconds; tuned for DB checkouts and request handling alike
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus semantics: a value lands in the first
+    bucket whose upper bound is >= value). Observing is a bisect plus two
+    additions, cheap enough for every request or pool checkout.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """`(upper_bound, count <= bound)` pairs, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": [
+                {"le": "+Inf" if bound == float("inf") else bound, "count": count}
+                for bound, count in self.cumulative()
+            ],
+        }
+
+
+# Upper bounds for event loop lag, in seconds
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Route label for requests no route matched, so scanners can't blow up
+# the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class RouteStats:
+    __slots__ = ("statuses", "latency")
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.latency = Histogram()
+
+
+class RequestMetrics:
+    """Request counts per status code and latency per route template, plus requests in flight."""
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.latency.observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding RequestMetrics.
+
+    Requests are labeled with the matched route's template (FastAPI leaves
+    the route in the scope), e.g. `/api/v1/clients/{client_id}`, never the
+    raw path. No Request object is built and nothing is awaited besides
+    the app itself.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        metrics = self.metrics
+        start = time.perf_counter()
+        done = False
+
+        def finish():
+            nonlocal done
+            done = True
+            metrics.in_flight -= 1
+            method = scope["method"]
+            route = scope.get("route")
+            metrics.observe(
+                method if method in _METHODS else "OTHER",
+                getattr(route, "path_format", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - start,
+            )
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            # Background tasks run after the last body chunk, inside the
+            # app call; they are not part of the request
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not done:
+                finish()
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if not done:
+                finish()
+
+
+class LoopLagMonitor:
+    """
+    Event loop lag: how much later than asked a periodic `tick()` runs.
+
+    Meant for `start_periodic(..., interval, monitor.tick)`, which sleeps
+    `interval` between calls; whatever comes on top is time the loop was
+    busy with other callbacks.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lag = Histogram(LOOP_LAG_BUCKETS)
+        self.last = 0.0
+        self.max = 0.0
+        self._last_tick: float | None = None
+
+    async def tick(self) -> None:
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            lag = max(0.0, now - self._last_tick - self.interval)
+            self.lag.observe(lag)
+            self.last = lag
+            self.max = max(self.max, lag)
+        self._last_tick = now
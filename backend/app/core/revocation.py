@@ -0,0 +1,71 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.crud.revoked_token import get_revoked_tokens_since
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Per-worker copy of the revoked access tokens that have not expired yet.
+
+    Lookups are a single dict probe, so `decode_access_token` never touches
+    the database. The table is the source of truth; `refresh()` pulls rows
+    revoked since the last sync (with some overlap to tolerate commit delays
+    and clock skew between workers) and drops entries whose token expired.
+    """
+
+    def __init__(self, overlap_seconds: float = 30.0):
+        self._entries: dict[str, float] = {}  # jti -> token expiry (unix time)
+        self._watermark: Optional[datetime] = None
+        self._overlap = timedelta(seconds=overlap_seconds)
+        self.last_refresh: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._entries[jti] = expires_at.timestamp()
+
+    def prune(self) -> None:
+        now = time.time()
+        expired = [jti for jti, exp in self._entries.items() if exp <= now]
+        for jti in expired:
+            del self._entries[jti]
+
+    async def refresh(self) -> None:
+        since = self._watermark - self._overlap if self._watermark else None
+        async with async_session() as db:
+            rows = await get_revoked_tokens_since(db, since)
+
+        for jti, expires_at, revoked_at in rows:
+            self.add(jti, expires_at)
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+
+        self.prune()
+        self.last_refresh = time.time()
+        if rows:
+            logger.debug("Revocation list synced: %s new, %s active", len(rows), len(self._entries))
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._entries),
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "last_refresh": self.last_refresh,
+            "refresh_interval_seconds": settings.REVOCATION_REFRESH_SECONDS,
+        }
+
+
+revocation_list = RevocationList()
@@ -8,13 +8,18 @@ from passlib.context import CryptContext
 from jwt.exceptions import InvalidTokenError
 from jwt import ExpiredSignatureError
 from typing import Optional
+from uuid import uuid4
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+from sqlalchemy.orm import make_transient_to_detached
 from app.models.enums import RoleEnum 
 from app.core.config import settings
 from app.models.user import User
 from app.db.session import get_session
+from app.core.hashing import hashing_pool
+from app.core.cache import TTLCache
+from app.core.revocation import revocation_list
 
 credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,11 +34,28 @@ SECRET_KEY = settings.SECRET_KEY
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token")
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+# Resolved users keyed by token subject (email). Values are column snapshots,
+# never live ORM objects, so no instance is ever shared between sessions.
+principal_cache: TTLCache[dict] = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def invalidate_principal(*emails: str) -> None:
+    """Drop cached principals after the underlying user row changed."""
+    principal_cache.invalidate(*emails)
+
+async def hash_password(password: str) -> str:
+    return await hashing_pool.run(pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+async def verify_current_password(db: AsyncSession, user: User, plain_password: str) -> bool:
+    # The user may come from another worker's stale principal cache entry,
+    # so check against the hash in the database
+    await db.refresh(user, ["hashed_password"])
+    return await verify_password(plain_password, user.hashed_password)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -42,25 +64,29 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except ExpiredSignatureError:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Token expired")
     except InvalidTokenError:
         raise credentials_exception
 
+    # In-memory check only; the list is synced from the DB in the background
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise credentials_exception
+    return payload
+
 
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     result = await db.exec(select(User).where(User.email == email))
     user = result.one_or_none()
     
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     return user if user.is_active else None
 
@@ -77,10 +103,21 @@ async def get_current_user(
     if not email or not isinstance(email, str):
         raise credentials_exception
     
+    snapshot = principal_cache.get(email)
+    if snapshot is not None:
+        # Rebuild a clean, detached instance and attach it to this session
+        # without a round trip, so handlers can still modify and commit it.
+        user = User(**{**snapshot, "preferences": dict(snapshot["preferences"] or {})})
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
     result = await db.exec(select(User).where(User.email == email))
     user = result.one_or_none()
     if not user or not user.is_active:
         raise credentials_exception
+
+    principal_cache.set(email, user.model_dump())
     return user
 
 def require_roles(allowed_roles: list[RoleEnum]):
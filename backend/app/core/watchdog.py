@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import UNMATCHED_ROUTE
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames kept per captured stack
+STACK_LIMIT = 30
+# Distinct stacks remembered for "logged in full already"
+_MAX_SIGNATURES = 1000
+
+
+def _request_route(frame: Optional[FrameType]) -> Optional[str]:
+    """Method and route template of the request being handled by the code in `frame`, if any."""
+    while frame is not None:
+        # Starlette and FastAPI pass the ASGI scope down as `scope`; the
+        # router stores the matched route in it
+        if "scope" in frame.f_code.co_varnames:
+            scope = frame.f_locals.get("scope")
+            if isinstance(scope, dict) and scope.get("type") in ("http", "websocket"):
+                route = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+                return f"{scope.get('method', 'WEBSOCKET')} {route}"
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    """
+    Catch callbacks that hold the event loop.
+
+    A daemon thread posts a no-op to the loop every `interval` seconds. If
+    the loop hasn't run it within `threshold` seconds, something is
+    blocking it (a sync DB driver, bcrypt, smtplib, a big computation...):
+    the thread takes the loop thread's stack right then, waits for the
+    loop to come back and logs how long it was stuck, where (route template
+    of the request, or the background task's coroutine and name) and the
+    stack. A stack is logged in full the first time; repeats get a
+    one-line warning.
+
+    Costs one loop wakeup per interval while nothing blocks.
+    """
+
+    def __init__(self, threshold: float, interval: float, history: int = 20):
+        self.threshold = threshold
+        self.interval = interval
+        self.blocks = 0
+        self.blocked_seconds = 0.0
+        self.recent: deque[dict] = deque(maxlen=history)
+        self._totals: dict[str, list] = {}  # where -> [blocks, seconds]
+        self._seen: set[tuple] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._answered = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Watch the running event loop. Call from the loop's thread."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop watchdog started (threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._answered.clear()
+            posted = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(self._answered.set)
+            except RuntimeError:  # Loop closed
+                return
+            if self._answered.wait(self.threshold):
+                continue
+
+            where, detail, stack = self._capture()
+            while not self._answered.wait(self.interval):
+                if self._stop.is_set():
+                    return
+            self._report(where, detail, stack, time.perf_counter() - posted)
+
+    def _capture(self) -> tuple[str, str, traceback.StackSummary]:
+        """
+        `(where, detail, stack)`: `where` labels the metrics and must stay
+        low-cardinality (route template, or the task's coroutine), `detail`
+        adds the task's name for the log.
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame, limit=STACK_LIMIT) if frame else traceback.StackSummary()
+        where = _request_route(frame)
+        if where is not None:
+            return where, where, stack
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            return "<callback>", "<callback>", stack
+        # Unnamed tasks are "Task-<n>" with an ever-growing n
+        coro = task.get_coro()
+        where = f"task {getattr(coro, '__qualname__', '<task>')}"
+        return where, f"{where} ({task.get_name()})", stack
+
+    def _report(self, where: str, detail: str, stack: traceback.StackSummary, seconds: float) -> None:
+        signature = (where, tuple((f.filename, f.lineno) for f in stack))
+        with self._lock:
+            self.blocks += 1
+            self.blocked_seconds += seconds
+            totals = self._totals.setdefault(where, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            self.recent.append({
+                "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "where": detail,
+                "seconds": round(seconds, 3),
+                "stack": stack.format(),
+            })
+            new = signature not in self._seen
+            if new and len(self._seen) < _MAX_SIGNATURES:
+                self._seen.add(signature)
+
+        extra = {"blocked_ms": round(seconds * 1000, 1), "where": detail}
+        if new:
+            logger.warning(
+                "Event loop blocked for %.0f ms in %s, loop thread was at:\n%s",
+                seconds * 1000, detail, "".join(stack.format()).rstrip(), extra=extra,
+            )
+        else:
+            logger.warning("Event loop blocked for %.0f ms in %s (same stack as before)", seconds * 1000, detail, extra=extra)
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """Blocks and blocked seconds per route or task."""
+        with self._lock:
+            return {where: (count, seconds) for where, (count, seconds) in self._totals.items()}
+
+    def stats(self) -> dict:
+        with self._lock:
+            recent = list(self.recent)
+        return {
+            "running": self.running,
+            "threshold_seconds": self.threshold,
+            "interval_seconds": self.interval,
+            "blocks": self.blocks,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "by_where": {where: {"blocks": count, "seconds": round(seconds, 3)} for where, (count, seconds) in self.totals().items()},
+            "recent": recent,
+        }
+
+
+loop_watchdog = LoopWatchdog(
+    threshold=settings.LOOP_WATCHDOG_THRESHOLD_SECONDS,
+    interval=settings.LOOP_WATCHDOG_INTERVAL_SECONDS,
+)
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from sqlmodel import col, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.background_job import BackgroundJob, BackgroundJobKind
+
+
+async def save_job(
+    db: AsyncSession, job_id: str, kind: BackgroundJobKind, status: str, progress: dict[str, Any]
+) -> None:
+    """Create or overwrite a job's row."""
+    now = datetime.now(timezone.utc)
+    values = dict(
+        status=status,
+        progress=progress,
+        updated_at=now,
+        finished_at=now if status in ("done", "failed") else None,
+    )
+    stmt = (
+        insert(BackgroundJob)
+        .values(id=job_id, kind=kind, created_at=now, **values)
+        .on_conflict_do_update(index_elements=["id"], set_=values)
+    )
+    await db.exec(stmt)  # type: ignore[call-overload]
+    await db.commit()
+
+
+async def get_job(db: AsyncSession, job_id: str, kind: BackgroundJobKind) -> Optional[BackgroundJob]:
+    job = await db.get(BackgroundJob, job_id, populate_existing=True)
+    return job if job is not None and job.kind == kind else None
+
+
+async def purge_old_jobs(db: AsyncSession, older_than_seconds: float) -> int:
+    # Finished jobs, and unfinished ones whose worker is long gone
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than_seconds)
+    result = await db.exec(  # type: ignore[call-overload]
+        delete(BackgroundJob).where(col(BackgroundJob.updated_at) < cutoff)
+    )
+    await db.commit()
+    return result.rowcount
@@ -1,45 +1,47 @@
-from typing import Optional, List
+import html
+import re
+from collections import defaultdict
+from typing import Any, Optional, List
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import col, select
+from sqlalchemy import func, literal_column, or_, union_all, update
 from sqlalchemy.orm import selectinload
-from app.models.client import Client
-from app.models.contact_person import ContactPerson
+from app.models.client import Client, ClientSearchResult, CLIENT_FIELDS, CLIENT_RELATIONS, CLIENT_SEARCH_DOCUMENT
+from app.models.contact_person import ContactPerson, CONTACT_FULL_NAME, CONTACT_SEARCH_DOCUMENT
 from app.models.document_attachment import DocumentAttachment
 
 from app.models.client import ClientCreate, ClientUpdate
 from app.models.contact_person import ContactPersonCreate
 from app.models.document_attachment import DocumentAttachmentCreate
+from app.crud.pagination import paginate
 
 async def create_client(db: AsyncSession, client_in: ClientCreate) -> Client:
+    """
+    Insert a client with its nested contacts and attachments in one
+    transaction. IDs and timestamps are generated client-side, so the unit
+    of work emits one batched INSERT per table and nothing needs to be read
+    back: the returned client already has both collections populated.
+    """
     client_data = client_in.model_dump(exclude={"contacts", "attachments"})
     client = Client(**client_data)
-    db.add(client)
-    await db.commit()
-    await db.refresh(client)
-    
-    # Nested contact persons
-    contacts: List[ContactPersonCreate] = getattr(client_in, "contacts", [])
 
-    for contact in contacts:
-        contact_model = ContactPerson(
-            **contact.model_copy(update={"client_id": client.id}).model_dump()
-            )
-        db.add(contact_model)
+    # Nested contact persons
+    contacts: List[ContactPersonCreate] = client_in.contacts or []
+    client.contacts = [
+        ContactPerson(**contact.model_dump(exclude={"client_id"}))
+        for contact in contacts
+    ]
 
     # Nested document attachments
-    attachments: List[DocumentAttachmentCreate] = getattr(client_in, "attachments", [])
-    for attachment in attachments:
-        attachment_model = DocumentAttachment(
-            **attachment.model_copy(update={"client_id": client.id}).model_dump()
-            )
-        db.add(attachment_model)
+    attachments: List[DocumentAttachmentCreate] = client_in.attachments or []
+    client.attachments = [
+        DocumentAttachment(**attachment.model_dump(exclude={"client_id"}))
+        for attachment in attachments
+    ]
 
+    db.add(client)
     await db.commit()
-    await db.refresh(client)
-    client = await get_client_by_id(db, client.id)
-    if client is None:
-        raise Exception("Unexpected: client not found after creation")
     return client
 
 
@@ -54,18 +56,202 @@ async def get_client_by_id(db: AsyncSession, client_id: UUID) -> Optional[Client
     )
     return result.one_or_none()
 
-async def get_clients(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Client]:
-    result = await db.exec(
-        select(Client)
-        .options(
-            selectinload(Client.contacts),      # type: ignore[arg-type]
-            selectinload(Client.attachments),   # type: ignore[arg-type]
-        )
-        .offset(skip)
-        .limit(limit)
+async def get_clients(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Client]:
+    stmt = select(Client).options(
+        selectinload(Client.contacts),      # type: ignore[arg-type]
+        selectinload(Client.attachments),   # type: ignore[arg-type]
     )
+    result = await db.exec(paginate(stmt, Client, skip, limit, cursor))
     return list(result)
 
+def parse_client_fieldset(
+    fields: Optional[str], expand: Optional[str]
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Parse comma-separated `fields` and `expand` query values into
+    (columns, relations). `id` is always included; without `fields` all
+    columns are returned. Raises ValueError on unknown names.
+    """
+    def split(value: Optional[str]) -> list[str]:
+        return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+    columns = split(fields) or list(CLIENT_FIELDS)
+    relations = split(expand)
+    unknown = [f for f in columns if f not in CLIENT_FIELDS] + [r for r in relations if r not in CLIENT_RELATIONS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *columns])), tuple(dict.fromkeys(relations))
+
+async def get_clients_sparse(
+    db: AsyncSession,
+    columns: tuple[str, ...],
+    relations: tuple[str, ...] = (),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> List[dict[str, Any]]:
+    """
+    Column-only variant of `get_clients` returning plain dicts. Only the
+    requested columns are selected (plus `created_at` for the cursor), and
+    each requested relation costs one extra `IN` query; nothing else is
+    loaded.
+    """
+    selected = dict.fromkeys([*columns, "created_at"])
+    stmt = select(*(getattr(Client, name) for name in selected))
+    result = await db.exec(paginate(stmt, Client, skip, limit, cursor))  # type: ignore[arg-type]
+    rows = [dict(row._mapping) for row in result]
+
+    ids = [row["id"] for row in rows]
+    for relation in relations:
+        related = {"contacts": ContactPerson, "attachments": DocumentAttachment}[relation]
+        by_client = defaultdict(list)
+        if ids:
+            children = await db.exec(select(related).where(col(related.client_id).in_(ids)))
+            for child in children:
+                by_client[child.client_id].append(child)
+        for row in rows:
+            row[relation] = by_client[row["id"]]
+    return rows
+
+# ts_headline delimits matches with private-use characters, not <mark>,
+# so the text can be HTML-escaped before the markers become tags
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_END}, HighlightAll=true"
+NOTES_HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxFragments=2, MaxWords=15, MinWords=5"
+
+def _highlight_html(headline: str) -> str:
+    # Client data is escaped; only our own <mark> tags stay markup
+    return html.escape(headline).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+def _prefix_tsquery(q: str):
+    # Every word must match as a prefix: "acme gm" -> 'acme:* & gm:*'.
+    # Only \w characters reach to_tsquery, so user input can't break its syntax.
+    words = re.findall(r"\w+", q)
+    return func.to_tsquery("simple", " & ".join(f"{word}:*" for word in words))
+
+def _contains(q: str) -> str:
+    # ILIKE pattern for a literal substring (backslash is Postgres' default escape)
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+async def search_clients(db: AsyncSession, q: str, limit: int = 20) -> List[ClientSearchResult]:
+    """
+    Ranked search over client name, notes and VAT ID and over contact
+    names and emails.
+
+    A client matches on a prefix full-text hit, a trigram-similar name
+    (typos) or a VAT ID substring; contacts match the same way and count
+    for their client. Every predicate is backed by a GIN index, and the
+    score is the best of `ts_rank` and `similarity` across all of them.
+    Highlights are only computed for the returned page.
+    """
+    tsquery = _prefix_tsquery(q)
+    pattern = _contains(q)
+
+    client_doc = literal_column(CLIENT_SEARCH_DOCUMENT)
+    client_hits = select(  # type: ignore[call-overload]
+        col(Client.id).label("client_id"),
+        func.greatest(
+            func.ts_rank(client_doc, tsquery),
+            func.similarity(Client.name, q),
+            func.similarity(func.coalesce(Client.ust_id, ""), q),
+        ).label("score"),
+    ).where(or_(
+        client_doc.op("@@")(tsquery),
+        col(Client.name).op("%")(q),
+        col(Client.ust_id).ilike(pattern),
+    ))
+
+    contact_doc = literal_column(CONTACT_SEARCH_DOCUMENT)
+    contact_name = literal_column(CONTACT_FULL_NAME)
+    contact_hits = select(  # type: ignore[call-overload]
+        col(ContactPerson.client_id),
+        func.greatest(
+            func.ts_rank(contact_doc, tsquery),
+            func.similarity(contact_name, q),
+            func.similarity(func.coalesce(ContactPerson.email, ""), q),
+        ).label("score"),
+    ).where(or_(
+        contact_doc.op("@@")(tsquery),
+        contact_name.op("%")(q),
+        col(ContactPerson.email).ilike(pattern),
+    ))
+
+    hits = union_all(client_hits, contact_hits).subquery()
+    best = (
+        select(hits.c.client_id, func.max(hits.c.score).label("score"))  # type: ignore[call-overload]
+        .group_by(hits.c.client_id)
+        .order_by(func.max(hits.c.score).desc())
+        .limit(limit)
+        .subquery()
+    )
+    page = await db.exec(
+        select(  # type: ignore[call-overload]
+            Client.id, Client.name, Client.type, Client.ust_id, Client.is_active, best.c.score,
+            func.ts_headline("simple", Client.name, tsquery, HEADLINE_OPTIONS).label("name_hl"),
+            func.ts_headline("simple", func.coalesce(Client.notes, ""), tsquery, NOTES_HEADLINE_OPTIONS).label("notes_hl"),
+        )
+        .join(best, best.c.client_id == Client.id)
+        .order_by(best.c.score.desc(), Client.name)
+    )
+    rows = page.all()
+    if not rows:
+        return []
+
+    # Best-matching contact per returned client, for the "contact" highlight
+    contact_label = func.concat_ws(" ", contact_name, ContactPerson.email)
+    contacts = await db.exec(
+        select(  # type: ignore[call-overload]
+            ContactPerson.client_id,
+            func.ts_headline("simple", contact_label, tsquery, HEADLINE_OPTIONS),
+        )
+        .where(col(ContactPerson.client_id).in_([row.id for row in rows]))
+        .where(or_(
+            contact_doc.op("@@")(tsquery),
+            contact_name.op("%")(q),
+            col(ContactPerson.email).ilike(pattern),
+        ))
+        .order_by(ContactPerson.client_id, func.ts_rank(contact_doc, tsquery).desc())
+        .distinct(ContactPerson.client_id)
+    )
+    contact_highlights = dict(contacts.all())
+
+    results = []
+    for row in rows:
+        highlights = {"name": _highlight_html(row.name_hl)}
+        if _MARK_START in row.notes_hl:
+            highlights["notes"] = _highlight_html(row.notes_hl)
+        if row.id in contact_highlights:
+            highlights["contact"] = _highlight_html(contact_highlights[row.id])
+        results.append(ClientSearchResult(
+            id=row.id, name=row.name, type=row.type, ust_id=row.ust_id,
+            is_active=row.is_active, score=row.score, highlights=highlights,
+        ))
+    return results
+
+async def get_clients_with_vat_ids(
+    db: AsyncSession, client_ids: Optional[List[UUID]] = None, include_inactive: bool = False
+) -> List[tuple[UUID, str]]:
+    """`(id, ust_id)` of every client that has a VAT ID, optionally limited to `client_ids`."""
+    stmt = select(Client.id, Client.ust_id).where(col(Client.ust_id).is_not(None), Client.ust_id != "")
+    if client_ids is not None:
+        stmt = stmt.where(col(Client.id).in_(client_ids))
+    if not include_inactive:
+        stmt = stmt.where(col(Client.is_active).is_(True))
+    result = await db.exec(stmt)
+    return [(client_id, ust_id) for client_id, ust_id in result]
+
+async def set_vat_validation_results(db: AsyncSession, rows: List[dict[str, Any]]) -> None:
+    """
+    Write `ust_id_validated`/`ust_id_checked_at` for many clients, given
+    dicts with `id` and both fields: one executemany UPDATE by primary key.
+    Leaves the commit to the caller.
+    """
+    if rows:
+        await db.execute(update(Client), rows)
+
 async def update_client(db: AsyncSession, db_client: Client, client_in: ClientUpdate) -> Client:
     data = client_in.model_dump(exclude_unset=True)
     for field, value in data.items():
@@ -1,15 +1,29 @@
 from typing import Optional, List
-from uuid import UUID
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+from sqlalchemy import Row, func, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from collections.abc import Sequence
-from app.models.item import Item, ItemCreate, ItemUpdate
+from app.models.item import Item, ItemCreate, ItemUpdate, ItemUpsert, ItemUpsertResult
+from app.crud.pagination import paginate
+
+
+async def _commit_item(db: AsyncSession) -> None:
+    # external_id is unique; the caller gets the IntegrityError of a clash
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
 
 
 async def create_item(db: AsyncSession, item_in: ItemCreate) -> Item:
     item = Item(**item_in.model_dump())
     db.add(item)
-    await db.commit()
+    await _commit_item(db)
     await db.refresh(item)
     return item
 
@@ -21,10 +35,28 @@ async def get_item_by_id(db: AsyncSession, item_id: UUID) -> Optional[Item]:
     return result.one_or_none()
 
 
-async def get_items(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[Item]:
+async def get_items(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Sequence[Item]:
     result = await db.exec(
-        select(Item).offset(skip).limit(limit)
+        paginate(select(Item), Item, skip, limit, cursor)
+    )
+    return result.all()
+
+
+async def get_items_changed_since(db: AsyncSession, since: Optional[datetime]) -> Sequence:
+    """
+    Rows for the autocomplete index: `(id, name, external_id, unit,
+    unit_price, vat_rate, is_active, updated_at)`, all items if `since` is
+    None. Inactive rows are included so callers can drop them.
+    """
+    stmt = select(  # type: ignore[call-overload]
+        Item.id, Item.name, Item.external_id, Item.unit,
+        Item.unit_price, Item.vat_rate, Item.is_active, Item.updated_at,
     )
+    if since is not None:
+        stmt = stmt.where(Item.updated_at > since)
+    result = await db.exec(stmt)
     return result.all()
 
 
@@ -34,11 +66,74 @@ async def update_item(db: AsyncSession, db_item: Item, item_in: ItemUpdate) -> I
         setattr(db_item, field, value)
 
     db_item.touch()
-    await db.commit()
+    await _commit_item(db)
     await db.refresh(db_item)
     return db_item
 
 
+# Columns the shop sync owns; a row is only rewritten if one of them differs
+UPSERT_COLUMNS = (
+    "name", "description", "type", "unit", "unit_price", "cost_price", "vat_rate", "is_active",
+)
+
+async def upsert_items(
+    db: AsyncSession, items: Sequence[ItemUpsert], batch_size: int = 1000
+) -> tuple[ItemUpsertResult, list[Row]]:
+    """
+    Insert or update items keyed on `external_id` with batched
+    `INSERT ... ON CONFLICT DO UPDATE`, committing once at the end.
+
+    The update only fires when a synced column actually changed, so
+    unchanged rows cost no write (no new tuple, no WAL, `updated_at` kept).
+    `RETURNING xmax = 0` tells fresh inserts from updates; rows not returned
+    were unchanged. If an `external_id` repeats, its last occurrence wins.
+    Also returns the inserted and updated rows (`id`, `name`,
+    `external_id`, `unit`, `unit_price`, `vat_rate`, `is_active`).
+    """
+    # Dedupe (ON CONFLICT can't touch a row twice per statement) and sort so
+    # concurrent syncs lock rows in the same order
+    latest = {item.external_id: item for item in items}
+    rows = [latest[key] for key in sorted(latest)]
+    result = ItemUpsertResult()
+    changed: list[Row] = []
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        now = datetime.now(timezone.utc)
+        stmt = insert(Item).values([
+            {
+                **item.model_dump(include={"external_id", *UPSERT_COLUMNS}),
+                "id": uuid4(),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for item in batch
+        ])
+        table = Item.__table__  # type: ignore[attr-defined]
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.external_id],
+            set_={**{name: excluded[name] for name in UPSERT_COLUMNS}, "updated_at": func.now()},
+            where=tuple_(*(table.c[name] for name in UPSERT_COLUMNS)).is_distinct_from(
+                tuple_(*(excluded[name] for name in UPSERT_COLUMNS))
+            ),
+        ).returning(
+            table.c.id, table.c.name, table.c.external_id, table.c.unit,
+            table.c.unit_price, table.c.vat_rate, table.c.is_active,
+            literal_column("xmax = 0").label("inserted"),
+        )
+
+        written = (await db.execute(stmt)).all()
+        inserted = sum(row.inserted for row in written)
+        result.inserted += inserted
+        result.updated += len(written) - inserted
+        result.unchanged += len(batch) - len(written)
+        changed.extend(written)
+
+    await db.commit()
+    return result, changed
+
+
 async def delete_item(db: AsyncSession, item_id: UUID) -> bool:
     item = await get_item_by_id(db, item_id)
     if not item:
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+from sqlmodel import col, select
+from sqlalchemy import func, literal_column, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.outbound_email import OutboundEmail
+
+
+async def enqueue_email(
+    db: AsyncSession, to_address: str, subject: str, body_text: str, body_html: Optional[str] = None
+) -> OutboundEmail:
+    email = OutboundEmail(to_address=to_address, subject=subject, body_text=body_text, body_html=body_html)
+    db.add(email)
+    await db.commit()
+    return email
+
+
+async def claim_due_emails(
+    db: AsyncSession, limit: int, lease_seconds: float, max_attempts: int
+) -> tuple[list[OutboundEmail], int]:
+    """Lease up to `limit` due messages to this worker; returns them and the number given up as out of attempts."""
+    # Inlined, so generic plans still match the partial index
+    pending = OutboundEmail.status == literal_column("'pending'")
+    is_due = col(OutboundEmail.next_attempt_at) <= func.now()
+
+    exhausted = await db.execute(
+        update(OutboundEmail)
+        .where(pending, is_due, col(OutboundEmail.attempts) >= max_attempts)
+        .values(
+            status="failed",
+            last_error=func.coalesce(OutboundEmail.last_error, "Delivery attempt never reported back"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    due = (
+        select(OutboundEmail.id)
+        .where(pending, is_due)
+        .order_by(col(OutboundEmail.next_attempt_at))
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(OutboundEmail)
+        .where(col(OutboundEmail.id).in_(due.scalar_subquery()))
+        .values(
+            attempts=OutboundEmail.attempts + 1,
+            next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+        )
+        .returning(OutboundEmail)
+    )
+    result = await db.execute(stmt)
+    emails = list(result.scalars())
+    await db.commit()
+    return emails, exhausted.rowcount
+
+
+async def record_delivery_results(
+    db: AsyncSession, sent: list[UUID], failures: list[dict[str, Any]]
+) -> None:
+    """Mark `sent` as delivered and write the `failures` rows in one transaction."""
+    if sent:
+        await db.execute(
+            update(OutboundEmail)
+            .where(col(OutboundEmail.id).in_(sent))
+            .values(status="sent", sent_at=datetime.now(timezone.utc), last_error=None)
+        )
+    if failures:
+        await db.execute(update(OutboundEmail), failures)
+    await db.commit()
+
+
+async def count_emails_by_status(db: AsyncSession) -> dict[str, int]:
+    result = await db.exec(
+        select(OutboundEmail.status, func.count()).group_by(OutboundEmail.status)
+    )
+    return {status: count for status, count in result}
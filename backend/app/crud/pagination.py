@@ -0,0 +1,57 @@
+import base64
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlmodel import col
+from sqlmodel.sql.expression import SelectOfScalar
+
+T = TypeVar("T")
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor") from None
+
+
+def paginate(
+    stmt: SelectOfScalar[T], model, skip: int, limit: int, cursor: Optional[str] = None
+) -> SelectOfScalar[T]:
+    """
+    Order by `(created_at, id)` and apply either keyset or offset paging.
+
+    With a cursor the page starts right after the last row of the previous
+    one, which the `(created_at, id)` index resolves without scanning the
+    skipped rows. `skip` is still honoured for callers without a cursor.
+    """
+    stmt = stmt.order_by(col(model.created_at), col(model.id))
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(col(model.created_at), col(model.id)) > tuple_(created_at, row_id))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """
+    Cursor for the page after `rows` (ORM objects or mappings), or None if
+    this was the last page.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
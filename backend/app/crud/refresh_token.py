@@ -1,23 +1,26 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from uuid import uuid4
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, update, delete, col
 
 from app.core.config import settings
 from app.models.refresh_token import RefreshToken
+from app.models.user import User
 
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
-async def create_refresh_token(db: AsyncSession, user_id) -> RefreshToken:
-    token_value = str(uuid4())
-    expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-
-    token = RefreshToken(
+def _new_refresh_token(user_id) -> RefreshToken:
+    return RefreshToken(
         user_id=user_id,
-        token=token_value,
-        expires_at=expires_at,
+        token=str(uuid4()),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
     )
 
+async def create_refresh_token(db: AsyncSession, user_id) -> RefreshToken:
+    token = _new_refresh_token(user_id)
+
     db.add(token)
     await db.commit()
     await db.refresh(token)
@@ -32,3 +35,64 @@ async def get_refresh_token(db: AsyncSession, token_str: str) -> RefreshToken |
 async def revoke_token(db: AsyncSession, token: RefreshToken) -> None:
     token.revoked = True
     await db.commit()
+
+async def rotate_refresh_token(db: AsyncSession, token_str: str) -> Optional[tuple[str, RefreshToken]]:
+    """
+    Revoke `token_str` and issue its successor in one transaction.
+
+    The conditional UPDATE ... FROM user ... RETURNING both validates the old
+    token (unrevoked, unexpired, active owner) and claims it. Postgres locks
+    the row, so of two concurrent refreshes with the same token only the
+    first one gets a row back. Returns the owner's email and the new token,
+    or None if the token can't be used.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.exec(  # type: ignore[call-overload]
+        update(RefreshToken)
+        .where(
+            col(RefreshToken.token) == token_str,
+            col(RefreshToken.revoked).is_(False),
+            col(RefreshToken.expires_at) > now,
+            col(RefreshToken.user_id) == User.id,
+            col(User.is_active).is_(True),
+        )
+        .values(revoked=True)
+        .returning(User.id, User.email)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
+        await db.rollback()
+        return None
+
+    user_id, email = row
+    new_token = _new_refresh_token(user_id)
+    db.add(new_token)
+    await db.commit()
+    return email, new_token
+
+async def purge_refresh_tokens(db: AsyncSession, batch_size: int) -> int:
+    """
+    Delete expired and revoked refresh tokens, `batch_size` rows per
+    transaction, so a large backlog never holds long locks.
+    """
+    now = datetime.now(timezone.utc)
+    total = 0
+    # One pass per condition so each can use its own index
+    # (ix_refreshtoken_expires_at and the partial ix_refreshtoken_revoked)
+    dead_conditions = (
+        col(RefreshToken.expires_at) <= now,
+        col(RefreshToken.revoked) == True,  # noqa: E712
+    )
+    for condition in dead_conditions:
+        while True:
+            doomed = select(RefreshToken.id).where(condition).limit(batch_size).scalar_subquery()
+            result = await db.exec(  # type: ignore[call-overload]
+                delete(RefreshToken).where(col(RefreshToken.id).in_(doomed))
+            )
+            await db.commit()
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                break
+            await asyncio.sleep(0)  # Let request handlers in between batches
+    return total
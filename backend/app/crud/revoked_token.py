@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+from uuid import UUID
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, delete, col
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.revoked_token import RevokedToken
+
+
+async def revoke_access_token(
+    db: AsyncSession, jti: str, expires_at: datetime, user_id: Optional[UUID] = None
+) -> None:
+    # Revoking twice (e.g. a repeated logout) is not an error
+    stmt = (
+        insert(RevokedToken)
+        .values(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.now(timezone.utc))
+        .on_conflict_do_nothing(index_elements=["jti"])
+    )
+    await db.exec(stmt)  # type: ignore[call-overload]
+    await db.commit()
+
+async def get_revoked_tokens_since(
+    db: AsyncSession, since: Optional[datetime]
+) -> Sequence[tuple[str, datetime, datetime]]:
+    """Return `(jti, expires_at, revoked_at)` for unexpired tokens revoked after `since`."""
+    stmt = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+        RevokedToken.expires_at > datetime.now(timezone.utc)
+    )
+    if since is not None:
+        stmt = stmt.where(RevokedToken.revoked_at > since)
+    result = await db.exec(stmt)
+    return result.all()
+
+async def purge_expired_revoked_tokens(db: AsyncSession, batch_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    total = 0
+    while True:
+        doomed = (
+            select(RevokedToken.jti)
+            .where(col(RevokedToken.expires_at) <= now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.exec(  # type: ignore[call-overload]
+            delete(RevokedToken).where(col(RevokedToken.jti).in_(doomed))
+        )
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            break
+        await asyncio.sleep(0)
+    return total
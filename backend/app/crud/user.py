@@ -4,13 +4,14 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from app.models.user import User
 from app.models.user import UserCreate, UserUpdate, UserAdminUpdate
-from app.core.security import hash_password
+from app.core.security import hash_password, invalidate_principal
+from app.crud.pagination import paginate
 
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     user = User(
         email=user_in.email,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=await hash_password(user_in.password),
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         role=user_in.role,
@@ -29,9 +30,11 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     result = await db.exec(select(User).where(User.email == email))
     return result.one_or_none()
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
-    result = await db.exec(select(User).offset(skip).limit(limit))
-    return list(result) 
+async def get_users(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[User]:
+    result = await db.exec(paginate(select(User), User, skip, limit, cursor))
+    return list(result)
 
 async def update_user_self(db: AsyncSession, db_user: User, user_in: UserUpdate) -> User:
     data = user_in.model_dump(exclude_unset=True)
@@ -39,9 +42,11 @@ async def update_user_self(db: AsyncSession, db_user: User, user_in: UserUpdate)
         setattr(db_user, field, value)
     await db.commit()
     await db.refresh(db_user)
+    invalidate_principal(db_user.email)
     return db_user
 
 async def update_user_admin(db: AsyncSession, db_user: User, user_in: UserAdminUpdate) -> User:
+    previous_email = db_user.email
     data = user_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(db_user, field, value)
@@ -49,12 +54,14 @@ async def update_user_admin(db: AsyncSession, db_user: User, user_in: UserAdminU
     db_user.touch()  # Update the updated_at timestamp
     await db.commit()
     await db.refresh(db_user)
+    invalidate_principal(previous_email, db_user.email)
     return db_user
 
 async def update_user_password(db: AsyncSession, user: User, new_password: str) -> User:
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await hash_password(new_password)
     await db.commit()
     await db.refresh(user)
+    invalidate_principal(user.email)
     return user
 
 async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
@@ -63,4 +70,5 @@ async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
         return False
     await db.delete(user)
     await db.commit()
+    invalidate_principal(user.email)
     return True
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.vat_validation_cache import VATValidationCache
+
+
+async def get_cached_validation(db: AsyncSession, vat_id: str) -> Optional[VATValidationCache]:
+    return await db.get(VATValidationCache, vat_id)
+
+
+async def store_validation(
+    db: AsyncSession, vat_id: str, valid: bool, name: str, address: str, checked_at: datetime
+) -> None:
+    values = dict(valid=valid, name=name or None, address=address or None, checked_at=checked_at)
+    stmt = (
+        insert(VATValidationCache)
+        .values(vat_id=vat_id, **values)
+        .on_conflict_do_update(index_elements=["vat_id"], set_=values)
+    )
+    await db.exec(stmt)  # type: ignore[call-overload]
+    await db.commit()
+
+
+async def get_cached_validations(
+    db: AsyncSession, vat_ids: list[str], batch_size: int = 5000
+) -> dict[str, VATValidationCache]:
+    entries: dict[str, VATValidationCache] = {}
+    for start in range(0, len(vat_ids), batch_size):
+        result = await db.exec(
+            select(VATValidationCache).where(col(VATValidationCache.vat_id).in_(vat_ids[start:start + batch_size]))
+        )
+        entries.update((entry.vat_id, entry) for entry in result)
+    return entries
+
+
+async def store_validations(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """
+    Upsert many answers (dicts with vat_id, valid, name, address,
+    checked_at) in one statement. Leaves the commit to the caller.
+    """
+    if not rows:
+        return
+    stmt = insert(VATValidationCache).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["vat_id"],
+        set_={name: stmt.excluded[name] for name in ("valid", "name", "address", "checked_at")},
+    )
+    await db.exec(stmt)  # type: ignore[call-overload]
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class DatabaseProbe:
+    """
+    Readiness check: a timed `SELECT 1` through the connection pool.
+
+    The result is reused for `cache_seconds`, and concurrent probes share one
+    in-flight check, so aggressive orchestrator probing never adds more than
+    one query per interval. Latencies of the last `window` checks are kept
+    for percentiles.
+    """
+
+    def __init__(self, engine: AsyncEngine, timeout: float, cache_seconds: float, window: int = 256):
+        self.engine = engine
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = asyncio.Lock()
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+
+        self.checks = 0
+        self.failures = 0
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self) -> dict:
+        if self._fresh():
+            return self._result  # type: ignore[return-value]
+
+        async with self._lock:
+            if self._fresh():  # Another probe refreshed it while we waited
+                return self._result  # type: ignore[return-value]
+
+            self.checks += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._select_one(), timeout=self.timeout)
+                latency = time.perf_counter() - start
+                self._samples.append(latency)
+                result = {"ready": True, "database": "ok", "latency_ms": round(latency * 1000, 2)}
+            except asyncio.TimeoutError:
+                self.failures += 1
+                result = {"ready": False, "database": "timeout", "error": f"No response within {self.timeout}s"}
+            except Exception as e:
+                self.failures += 1
+                result = {"ready": False, "database": "unreachable", "error": str(e) or type(e).__name__}
+
+            result["latency_percentiles_ms"] = self.percentiles()
+            self._result = result
+            self._checked_at = time.monotonic()
+            return result
+
+    def percentiles(self) -> Optional[dict]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return {
+            "samples": len(ordered),
+            "p50": round(_percentile(ordered, 50) * 1000, 2),
+            "p95": round(_percentile(ordered, 95) * 1000, 2),
+            "p99": round(_percentile(ordered, 99) * 1000, 2),
+        }
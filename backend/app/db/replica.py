@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Replay age alone grows on an idle primary, and receive = replay LSN alone
+# also holds for a standby whose WAL receiver disconnected. Only a streaming
+# standby that has replayed everything it received counts as current.
+REPLICATION_STATUS_SQL = text(
+    """
+    SELECT pg_is_in_recovery() AS in_recovery,
+           pg_last_wal_receive_lsn() IS NOT NULL AS receiving,
+           EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') AS streaming,
+           pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AS caught_up,
+           EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Tracks whether the read replica is reachable and fresh enough to serve.
+
+    `check()` runs periodically in the background; request handlers only read
+    `usable`, so routing never adds a round trip.
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine], max_lag_seconds: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.usable = False
+        self.lag_seconds: Optional[float] = None
+        self.streaming: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.last_check: Optional[float] = None
+
+    async def check(self) -> None:
+        if self.engine is None:
+            return
+
+        was_usable = self.usable
+        self.streaming = None
+        try:
+            async with self.engine.connect() as conn:
+                status = (await conn.execute(REPLICATION_STATUS_SQL)).one()
+            self.streaming = bool(status.streaming)
+            if not status.in_recovery:
+                raise RuntimeError("Not a standby (promoted?)")
+            if not status.receiving:
+                raise RuntimeError("Standby has not received any WAL")
+            if status.streaming and status.caught_up:
+                self.lag_seconds = 0.0
+            elif status.replay_age is None:
+                raise RuntimeError("Standby has not replayed any transaction")
+            else:
+                self.lag_seconds = float(status.replay_age)
+            self.last_error = None
+            self.usable = self.lag_seconds <= self.max_lag_seconds
+        except Exception as e:
+            self.lag_seconds = None
+            self.last_error = str(e)
+            self.usable = False
+        self.last_check = time.time()
+
+        if was_usable and not self.usable:
+            logger.warning(
+                f"Read replica disabled, falling back to primary "
+                f"(lag={self.lag_seconds}, error={self.last_error})"
+            )
+        elif self.usable and not was_usable:
+            logger.info(f"Read replica enabled (lag={self.lag_seconds}s)")
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.engine is not None,
+            "usable": self.usable,
+            "lag_seconds": self.lag_seconds,
+            "streaming": self.streaming,
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+        }
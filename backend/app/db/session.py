@@ -1,16 +1,43 @@
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from typing import AsyncGenerator
 
 from app.core.config import settings
+from app.db.telemetry import PoolTelemetry, InstrumentedQueuePool, instrument_engine
+from app.db.replica import ReplicaMonitor
+from app.db.query_stats import instrument_queries
+
+
+def _create_engine(url: str, telemetry: PoolTelemetry) -> AsyncEngine:
+    # SQLAlchemy's own per-connection cache of prepared statements (asyncpg dialect)
+    db_url = make_url(url).update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+    )
+    async_engine = create_async_engine(
+        db_url,
+        echo=settings.DEBUG,
+        poolclass=InstrumentedQueuePool.for_telemetry(telemetry),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # asyncpg's statement cache, see asyncpg.connect()
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "max_cached_statement_lifetime": settings.DB_STATEMENT_CACHE_LIFETIME_SECONDS,
+        },
+    )
+    instrument_engine(async_engine.sync_engine, telemetry)
+    instrument_queries(async_engine.sync_engine)
+    return async_engine
+
 
 # The engine
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-)
+pool_telemetry = {"primary": PoolTelemetry("primary")}
+engine = _create_engine(str(settings.DATABASE_URL), pool_telemetry["primary"])
 
 # The factory
 async_session = async_sessionmaker(
@@ -19,11 +46,36 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Optional streaming replica for read-only endpoints
+read_engine: AsyncEngine | None = None
+async_read_session: async_sessionmaker[AsyncSession] | None = None
+if settings.READ_DATABASE_URL:
+    pool_telemetry["replica"] = PoolTelemetry("replica")
+    read_engine = _create_engine(str(settings.READ_DATABASE_URL), pool_telemetry["replica"])
+    async_read_session = async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+replica_monitor = ReplicaMonitor(read_engine, settings.READ_REPLICA_MAX_LAG_SECONDS)
+
 # Session dependency
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
 
+# Session factory for read-only work: the replica while it is healthy and
+# within the lag threshold, the primary otherwise
+def read_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_read_session if async_read_session and replica_monitor.usable else async_session
+
+# Read-only session dependency. Only for handlers that never write: anything
+# that reads and then writes (or must see its own writes) stays on get_session.
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session_factory()() as session:
+        yield session
+
 # For testing , Alembic and all that...
 def get_engine():
     return engine
@@ -0,0 +1,80 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+class PoolTelemetry:
+    """Checkout statistics for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+        self.overflow_opened = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pool: AsyncAdaptedQueuePool | None = None
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        return {
+            "pool_size": pool.size() if pool else None,
+            "max_overflow": pool._max_overflow if pool else None,
+            "checked_out": pool.checkedout() if pool else 0,
+            "idle": pool.checkedin() if pool else 0,
+            "overflow": max(pool.overflow(), 0) if pool else 0,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "overflow_opened": self.overflow_opened,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    SQLAlchemy has no "checkout started" event, so the wait is measured
+    around `_do_get`. Use `for_telemetry()` to bind a telemetry object: it is
+    stored on a per-engine subclass so it survives `Pool.recreate()`.
+    """
+
+    telemetry: PoolTelemetry
+
+    @classmethod
+    def for_telemetry(cls, telemetry: PoolTelemetry) -> type["InstrumentedQueuePool"]:
+        return type(f"InstrumentedQueuePool_{telemetry.name}", (cls,), {"telemetry": telemetry})
+
+    def _do_get(self):
+        telemetry = self.telemetry
+        telemetry.pool = self
+        overflow_before = self._overflow
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            telemetry.timeouts += 1
+            raise
+        finally:
+            telemetry.wait_seconds.observe(time.perf_counter() - start)
+
+        if self._overflow > overflow_before and self._overflow > 0:
+            telemetry.overflow_opened += 1
+        return conn
+
+
+def instrument_engine(sync_engine, telemetry: PoolTelemetry) -> None:
+    telemetry.pool = sync_engine.pool
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        telemetry.connects += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        telemetry.invalidations += 1
@@ -0,0 +1,29 @@
+from typing import Literal, Optional
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field
+from sqlalchemy import JSON, TIMESTAMP, Column
+
+BackgroundJobKind = Literal["client_import", "vat_batch"]
+BackgroundJobStatus = Literal["pending", "running", "done", "failed"]
+
+
+class BackgroundJob(SQLModel, table=True):
+    """Progress of a long-running job (bulk import, VAT batch), readable from any worker."""
+    __tablename__ = "background_job"  # type: ignore[assignment]
+
+    id: str = Field(primary_key=True, max_length=32)
+    kind: str = Field(max_length=20, nullable=False)
+    status: str = Field(default="pending", max_length=10, nullable=False)
+    progress: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False)
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True)
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True)
+    )
@@ -1,19 +1,25 @@
 from typing import Optional, List, TYPE_CHECKING
+from functools import lru_cache
 from sqlmodel import Field, Column, Relationship
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model, field_validator
 import sqlalchemy as sa
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String, text
 from sqlmodel import SQLModel
 from app.models.enums import ClientTypeEnum
 from app.models.contact_person import ContactPersonCreate
 from app.models.document_attachment import DocumentAttachmentCreate
 from app.models.contact_person import ContactPersonRead
 from app.models.document_attachment import DocumentAttachmentRead
+from app.utils.vat import VAT_COUNTRIES, check_vat_id, normalize_vat_id
 
 
 # ==== ORM model ====
+# Full-text document behind /clients/search. The query must repeat this
+# expression verbatim for Postgres to use the GIN index on it.
+CLIENT_SEARCH_DOCUMENT = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(notes, ''))"
+
 if TYPE_CHECKING:
     from app.models.contact_person import ContactPerson
     from app.models.document_attachment import DocumentAttachment
@@ -21,6 +27,14 @@ if TYPE_CHECKING:
 
 class Client(SQLModel, table=True):
     __tablename__ = "client" # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination order, see app/crud/pagination.py
+        Index("ix_client_created_at_id", "created_at", "id"),
+        # Search, see crud.client.search_clients (needs the pg_trgm extension)
+        Index("ix_client_search_document", text(CLIENT_SEARCH_DOCUMENT), postgresql_using="gin"),
+        Index("ix_client_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_client_ust_id_trgm", "ust_id", postgresql_using="gin", postgresql_ops={"ust_id": "gin_trgm_ops"}),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
 
     name: str = Field(nullable=False, max_length=512)
@@ -76,10 +90,27 @@ class ClientBase(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+def clean_ust_id(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a VAT ID and reject EU ones with a bad format or check digit.
+    Tax numbers from outside the EU can't be checked and are only normalized.
+    """
+    if not value:
+        return value
+    vat_id = normalize_vat_id(value)
+    if vat_id[:2] in VAT_COUNTRIES or vat_id[:2] == "GR":
+        return check_vat_id(vat_id)
+    return vat_id
+
 class ClientCreate(ClientBase):
     contacts: Optional[List[ContactPersonCreate]] = Field(default_factory=list)
     attachments: Optional[List[DocumentAttachmentCreate]] = Field(default_factory=list)
 
+    @field_validator("ust_id")
+    @classmethod
+    def check_ust_id(cls, value: Optional[str]) -> Optional[str]:
+        return clean_ust_id(value)
+
 class ClientUpdate(BaseModel):
     name: Optional[str] = Field(None, max_length=512)
     type: Optional[ClientTypeEnum] = None
@@ -95,6 +126,11 @@ class ClientUpdate(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("ust_id")
+    @classmethod
+    def check_ust_id(cls, value: Optional[str]) -> Optional[str]:
+        return clean_ust_id(value)
+
 class ClientRead(ClientBase):
     id: UUID
     created_at: datetime
@@ -105,6 +141,31 @@ class ClientRead(ClientBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Sparse fieldsets for list endpoints (`?fields=...&expand=...`)
+CLIENT_RELATIONS = ("contacts", "attachments")
+CLIENT_FIELDS = tuple(name for name in ClientRead.model_fields if name not in CLIENT_RELATIONS)
+
+@lru_cache(maxsize=64)
+def client_fieldset_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    """
+    Serializer for a list of clients restricted to `fields` (a subset of
+    `ClientRead`). Built once per distinct fieldset.
+    """
+    definitions = {name: (ClientRead.model_fields[name].annotation, ...) for name in fields}
+    model = create_model("ClientFieldset", __config__=ConfigDict(from_attributes=True), **definitions)  # type: ignore[call-overload]
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+class ClientSearchResult(BaseModel):
+    id: UUID
+    name: str
+    type: ClientTypeEnum
+    ust_id: Optional[str] = None
+    is_active: bool
+    score: float
+    # HTML-escaped fragments with matches wrapped in <mark>: "name", "notes"
+    # and/or "contact"
+    highlights: dict[str, str] = Field(default_factory=dict)
+
 class VATValidationResponse(BaseModel):
     valid: bool
     name: Optional[str]
@@ -113,3 +174,9 @@ class VATValidationResponse(BaseModel):
     note: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+class VATBatchRequest(BaseModel):
+    # Defaults to every client with a VAT ID
+    client_ids: Optional[List[UUID]] = None
+    include_inactive: bool = False
+    force: bool = Field(False, description="Ask VIES even if a cached answer is still fresh")
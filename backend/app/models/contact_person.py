@@ -3,7 +3,7 @@ from sqlmodel import Field, Relationship
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel
 from datetime import datetime, timezone
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index, text
 from pydantic import BaseModel, EmailStr, ConfigDict
 
 
@@ -12,8 +12,17 @@ from pydantic import BaseModel, EmailStr, ConfigDict
 if TYPE_CHECKING:
     from app.models.client import Client
 
+# Search expressions, repeated verbatim by crud.client.search_clients
+CONTACT_FULL_NAME = "(first_name || ' ' || last_name)"
+CONTACT_SEARCH_DOCUMENT = "to_tsvector('simple', first_name || ' ' || last_name || ' ' || coalesce(email, ''))"
+
 class ContactPerson(SQLModel, table=True):
     __tablename__ = "contact_person" # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_contact_person_search_document", text(CONTACT_SEARCH_DOCUMENT), postgresql_using="gin"),
+        Index("ix_contact_person_full_name_trgm", text(f"{CONTACT_FULL_NAME} gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_contact_person_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     client_id: UUID = Field(foreign_key="client.id", nullable=False, index=True)
 
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String
 
 
 class ItemType(str, Enum):
@@ -17,6 +17,10 @@ class ItemType(str, Enum):
 # === ORM Model ===
 class Item(SQLModel, table=True):
     __tablename__ = "item"  # type: ignore
+    __table_args__ = (
+        # Keyset pagination order, see app/crud/pagination.py
+        Index("ix_item_created_at_id", "created_at", "id"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
 
@@ -28,7 +32,7 @@ class Item(SQLModel, table=True):
     cost_price: Optional[Decimal] = Field(default=Decimal("0.0"), ge=0, decimal_places=2)
     vat_rate: Decimal = Field(default=Decimal("19.0"), ge=0, le=100)
 
-    external_id: Optional[str] = Field(default=None, max_length=100)  # for SKU, shop sync, etc.
+    external_id: Optional[str] = Field(default=None, max_length=100, unique=True, index=True)  # for SKU, shop sync, etc.
 
     is_active: bool = Field(default=True)
 
@@ -84,6 +88,26 @@ class ItemUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ItemUpsert(ItemBase):
+    """One catalog row pushed by the shop sync, keyed on `external_id`."""
+    external_id: str = Field(..., min_length=1, max_length=100)
+
+
+class ItemUpsertResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+class ItemSuggestion(BaseModel):
+    id: UUID
+    name: str
+    external_id: Optional[str] = None
+    unit: Optional[str] = None
+    unit_price: Decimal
+    vat_rate: Decimal
+
+
 class ItemRead(ItemBase):
     id: UUID
     created_at: datetime
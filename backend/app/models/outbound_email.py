@@ -0,0 +1,47 @@
+from typing import Literal, Optional
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field
+from sqlalchemy import TIMESTAMP, Column, Index, Text, text
+
+OutboundEmailStatus = Literal["pending", "sent", "failed"]
+
+
+class OutboundEmail(SQLModel, table=True):
+    """
+    One message in the outbound mail queue.
+
+    Rows stay `pending` until a worker delivers them (`sent`) or gives up
+    (`failed`). `next_attempt_at` is both the retry schedule and the lease:
+    a worker claiming a row pushes it into the future, so a crashed worker's
+    messages become due again once the lease runs out.
+    """
+    __tablename__ = "outbound_email"  # type: ignore[assignment]
+    __table_args__ = (
+        Index(
+            "ix_outbound_email_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    to_address: str = Field(max_length=320, nullable=False)
+    subject: str = Field(max_length=998, nullable=False)
+    body_text: str = Field(sa_column=Column(Text, nullable=False))
+    body_html: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
+    status: str = Field(default="pending", max_length=10, nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    last_error: Optional[str] = Field(default=None)
+    next_attempt_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False)
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False)
+    )
+    sent_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True)
+    )
@@ -0,0 +1,22 @@
+from typing import Optional
+from uuid import UUID
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field
+from sqlalchemy import TIMESTAMP, Column
+
+
+class RevokedToken(SQLModel, table=True):
+    """A revoked access token, identified by its `jti` claim."""
+    __tablename__ = "revoked_token"  # type: ignore[assignment]
+
+    jti: str = Field(primary_key=True, max_length=64)
+    user_id: Optional[UUID] = Field(default=None, index=True)
+
+    # Rows are useless once the token itself has expired
+    expires_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True)
+    )
+    revoked_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True)
+    )
@@ -4,12 +4,17 @@ from uuid import UUID, uuid4
 from datetime import datetime, timezone
 from app.models.enums import RoleEnum
 import sqlalchemy as sa
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String
 from pydantic import BaseModel, EmailStr, ConfigDict
 
 
 # ==== ORM model =====
 class User(SQLModel, table=True):
+    __table_args__ = (
+        # Keyset pagination order, see app/crud/pagination.py
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
 
     email: str = Field(index=True, nullable=False, unique=True, max_length=320)
@@ -0,0 +1,18 @@
+from typing import Optional
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field
+from sqlalchemy import TIMESTAMP, Column
+
+
+class VATValidationCache(SQLModel, table=True):
+    """Last VIES answer per normalized VAT ID, shared by all workers."""
+    __tablename__ = "vat_validation_cache"  # type: ignore[assignment]
+
+    vat_id: str = Field(primary_key=True, max_length=20)
+    valid: bool = Field(nullable=False)
+    name: Optional[str] = Field(default=None)
+    address: Optional[str] = Field(default=None)
+    checked_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False)
+    )
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
+from app.routes.pagination import page_cursor, set_next_cursor
 from app.core.security import require_roles
 from app.models.enums import RoleEnum
 from app.models.user import User
 from app.models.client import ClientRead, ClientCreate, ClientUpdate
+from app.routes.crm.clients import sparse_clients_response
 from app.crud.client import (
     get_clients,
     get_client_by_id,
@@ -22,18 +24,28 @@ admin_required = require_roles([RoleEnum.Admin])
 
 @router.get("", response_model=List[ClientRead], summary="List all clients")
 async def list_clients(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Depends(page_cursor),
+    fields: Optional[str] = Query(None, description="Comma-separated client fields to return, e.g. `id,name,type,is_active`"),
+    expand: Optional[str] = Query(None, description="Comma-separated relations to include: `contacts`, `attachments`"),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required),
 ):
-    return await get_clients(db, skip=skip, limit=limit)
+    if fields or expand:
+        # Sparse fieldset: column-only query, relations only when expanded
+        return await sparse_clients_response(db, fields, expand, skip=skip, limit=limit, cursor=cursor)
+
+    rows = await get_clients(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, rows, limit)
+    return rows
 
 
 @router.get("/{client_id}", response_model=ClientRead, summary="Get client by ID")
 async def get_client(
     client_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required),
 ):
     client = await get_client_by_id(db, client_id)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.security import require_roles
+from app.models.enums import RoleEnum
+from app.models.user import User
+from app.services.export import ExportDataset, stream_ndjson
+
+router = APIRouter(prefix="/admin/export", tags=["admin"])
+
+admin_required = require_roles([RoleEnum.Admin])
+
+
+@router.get("/{dataset}", summary="Stream a full table as NDJSON")
+async def export_dataset(
+    dataset: ExportDataset,
+    gzip: bool = Query(False, description="Return a gzip-compressed .ndjson.gz file"),
+    _: User = Depends(admin_required),
+):
+    filename = f"{dataset.value}.ndjson" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_ndjson(dataset, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,53 @@
+import csv
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, status
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import require_roles
+from app.db.session import get_session
+from app.models.enums import RoleEnum
+from app.models.user import User
+from app.services.bulk_import import ImportJob, parse_records, run_import
+from app.services.jobs import load_job, register_job, run_tracked
+
+router = APIRouter(prefix="/admin/import", tags=["admin"])
+
+admin_required = require_roles([RoleEnum.Admin])
+
+
+@router.post(
+    "/clients",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk import clients with contacts from CSV or JSON",
+)
+async def import_clients(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="JSON array of clients, or CSV with contact_* columns"),
+    db: AsyncSession = Depends(get_session),
+    _: User = Depends(admin_required),
+):
+    is_json = (file.filename or "").lower().endswith(".json") or file.content_type == "application/json"
+    fmt = "json" if is_json else "csv"
+    try:
+        records = parse_records(await file.read(), fmt)
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=f"Could not parse {fmt} upload: {exc}")
+
+    job = ImportJob(total=len(records))
+    snapshot = await register_job(db, "client_import", job)
+    background_tasks.add_task(run_tracked, "client_import", job, run_import, records)
+    return snapshot
+
+
+@router.get("/jobs/{job_id}", summary="Progress and error report of a bulk import")
+async def get_import_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_session),
+    _: User = Depends(admin_required),
+):
+    # Stored by the worker running the job; the error report comes with the final state
+    snapshot = await load_job(db, "client_import", job_id)
+    if snapshot is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return snapshot
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
+from app.routes.pagination import page_cursor, set_next_cursor
 from app.core.security import require_roles
 from app.models.enums import RoleEnum
 from app.models.user import User
@@ -23,18 +24,22 @@ admin_required = require_roles([RoleEnum.Admin])
 
 @router.get("", response_model=List[UserRead], summary="List all users")
 async def list_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required)
 ):
-    return await get_users(db, skip=skip, limit=limit)
+    rows = await get_users(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, rows, limit)
+    return rows
 
 
 @router.get("/{user_id}", response_model=UserRead, summary="Get user by ID")
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required)
 ):
     user = await get_user_by_id(db, user_id)
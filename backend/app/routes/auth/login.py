@@ -2,13 +2,24 @@ from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from typing import Annotated
+from datetime import datetime, timezone
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.session import get_session
 from app.models.user import User
 from app.core.config import settings
-from app.core.security import authenticate_user, create_access_token, get_current_user, credentials_exception
+from app.core.security import (
+    authenticate_user,
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+    credentials_exception,
+    invalidate_principal,
+    oauth2_scheme,
+)
+from app.core.revocation import revocation_list
 from app.crud.refresh_token import create_refresh_token
+from app.crud.revoked_token import revoke_access_token
 
 import logging
 logger = logging.getLogger("auth")
@@ -31,9 +42,9 @@ async def login_for_access_token(
     if not user:
         raise credentials_exception
 
-    from datetime import datetime, timezone
     user.last_login = datetime.now(timezone.utc)
     await db.commit()
+    invalidate_principal(user.email)
 
     access_token = create_access_token(data={"sub": user.email, "scope": "auth"})
     refresh_token = await create_refresh_token(db, user.id)
@@ -50,6 +61,18 @@ async def read_users_me(
 ):
     return current_user
 
-@router.post("/logout", status_code=204, summary="Logout (client-side only)")
-async def logout():
-    return
+@router.post("/logout", status_code=204, summary="Logout and revoke the current access token")
+async def logout(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_session)],
+):
+    payload = decode_access_token(token)
+    jti = payload.get("jti")
+    if not jti:
+        return  # Legacy token without jti, nothing to revoke server-side
+
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    await revoke_access_token(db, jti, expires_at, current_user.id)
+    # Effective immediately on this worker, the others pick it up on their next sync
+    revocation_list.add(jti, expires_at)
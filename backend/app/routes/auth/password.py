@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated
 from datetime import timedelta
 
 from sqlmodel import select
-from app.db.session import get_session
+from app.db.session import async_session, get_session
 from app.models.user import User
 from app.models.password import (
     PasswordChange,
@@ -13,16 +13,18 @@ from app.models.password import (
 )
 from app.core.security import (
     get_current_user,
-    verify_password,
+    verify_current_password,
     create_access_token,
     decode_access_token,
 )
 from app.crud.user import update_user_password
 from app.core.config import settings
-from app.services.email import send_password_reset_email 
+from app.services.email import queue_password_reset_email
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+RESET_TOKEN_MINUTES = 15
+
 
 @router.post("/change-password", status_code=204)
 async def change_password(
@@ -30,29 +32,33 @@ async def change_password(
     user: Annotated[User, Depends(get_current_user)],
     db: AsyncSession = Depends(get_session),
 ):
-    if not verify_password(data.old_password, user.hashed_password):
+    if not await verify_current_password(db, user, data.old_password):
         raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Invalid current password")
 
     await update_user_password(db, user, data.new_password)
 
 
-@router.post("/forgot-password", status_code=202)
-async def forgot_password(
-    data: PasswordResetRequest,
-    db: AsyncSession = Depends(get_session),
-):
-    result = await db.exec(select(User).where(User.email == data.email))
-    user = result.one_or_none()
+async def _queue_reset_link(email: str) -> None:
+    async with async_session() as db:
+        result = await db.exec(select(User).where(User.email == email))
+        user = result.one_or_none()
+
+        if not user:
+            return
 
-    if not user:
-        return  # Don't leak account existence
+        token = create_access_token(
+            {"sub": user.email, "purpose": "reset_password"},
+            expires_delta=timedelta(minutes=RESET_TOKEN_MINUTES),
+        )
 
-    token = create_access_token(
-        {"sub": user.email, "purpose": "reset_password"},
-        expires_delta=timedelta(minutes=15),
-    )
+        await queue_password_reset_email(db, user.email, token, RESET_TOKEN_MINUTES)
 
-    await send_password_reset_email(user.email, token)
+
+@router.post("/forgot-password", status_code=202)
+async def forgot_password(data: PasswordResetRequest, background_tasks: BackgroundTasks):
+    # Don't leak account existence: the lookup runs after the response
+    # is sent, and the mail queue does the actual sending
+    background_tasks.add_task(_queue_reset_link, data.email)
 
 
 @router.post("/reset-password", status_code=204)
@@ -1,16 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
 
 from app.db.session import get_session
-from app.models.user import User
-from app.models.refresh_token import RefreshToken
 from app.models.refresh_token import RefreshRequest, TokenRefreshResponse
-from app.crud.refresh_token import (
-    get_refresh_token,
-    revoke_token,
-    create_refresh_token,
-)
+from app.crud.refresh_token import rotate_refresh_token
 from app.core.security import create_access_token
 from app.core.config import settings
 
@@ -22,26 +15,17 @@ async def refresh_token_endpoint(
     payload: RefreshRequest,
     db: AsyncSession = Depends(get_session),
 ):
-    stored_token = await get_refresh_token(db, payload.refresh_token)
+    # Validates, revokes and replaces the token in a single transaction
+    rotated = await rotate_refresh_token(db, payload.refresh_token)
 
-    if not stored_token or stored_token.revoked or stored_token.is_expired():
+    if not rotated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
 
-    user_result = await db.exec(select(User).where(User.id == stored_token.user_id))
-    user = user_result.one_or_none()
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User inactive or not found",
-        )
-
-    # Rotate refresh token
-    await revoke_token(db, stored_token)
-    new_refresh = await create_refresh_token(db, user.id)
-    new_access_token = create_access_token(data={"sub": user.email, "scope": "auth"})
+    email, new_refresh = rotated
+    new_access_token = create_access_token(data={"sub": email, "scope": "auth"})
 
     return TokenRefreshResponse(
         access_token=new_access_token,
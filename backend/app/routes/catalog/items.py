@@ -1,18 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
 
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
+from app.routes.pagination import page_cursor, set_next_cursor
 from app.core.security import require_roles
 from app.models.enums import RoleEnum
 from app.models.user import User
 
-from app.models.item import ItemCreate, ItemUpdate, ItemRead
+from app.core.config import settings
+from app.models.item import ItemCreate, ItemUpdate, ItemRead, ItemSuggestion, ItemUpsert, ItemUpsertResult
+from app.services.item_suggest import Suggestion, item_suggest_index
 from app.crud.item import (
     get_items,
     get_item_by_id,
     create_item,
+    upsert_items,
     update_item,
     delete_item,
 )
@@ -21,20 +26,47 @@ router = APIRouter(prefix="/items", tags=["catalog"])
 
 catalog_access = require_roles([RoleEnum.Accountant, RoleEnum.Admin])
 
+# external_id is unique; a clash is a 409, not a 500
+EXTERNAL_ID_TAKEN = "An item with this external_id already exists"
+
 @router.get("", response_model=List[ItemRead], summary="List items")
 async def list_items(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(catalog_access),
 ):
-    return await get_items(db, skip=skip, limit=limit)
+    rows = await get_items(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, rows, limit)
+    return rows
+
+
+# Declared before /{item_id} so "suggest" isn't taken for an ID
+@router.get("/suggest", response_model=List[ItemSuggestion], summary="Autocomplete items by name or external ID")
+async def suggest_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    _: User = Depends(catalog_access),
+):
+    # Served from this worker's in-memory index, no database round trip
+    return [s._asdict() for s in item_suggest_index.search(q, limit)]
+
+
+def _suggestion(item) -> Suggestion:
+    return Suggestion(item.id, item.name, item.external_id, item.unit, item.unit_price, item.vat_rate)
+
+
+def _index_item(item) -> None:
+    # Visible to this worker right away; others pick it up on their next refresh
+    item_suggest_index.upsert(_suggestion(item), is_active=item.is_active)
 
 
 @router.get("/{item_id}", response_model=ItemRead, summary="Get item by ID")
 async def get_item(
     item_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(catalog_access),
 ):
     item = await get_item_by_id(db, item_id)
@@ -49,7 +81,22 @@ async def create_new_item(
     db: AsyncSession = Depends(get_session),
     _: User = Depends(catalog_access),
 ):
-    return await create_item(db, item_in)
+    try:
+        item = await create_item(db, item_in)
+    except IntegrityError:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=EXTERNAL_ID_TAKEN)
+    _index_item(item)
+    return item
+
+@router.post("/upsert", response_model=ItemUpsertResult, summary="Bulk insert or update items by external_id")
+async def upsert_items_by_external_id(
+    items_in: List[ItemUpsert],
+    db: AsyncSession = Depends(get_session),
+    _: User = Depends(catalog_access),
+):
+    result, changed = await upsert_items(db, items_in, batch_size=settings.ITEM_UPSERT_BATCH_SIZE)
+    await item_suggest_index.apply([(_suggestion(row), row.is_active) for row in changed])
+    return result
 
 @router.patch("/{item_id}", response_model=ItemRead, summary="Update item")
 async def patch_item(
@@ -61,7 +108,12 @@ async def patch_item(
     item = await get_item_by_id(db, item_id)
     if not item:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Item not found")
-    return await update_item(db, item, item_in)
+    try:
+        item = await update_item(db, item, item_in)
+    except IntegrityError:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=EXTERNAL_ID_TAKEN)
+    _index_item(item)
+    return item
 
 @router.delete("/{item_id}", status_code=204, summary="Delete item")
 async def delete_item_entry(
@@ -72,4 +124,5 @@ async def delete_item_entry(
     success = await delete_item(db, item_id)
     if not success:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Item not found")
+    item_suggest_index.remove(item_id)
     return None
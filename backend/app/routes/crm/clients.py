@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
-from datetime import datetime, timezone
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
+from app.routes.pagination import page_cursor, set_next_cursor
 from app.core.security import require_roles
 from app.models.enums import RoleEnum
 from app.models.user import User
 
-from app.models.client import ClientCreate, ClientUpdate, ClientRead, VATValidationResponse
+from app.models.client import ClientCreate, ClientUpdate, ClientRead, VATValidationResponse, VATBatchRequest, ClientSearchResult, client_fieldset_adapter
 from app.models.contact_person import ContactPersonCreate, ContactPersonUpdate, ContactPersonRead
 from app.models.document_attachment import DocumentAttachmentCreate, DocumentAttachmentRead
-from app.services.vat_validation import validate_vat_id
+from app.services.vat_validation import validate_vat_id_cached
+from app.services.vat_batch import VATBatchJob, follow_job, run_vat_batch
+from app.services.jobs import load_job, register_job, run_tracked
 
 from app.crud.client import (
     get_clients,
+    get_clients_sparse,
+    parse_client_fieldset,
+    search_clients,
+    get_clients_with_vat_ids,
     get_client_by_id,
     create_client,
     update_client,
@@ -41,20 +48,95 @@ crm_required = require_roles([RoleEnum.Accountant, RoleEnum.Admin])
 
 # --- Clients ---
 
+async def sparse_clients_response(
+    db: AsyncSession,
+    fields: Optional[str],
+    expand: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+) -> Response:
+    """Client list page limited to `fields` and `expand`, for the CRM and admin list routes."""
+    try:
+        columns, relations = parse_client_fieldset(fields, expand)
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    rows = await get_clients_sparse(db, columns, relations, skip=skip, limit=limit, cursor=cursor)
+    # Returned as a raw Response since it is not a full ClientRead
+    adapter = client_fieldset_adapter(columns + relations)
+    response = Response(adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
+    set_next_cursor(response, rows, limit)
+    return response
+
 @router.get("", response_model=List[ClientRead], summary="List clients")
 async def list_clients(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
+    cursor: Optional[str] = Depends(page_cursor),
+    fields: Optional[str] = Query(None, description="Comma-separated client fields to return, e.g. `id,name,type,is_active`"),
+    expand: Optional[str] = Query(None, description="Comma-separated relations to include: `contacts`, `attachments`"),
+    db: AsyncSession = Depends(get_read_session),
+    _: User = Depends(crm_required),
+):
+    if fields or expand:
+        # Sparse fieldset: column-only query, relations only when expanded
+        return await sparse_clients_response(db, fields, expand, skip=skip, limit=limit, cursor=cursor)
+
+    rows = await get_clients(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, rows, limit)
+    return rows
+
+
+# Declared before /{client_id} so "search" isn't taken for an ID
+@router.get("/search", response_model=List[ClientSearchResult], summary="Search clients and contact persons")
+async def search_client_directory(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, notes, VAT ID, contact name or email"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_session),
+    _: User = Depends(crm_required),
+):
+    return await search_clients(db, q, limit=limit)
+
+
+@router.post(
+    "/validate-vat",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Revalidate the VAT IDs of many clients in the background",
+)
+async def validate_clients_vat(
+    batch_in: VATBatchRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
     _: User = Depends(crm_required),
 ):
-    return await get_clients(db, skip=skip, limit=limit)
+    targets = await get_clients_with_vat_ids(db, batch_in.client_ids, include_inactive=batch_in.include_inactive)
+    job = VATBatchJob(total=len(targets))
+    snapshot = await register_job(db, "vat_batch", job)
+    background_tasks.add_task(run_tracked, "vat_batch", job, run_vat_batch, targets, batch_in.force)
+    return snapshot
+
+
+@router.get("/validate-vat/jobs/{job_id}", summary="Progress of a batch VAT revalidation")
+async def get_vat_batch_job(
+    job_id: str,
+    follow: bool = Query(False, description="Stream NDJSON progress lines until the job finishes"),
+    db: AsyncSession = Depends(get_session),
+    _: User = Depends(crm_required),
+):
+    # Stored by the worker running the job; the error list comes with the final state
+    snapshot = await load_job(db, "vat_batch", job_id)
+    if snapshot is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="VAT batch job not found")
+    if follow:
+        return StreamingResponse(follow_job(job_id, snapshot), media_type="application/x-ndjson")
+    return snapshot
 
 
 @router.get("/{client_id}", response_model=ClientRead, summary="Get client by ID")
 async def get_client(
     client_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(crm_required),
 ):
     client = await get_client_by_id(db, client_id)
@@ -87,6 +169,7 @@ async def patch_client(
 @router.post("/{client_id}/validate-vat", response_model=VATValidationResponse, summary="Validate client's VAT ID")
 async def validate_client_vat(
     client_id: UUID,
+    force: bool = Query(False, description="Ask VIES even if a cached answer is still fresh"),
     db: AsyncSession = Depends(get_session),
     _: User = Depends(crm_required),
 ):
@@ -97,21 +180,10 @@ async def validate_client_vat(
     if not client.ust_id:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Client has no USt-IdNr")
 
-    # Skip if already validated today
-    now = datetime.now(timezone.utc)
-    if client.ust_id_checked_at and client.ust_id_checked_at.date() == now.date():
-        return {
-            "valid": client.ust_id_validated,
-            "name": None,
-            "address": None,
-            "checked_at": client.ust_id_checked_at.isoformat(),
-            "note": "Already validated today"
-        }
-
-    # Call VIES service
-    result = await validate_vat_id(client.ust_id)
-
-    if not result.valid and not result.name and not result.address:
+    # Shared cache first, VIES only if there is no fresh answer
+    result = await validate_vat_id_cached(db, client.ust_id, force=force)
+
+    if result.error:
         raise HTTPException(
             status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="VIES service is temporarily unavailable. Try again later.",
@@ -128,6 +200,7 @@ async def validate_client_vat(
         "name": result.name,
         "address": result.address,
         "checked_at": result.checked_at.isoformat(),
+        "note": f"Cached result from {result.checked_at.isoformat()}" if result.cached else None,
     }
 
 
@@ -136,7 +209,7 @@ async def validate_client_vat(
 @router.get("/{client_id}/contacts", response_model=List[ContactPersonRead], summary="List client contacts")
 async def list_client_contacts(
     client_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(crm_required),
 ):
     return await get_contacts_by_client(db, client_id)
@@ -183,7 +256,7 @@ async def delete_contact(
 @router.get("/{client_id}/attachments", response_model=List[DocumentAttachmentRead], summary="List client documents")
 async def list_attachments(
     client_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(crm_required),
 ):
     return await get_attachments_by_client(db, client_id)
@@ -205,7 +278,7 @@ async def add_attachment(
 @router.get("/attachments/{attachment_id}", response_model=DocumentAttachmentRead, summary="Get attachment by ID")
 async def get_attachment(
     attachment_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(crm_required),
 ):
     attachment = await get_attachment_by_id(db, attachment_id)
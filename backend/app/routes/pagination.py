@@ -0,0 +1,26 @@
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.crud.pagination import decode_cursor, next_cursor
+
+# Response header carrying the cursor for the next page. List endpoints
+# keep returning a plain JSON array so existing clients are unaffected.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_cursor(
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+) -> Optional[str]:
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return cursor
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int) -> None:
+    cursor = next_cursor(rows, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
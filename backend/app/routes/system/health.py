@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlmodel import Session
-from app.db.session import get_session
+from fastapi import APIRouter, Response, status
+
+from app.core.config import settings
+from app.db.session import engine
+from app.db.health import DatabaseProbe
 
 router = APIRouter(prefix="/status", tags=["System"])
 
+db_probe = DatabaseProbe(
+    engine,
+    timeout=settings.READINESS_TIMEOUT_SECONDS,
+    cache_seconds=settings.READINESS_CACHE_SECONDS,
+)
+
+# Liveness: the process and its event loop respond. Never touches the DB,
+# so a database outage doesn't get healthy pods restarted.
+@router.get("/live", include_in_schema=False)
 @router.get("/health", include_in_schema=False)
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
+# Readiness: the pool can hand out a working connection.
+@router.get("/ready", include_in_schema=False)
 @router.get("/db", include_in_schema=False)
-def db_health(session: Session = Depends(get_session)):
-    try:
-        session.connection().execute(text("SELECT 1"))
-        return {"database": "ok"}
-    except Exception as e:
-        return {"database": "unreachable", "error": str(e)}
+async def db_health(response: Response):
+    result = await db_probe.check()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
@@ -0,0 +1,97 @@
+import secrets
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.security import require_roles, principal_cache
+from app.core.hashing import hashing_pool
+from app.core.revocation import revocation_list
+from app.core.watchdog import loop_watchdog
+from app.crud.outbound_email import count_emails_by_status
+from app.db.session import get_session, pool_telemetry, replica_monitor
+from app.services.item_suggest import item_suggest_index
+from app.services.vat_validation import vies_client
+from app.services.mail_queue import mail_queue
+from app.services.templates import template_service
+from app.services.metrics import CONTENT_TYPE, exposition
+from app.models.enums import RoleEnum
+from app.models.user import User
+
+router = APIRouter(prefix="/status", tags=["System"])
+
+admin_required = require_roles([RoleEnum.Admin])
+
+
+def metrics_token_required(authorization: Annotated[Optional[str], Header()] = None) -> None:
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if authorization is None or not secrets.compare_digest(authorization.encode(), expected):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# Scrapers can't log in; give them a static token if one is configured
+metrics_access = metrics_token_required if settings.METRICS_TOKEN else admin_required
+
+
+@router.get("/hashing", summary="Password hashing pool statistics")
+async def hashing_stats(_: User = Depends(admin_required)):
+    return hashing_pool.stats()
+
+
+@router.get("/principal-cache", summary="Principal cache hit/miss statistics")
+async def principal_cache_stats(_: User = Depends(admin_required)):
+    return principal_cache.stats()
+
+
+@router.get("/revocations", summary="Access-token revocation list status")
+async def revocation_stats(_: User = Depends(admin_required)):
+    return revocation_list.stats()
+
+
+@router.get("/pool", summary="Database connection pool statistics")
+async def pool_stats(_: User = Depends(admin_required)):
+    return {name: telemetry.snapshot() for name, telemetry in pool_telemetry.items()}
+
+
+@router.get("/replica", summary="Read replica routing status")
+async def replica_stats(_: User = Depends(admin_required)):
+    return replica_monitor.stats()
+
+
+@router.get("/item-suggest", summary="Item autocomplete index status")
+async def item_suggest_stats(_: User = Depends(admin_required)):
+    return item_suggest_index.stats()
+
+
+@router.get("/vies", summary="VIES client and per-country circuit breaker status")
+async def vies_stats(_: User = Depends(admin_required)):
+    return vies_client.stats()
+
+
+@router.get("/mail-queue", summary="Outbound mail queue and SMTP connection status")
+async def mail_queue_stats(
+    _: User = Depends(admin_required),
+    db: AsyncSession = Depends(get_session),
+):
+    return {"queue": await count_emails_by_status(db), "worker": mail_queue.stats()}
+
+
+@router.get("/templates", summary="Loaded email and document templates")
+async def template_stats(_: User = Depends(admin_required)):
+    return template_service.stats()
+
+
+@router.get("/loop-watchdog", summary="Event loop blocking detector and recent blocking stacks")
+async def loop_watchdog_stats(_: User = Depends(admin_required)):
+    return loop_watchdog.stats()
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics(_: None = Depends(metrics_access)):
+    return PlainTextResponse(await exposition(), media_type=CONTENT_TYPE)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated
 
-from app.core.security import get_current_user, verify_password, hash_password
+from app.core.security import get_current_user, verify_current_password, hash_password
 from app.db.session import get_session
 from app.models.user import User
 from app.models.user import UserRead, UserUpdate
@@ -36,7 +36,7 @@ async def change_password(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_session)],
 ):
-    if not verify_password(data.old_password, current_user.hashed_password):
+    if not await verify_current_password(db, current_user, data.old_password):
         raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Invalid current password")
 
     await update_user_password(db, current_user, data.new_password)
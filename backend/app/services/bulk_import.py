@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Literal, Optional
+from uuid import uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.models.client import ClientCreate
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "json"]
+
+CLIENT_COLUMNS = (
+    "id", "name", "type", "ust_id", "ust_id_validated", "ust_id_checked_at",
+    "notes", "dunning_level", "is_active", "created_at", "updated_at",
+)
+CONTACT_COLUMNS = (
+    "id", "client_id", "first_name", "last_name", "email", "phone", "mobile",
+    "position", "notes", "is_main_contact", "created_at", "updated_at",
+)
+# CSV columns with this prefix describe one contact person for the row's client
+CSV_CONTACT_PREFIX = "contact_"
+
+
+class ImportJob:
+    """Progress and per-row error report of one bulk import."""
+
+    def __init__(self, total: int):
+        self.id = uuid4().hex
+        self.status: Literal["pending", "running", "done", "failed"] = "pending"
+        self.total = total
+        self.processed = 0
+        self.clients_created = 0
+        self.contacts_created = 0
+        self.errors: list[dict[str, Any]] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add_error(self, row: int, errors: list[dict[str, Any]]) -> None:
+        self.errors.append({"row": row, "errors": errors})
+
+    def snapshot(self, include_errors: bool = True) -> dict:
+        end = self.finished_at or time.time()
+        snapshot = {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "clients_created": self.clients_created,
+            "contacts_created": self.contacts_created,
+            "failed_rows": len(self.errors),
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+        }
+        if include_errors:
+            snapshot["errors"] = self.errors
+        return snapshot
+
+
+def parse_records(content: bytes, fmt: ImportFormat) -> list[dict[str, Any]]:
+    """Decode an upload into `ClientCreate`-shaped dicts; a CSV row's `contact_*` cells become its contact."""
+    if fmt == "json":
+        records = json.loads(content)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of clients")
+        return records
+
+    records = []
+    for row in csv.DictReader(io.StringIO(content.decode("utf-8-sig"))):
+        client: dict[str, Any] = {}
+        contact: dict[str, Any] = {}
+        for key, value in row.items():
+            if key is None or value is None or value == "":
+                continue
+            if key.startswith(CSV_CONTACT_PREFIX):
+                contact[key[len(CSV_CONTACT_PREFIX):]] = value
+            else:
+                client[key] = value
+        if contact:
+            client["contacts"] = [contact]
+        records.append(client)
+    return records
+
+
+def _chunks(records: list[dict[str, Any]], size: int) -> Iterator[list[tuple[int, dict[str, Any]]]]:
+    # Row numbers are 1-based positions in the upload, as shown in the error report
+    for start in range(0, len(records), size):
+        yield list(enumerate(records[start:start + size], start=start + 1))
+
+
+def _validate_chunk(
+    job: ImportJob, chunk: Iterable[tuple[int, dict[str, Any]]]
+) -> tuple[list[tuple], list[tuple]]:
+    """Turn valid rows into COPY records; invalid ones go to the error report."""
+    now = datetime.now(timezone.utc)
+    clients: list[tuple] = []
+    contacts: list[tuple] = []
+
+    for row, record in chunk:
+        try:
+            client_in = ClientCreate.model_validate(record)
+        except ValidationError as exc:
+            job.add_error(row, exc.errors(include_url=False, include_context=False, include_input=False))
+            continue
+
+        client_id = uuid4()
+        clients.append((
+            client_id, client_in.name, client_in.type.value, client_in.ust_id,
+            client_in.ust_id_validated, client_in.ust_id_checked_at, client_in.notes,
+            client_in.dunning_level, client_in.is_active, now, now, row,
+        ))
+        for contact in client_in.contacts or []:
+            contacts.append((
+                uuid4(), client_id, contact.first_name, contact.last_name,
+                str(contact.email) if contact.email else None, contact.phone,
+                contact.mobile, contact.position, contact.notes,
+                contact.is_main_contact, now, now,
+            ))
+    return clients, contacts
+
+
+async def _merge_chunk(
+    db: AsyncSession, job: ImportJob, clients: list[tuple], contacts: list[tuple]
+) -> None:
+    """COPY a validated chunk into staging tables and merge it in one transaction, skipping duplicate VAT IDs."""
+    await db.execute(text(
+        "CREATE TEMP TABLE import_client (LIKE client, row_number integer) ON COMMIT DROP"
+    ))
+    await db.execute(text(
+        "CREATE TEMP TABLE import_contact (LIKE contact_person) ON COMMIT DROP"
+    ))
+
+    connection = await db.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    await raw.copy_records_to_table(
+        "import_client", records=clients, columns=[*CLIENT_COLUMNS, "row_number"]
+    )
+    if contacts:
+        await raw.copy_records_to_table(
+            "import_contact", records=contacts, columns=list(CONTACT_COLUMNS)
+        )
+
+    duplicates = await db.execute(text("""
+        DELETE FROM import_client s
+        USING client c
+        WHERE s.ust_id = c.ust_id
+        RETURNING s.row_number
+    """))
+    for (row,) in duplicates:
+        job.add_error(row, [{"loc": ["ust_id"], "msg": "A client with this VAT ID already exists", "type": "duplicate"}])
+
+    duplicates = await db.execute(text("""
+        DELETE FROM import_client s
+        USING import_client earlier
+        WHERE s.ust_id = earlier.ust_id AND s.row_number > earlier.row_number
+        RETURNING s.row_number
+    """))
+    for row in sorted({row for (row,) in duplicates}):
+        job.add_error(row, [{"loc": ["ust_id"], "msg": "Duplicate VAT ID within the upload", "type": "duplicate"}])
+
+    client_columns = ", ".join(CLIENT_COLUMNS)
+    inserted = await db.execute(text(
+        f"INSERT INTO client ({client_columns}) SELECT {client_columns} FROM import_client"
+    ))
+    job.clients_created += inserted.rowcount
+
+    if contacts:
+        contact_columns = ", ".join(CONTACT_COLUMNS)
+        inserted = await db.execute(text(f"""
+            INSERT INTO contact_person ({contact_columns})
+            SELECT {", ".join(f"s.{name}" for name in CONTACT_COLUMNS)}
+            FROM import_contact s
+            JOIN import_client c ON c.id = s.client_id
+        """))
+        job.contacts_created += inserted.rowcount
+
+    await db.commit()
+
+
+async def run_import(job: ImportJob, records: list[dict[str, Any]], chunk_size: Optional[int] = None) -> None:
+    """Validate and load `records` one committed chunk at a time, recording progress and errors on `job`."""
+    job.status = "running"
+    job.started_at = time.time()
+    try:
+        async with async_session() as db:
+            for chunk in _chunks(records, chunk_size or settings.IMPORT_CHUNK_SIZE):
+                clients, contacts = _validate_chunk(job, chunk)
+                if clients:
+                    await _merge_chunk(db, job, clients, contacts)
+                job.processed += len(chunk)
+        job.status = "done"
+    except Exception:
+        job.status = "failed"
+        logger.exception(f"Bulk import {job.id} failed after {job.processed} rows")
+        return
+    finally:
+        job.finished_at = time.time()
+
+    logger.info(
+        f"Bulk import {job.id}: {job.clients_created} clients, {job.contacts_created} contacts, "
+        f"{len(job.errors)} rejected rows in {job.finished_at - job.started_at:.1f}s"
+    )
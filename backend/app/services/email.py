@@ -1,34 +1,188 @@
 import smtplib
+import threading
+import time
+from dataclasses import dataclass, field
 from email.message import EmailMessage
+from typing import Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from app.core.config import settings
+from app.crud.outbound_email import enqueue_email
+from app.crud.system_preferences import get_preferences
+from app.models.outbound_email import OutboundEmail
+from app.services.templates import DEFAULT_LANGUAGE, template_service
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def send_password_reset_email(to_email: str, token: str):
-    subject = "Password Reset"
-    reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-    body = f"Click the link to reset your password: {reset_url}"
+@dataclass
+class _Connection:
+    smtp: smtplib.SMTP
+    last_used: float = field(default_factory=time.monotonic)
+    sent: int = 0
 
-    try:
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
-        msg["To"] = to_email
-        msg.set_content(body)
 
+class SMTPConnectionPool:
+    """Authenticated SMTP connections kept open between sends. All methods block; call them from a thread."""
+
+    def __init__(self, size: int, max_messages: int, idle_seconds: float):
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+
+        self.opened = 0
+        self.reused = 0
+        self.sent = 0
+        self.errors = 0
+
+    def _connect(self) -> _Connection:
+        timeout = settings.EMAIL_SMTP_TIMEOUT_SECONDS
         if settings.EMAIL_USE_SSL:
-            server = smtplib.SMTP_SSL(settings.EMAIL_SERVER, settings.EMAIL_PORT)
+            server: smtplib.SMTP = smtplib.SMTP_SSL(settings.EMAIL_SERVER, settings.EMAIL_PORT, timeout=timeout)
         else:
-            server = smtplib.SMTP(settings.EMAIL_SERVER, settings.EMAIL_PORT)
+            server = smtplib.SMTP(settings.EMAIL_SERVER, settings.EMAIL_PORT, timeout=timeout)
             if settings.EMAIL_USE_TLS:
                 server.starttls()
+        try:
+            if settings.EMAIL_USERNAME:
+                server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
+        except Exception:
+            _close(server)
+            raise
+        with self._lock:
+            self.opened += 1
+        return _Connection(server)
+
+    def _acquire(self) -> _Connection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if time.monotonic() - conn.last_used < self.idle_seconds and _alive(conn.smtp):
+                with self._lock:
+                    self.reused += 1
+                return conn
+            _close(conn.smtp)
+
+    def _release(self, conn: _Connection) -> None:
+        with self._lock:
+            if conn.sent < self.max_messages and len(self._idle) < self.size:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                return
+        _close(conn.smtp)
+
+    def send_many(self, messages: list[EmailMessage]) -> list[Optional[Exception]]:
+        """Send `messages` over one connection; one entry per message, None or the exception."""
+        results: list[Optional[Exception]] = []
+        conn: Optional[_Connection] = None
+        try:
+            for message in messages:
+                if conn is None:
+                    try:
+                        conn = self._acquire()
+                    except Exception as e:
+                        results.extend([e] * (len(messages) - len(results)))
+                        break
+                try:
+                    conn.smtp.send_message(message)
+                    conn.sent += 1
+                    results.append(None)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    # The server refused this message, the session is still fine
+                    results.append(e)
+                except Exception as e:
+                    # Dropped, or left mid-transaction by an error of the message itself
+                    results.append(e)
+                    _close(conn.smtp)
+                    conn = None
+        finally:
+            if conn is not None:
+                self._release(conn)
+
+        with self._lock:
+            errors = sum(result is not None for result in results)
+            self.sent += len(results) - errors
+            self.errors += errors
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _close(conn.smtp)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "opened": self.opened,
+                "reused": self.reused,
+                "sent": self.sent,
+                "errors": self.errors,
+            }
+
 
-        server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
-        server.send_message(msg)
+def _alive(server: smtplib.SMTP) -> bool:
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _close(server: smtplib.SMTP) -> None:
+    try:
         server.quit()
+    except Exception:
+        server.close()
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    # 5xx replies, and errors from the message itself rather than SMTP or
+    # the network, won't pass on a retry
+    if not isinstance(error, (smtplib.SMTPException, OSError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def build_message(email: OutboundEmail) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = email.subject
+    msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+    msg["To"] = email.to_address
+    # Stable across retries, so a message delivered twice shows up as a duplicate
+    msg["Message-ID"] = f"<{email.id}@{settings.EMAIL_FROM.rsplit('@', 1)[-1]}>"
+    msg.set_content(email.body_text)
+    if email.body_html:
+        msg.add_alternative(email.body_html, subtype="html")
+    return msg
+
+
+smtp_pool = SMTPConnectionPool(
+    size=settings.EMAIL_SMTP_CONNECTIONS,
+    max_messages=settings.EMAIL_SMTP_MAX_MESSAGES,
+    idle_seconds=settings.EMAIL_SMTP_IDLE_SECONDS,
+)
+
+
+async def queue_password_reset_email(db: AsyncSession, to_email: str, token: str, valid_minutes: int) -> None:
+    prefs = await get_preferences(db)
+    email = template_service.render_email(
+        "password_reset",
+        prefs.default_language if prefs else DEFAULT_LANGUAGE,
+        reset_url=f"{settings.FRONTEND_URL}/reset-password?token={token}",
+        valid_minutes=valid_minutes,
+    )
 
-        logger.info(f"Password reset email sent to {to_email}")
-    except Exception as e:
-        logger.exception(f"Failed to send email to {to_email}: {e}")
+    await enqueue_email(db, to_email, email.subject, email.text, email.html)
+    logger.info(f"Password reset email queued for {to_email}")
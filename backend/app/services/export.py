@@ -0,0 +1,76 @@
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import read_session_factory
+from app.models.client import Client
+from app.models.contact_person import ContactPerson
+from app.models.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+class ExportDataset(str, Enum):
+    clients = "clients"
+    contacts = "contacts"
+    items = "items"
+
+
+_TABLES = {
+    ExportDataset.clients: Client.__table__,  # type: ignore[attr-defined]
+    ExportDataset.contacts: ContactPerson.__table__,  # type: ignore[attr-defined]
+    ExportDataset.items: Item.__table__,  # type: ignore[attr-defined]
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def stream_ndjson(
+    dataset: ExportDataset, compress: bool = False, batch_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Yield a whole table as NDJSON, one row per line, optionally gzipped.
+
+    Rows come from a server-side cursor `batch_size` at a time as plain
+    column tuples (no ORM objects), so memory stays flat however large the
+    table is. The session is opened here rather than taken from a request
+    dependency, because dependencies are torn down before a streaming
+    response finishes.
+    """
+    table = _TABLES[dataset]
+    encode = json.JSONEncoder(default=_json_default, separators=(",", ":"), ensure_ascii=False).encode
+    # wbits=31 writes a gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    exported = 0
+
+    async with read_session_factory()() as db:
+        result = await db.stream(
+            select(table).execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            chunk = "".join(encode(row._asdict()) + "\n" for row in partition).encode()
+            exported += len(partition)
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
+    logger.info(f"Exported {exported} {dataset.value} rows")
@@ -0,0 +1,217 @@
+import asyncio
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, NamedTuple, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.crud.item import get_items_changed_since
+from app.db.session import read_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+class Suggestion(NamedTuple):
+    id: UUID
+    name: str
+    external_id: Optional[str]
+    unit: Optional[str]
+    unit_price: Decimal
+    vat_rate: Decimal
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _keys(entry: Suggestion) -> set[str]:
+    """
+    Index keys of an item: its full name, the name from each later word on
+    (so "pack" finds "Design Package") and its external ID.
+    """
+    name = normalize(entry.name)
+    words = name.split(" ")
+    keys = {" ".join(words[i:]) for i in range(len(words))}
+    if entry.external_id:
+        keys.add(normalize(entry.external_id))
+    return keys
+
+
+def _build(entries: Iterable[Suggestion]) -> tuple[dict[UUID, Suggestion], list[tuple[str, UUID]]]:
+    by_id = {entry.id: entry for entry in entries}
+    keys = sorted((key, entry.id) for entry in by_id.values() for key in _keys(entry))
+    return by_id, keys
+
+
+class ItemSuggestIndex:
+    """
+    Per-worker prefix index over active items for autocomplete.
+
+    A sorted list of `(key, item_id)` pairs is searched with `bisect`, so a
+    lookup is a binary search plus a short scan and never touches the
+    database. `refresh()` applies rows changed since the last sync (with
+    overlap for commit delays), and periodically reloads everything, which
+    is the only way deletions made by other workers are noticed.
+
+    Only touched from the event loop; rebuilds happen in a worker thread on
+    private copies and are swapped in whole, with local upserts and
+    removals made in the meantime replayed on top.
+    """
+
+    # Above this many changed rows, rebuilding beats inserting one by one
+    REBUILD_THRESHOLD = 500
+
+    def __init__(self, overlap_seconds: float = 30.0):
+        self._entries: dict[UUID, Suggestion] = {}
+        self._keys: list[tuple[str, UUID]] = []
+        self._watermark: Optional[datetime] = None
+        self._overlap = timedelta(seconds=overlap_seconds)
+        self._last_full_load: Optional[float] = None
+        self._rebuild_lock = asyncio.Lock()
+        self._recordings: list[list[tuple[UUID, Optional[Suggestion]]]] = []
+        self.last_refresh: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, query: str, limit: int = 10) -> list[Suggestion]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        found: dict[UUID, Suggestion] = {}
+        # Scan a bit past `limit` so better matches later in key order
+        # (the full name starting with the prefix) can still win
+        budget = limit * 4
+        i = bisect.bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and len(found) < budget:
+            key, item_id = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(item_id, self._entries[item_id])
+            i += 1
+
+        ranked = sorted(
+            found.values(),
+            key=lambda s: (not normalize(s.name).startswith(prefix), s.name.casefold()),
+        )
+        return ranked[:limit]
+
+    def upsert(self, entry: Suggestion, is_active: bool = True) -> None:
+        self._record(entry.id, entry if is_active else None)
+        self._set(entry.id, entry if is_active else None)
+
+    def remove(self, item_id: UUID) -> None:
+        self._record(item_id, None)
+        self._set(item_id, None)
+
+    def _record(self, item_id: UUID, entry: Optional[Suggestion]) -> None:
+        for recording in self._recordings:
+            recording.append((item_id, entry))
+
+    @contextmanager
+    def _recording(self) -> Iterator[list[tuple[UUID, Optional[Suggestion]]]]:
+        """Collect local upserts and removals, `(item_id, entry or None)`, while the block runs."""
+        changes: list[tuple[UUID, Optional[Suggestion]]] = []
+        self._recordings.append(changes)
+        try:
+            yield changes
+        finally:
+            self._recordings.remove(changes)
+
+    def _set(self, item_id: UUID, entry: Optional[Suggestion]) -> None:
+        old = self._entries.pop(item_id, None)
+        if old is not None:
+            for key in _keys(old):
+                i = bisect.bisect_left(self._keys, (key, item_id))
+                if i < len(self._keys) and self._keys[i] == (key, item_id):
+                    del self._keys[i]
+        if entry is not None:
+            self._entries[item_id] = entry
+            for key in _keys(entry):
+                bisect.insort(self._keys, (key, item_id))
+
+    def _rebuild(self, entries: Iterable[Suggestion]) -> None:
+        self._entries, self._keys = _build(entries)
+
+    async def apply(self, changes: list[tuple[Suggestion, bool]]) -> None:
+        """Apply `(entry, is_active)` changes this worker just wrote, e.g. a bulk upsert."""
+        with self._recording() as local_changes:
+            await self._apply(changes, False, local_changes)
+
+    async def _apply(
+        self,
+        changes: list[tuple[Suggestion, bool]],
+        full: bool,
+        local_changes: list[tuple[UUID, Optional[Suggestion]]],
+    ) -> None:
+        """
+        Small change sets are applied in place; large ones and full reloads
+        (`full`: the active entries are all there is) are rebuilt in a
+        worker thread, as sorting a big catalog takes seconds, and swapped
+        in whole. Local changes recorded since `changes` were read are
+        replayed on top, so the swap doesn't undo them.
+        """
+        if not full and len(changes) <= self.REBUILD_THRESHOLD:
+            for entry, is_active in changes:
+                self._set(entry.id, entry if is_active else None)
+        else:
+            async with self._rebuild_lock:
+                merged = {} if full else dict(self._entries)
+                for entry, is_active in changes:
+                    if is_active:
+                        merged[entry.id] = entry
+                    else:
+                        merged.pop(entry.id, None)
+                self._entries, self._keys = await asyncio.to_thread(_build, list(merged.values()))
+
+        for item_id, entry in local_changes:
+            self._set(item_id, entry)
+
+    async def refresh(self) -> None:
+        full = (
+            self._last_full_load is None
+            or time.monotonic() - self._last_full_load >= settings.ITEM_SUGGEST_FULL_RELOAD_SECONDS
+        )
+        since = None
+        if not full and self._watermark:
+            since = self._watermark - self._overlap
+        with self._recording() as local_changes:
+            async with read_session_factory()() as db:
+                rows = await get_items_changed_since(db, since)
+
+            for row in rows:
+                if self._watermark is None or row.updated_at > self._watermark:
+                    self._watermark = row.updated_at
+
+            changes = [
+                (Suggestion(row.id, row.name, row.external_id, row.unit, row.unit_price, row.vat_rate), row.is_active)
+                for row in rows
+            ]
+            await self._apply(changes, full, local_changes)
+        if full:
+            self._last_full_load = time.monotonic()
+
+        self.last_refresh = time.time()
+        if full or changes:
+            logger.debug(
+                f"Item suggest index {'reloaded' if full else 'synced'}: "
+                f"{len(changes)} rows, {len(self._entries)} items, {len(self._keys)} keys"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self._entries),
+            "keys": len(self._keys),
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "last_refresh": self.last_refresh,
+            "refresh_interval_seconds": settings.ITEM_SUGGEST_REFRESH_SECONDS,
+            "full_reload_interval_seconds": settings.ITEM_SUGGEST_FULL_RELOAD_SECONDS,
+        }
+
+
+item_suggest_index = ItemSuggestIndex()
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.background_job import get_job, purge_old_jobs, save_job
+from app.db.session import async_session
+from app.models.background_job import BackgroundJobKind
+
+logger = logging.getLogger(__name__)
+
+
+class TrackedJob(Protocol):
+    id: str
+    status: str
+
+    def snapshot(self, include_errors: bool = True) -> dict: ...
+
+
+def _progress(job: TrackedJob) -> dict:
+    # The error report can be long; it is written once, when the job ends
+    return job.snapshot(include_errors=job.status in ("done", "failed"))
+
+
+async def register_job(db: AsyncSession, kind: BackgroundJobKind, job: TrackedJob) -> dict:
+    """Store a new job before it is scheduled, so any worker can report on it."""
+    progress = _progress(job)
+    await save_job(db, job.id, kind, job.status, progress)
+    return progress
+
+
+async def _store_progress(kind: BackgroundJobKind, job: TrackedJob) -> None:
+    try:
+        async with async_session() as db:
+            await save_job(db, job.id, kind, job.status, _progress(job))
+    except Exception as e:
+        # The job itself carries on; the next write catches up
+        logger.warning(f"Could not store progress of {kind} job {job.id}: {e}")
+
+
+async def run_tracked(
+    kind: BackgroundJobKind, job: TrackedJob, func: Callable[..., Awaitable[None]], *args: Any
+) -> None:
+    """Run `func(job, *args)`, storing its progress every JOB_PROGRESS_SECONDS and at the end."""
+    task = asyncio.create_task(func(job, *args))
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=settings.JOB_PROGRESS_SECONDS)
+            await _store_progress(kind, job)
+    finally:
+        task.cancel()
+
+
+async def load_job(db: AsyncSession, kind: BackgroundJobKind, job_id: str) -> Optional[dict]:
+    """Latest stored snapshot of a job; one silent for JOB_STALE_SECONDS is reported as failed."""
+    row = await get_job(db, job_id, kind)
+    if row is None:
+        return None
+    progress = row.progress
+    age = (datetime.now(timezone.utc) - row.updated_at).total_seconds()
+    if row.status in ("pending", "running") and age > settings.JOB_STALE_SECONDS:
+        progress = {**progress, "status": "failed", "error": "The job stopped reporting progress (worker restarted?)"}
+    return progress
+
+
+async def purge_finished_jobs() -> None:
+    async with async_session() as db:
+        purged = await purge_old_jobs(db, settings.JOB_RETENTION_SECONDS)
+    if purged:
+        logger.info(f"Purged {purged} old background jobs")
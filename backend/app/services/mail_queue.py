@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.outbound_email import claim_due_emails, record_delivery_results
+from app.db.session import async_session
+from app.models.outbound_email import OutboundEmail
+from app.services.email import SMTPConnectionPool, build_message, is_permanent_failure, smtp_pool
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue:
+    """Sends what is queued in the outbound_email table; every worker drains it periodically."""
+
+    def __init__(self, pool: SMTPConnectionPool):
+        self.pool = pool
+        self.rounds = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_round_at: Optional[datetime] = None
+
+    async def drain(self) -> None:
+        batch_size = settings.EMAIL_QUEUE_BATCH_SIZE
+        while True:
+            async with async_session() as db:
+                emails, exhausted = await claim_due_emails(
+                    db, batch_size, settings.EMAIL_QUEUE_LEASE_SECONDS, settings.EMAIL_MAX_ATTEMPTS
+                )
+                if exhausted:
+                    logger.warning(f"Gave up on {exhausted} emails whose last attempt never reported back")
+                    self.failed += exhausted
+                if not emails:
+                    return
+                results = await self._send(emails)
+                await self._record(db, emails, results)
+            if len(emails) < batch_size:
+                return
+
+    async def _send(self, emails: list[OutboundEmail]) -> list[Optional[Exception]]:
+        results: list[Optional[Exception]] = [None] * len(emails)
+        messages = []
+        for i, email in enumerate(emails):
+            try:
+                messages.append((i, build_message(email)))
+            except Exception as e:  # e.g. a line break in a subject taken from invoice data
+                results[i] = e
+        if not messages:
+            return results
+
+        shares = min(self.pool.size, len(messages))
+        share_results = await asyncio.gather(*(
+            asyncio.to_thread(self.pool.send_many, [message for _, message in messages[i::shares]])
+            for i in range(shares)
+        ), return_exceptions=True)
+        for i, share in enumerate(share_results):
+            positions = [position for position, _ in messages[i::shares]]
+            if isinstance(share, BaseException):
+                # send_many reports per message; this is a bug, not a delivery error
+                logger.error(f"Sending {len(positions)} emails failed", exc_info=share)
+                share = [share] * len(positions)  # type: ignore[list-item]
+            for position, result in zip(positions, share):
+                results[position] = result
+        return results
+
+    async def _record(
+        self, db: AsyncSession, emails: list[OutboundEmail], results: list[Optional[Exception]]
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        sent: list[UUID] = []
+        failures: list[dict[str, Any]] = []
+        for email, error in zip(emails, results):
+            if error is None:
+                sent.append(email.id)
+                continue
+            message = f"{type(error).__name__}: {error}"[:1000]
+            if is_permanent_failure(error) or email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                logger.warning(
+                    f"Giving up on email {email.id} to {email.to_address} after {email.attempts} attempts: {message}"
+                )
+                failures.append({"id": email.id, "status": "failed", "last_error": message, "next_attempt_at": now})
+                self.failed += 1
+            else:
+                delay = min(
+                    settings.EMAIL_RETRY_DELAY_SECONDS * 2 ** (email.attempts - 1),
+                    settings.EMAIL_RETRY_MAX_DELAY_SECONDS,
+                )
+                failures.append({
+                    "id": email.id, "status": "pending", "last_error": message,
+                    "next_attempt_at": now + timedelta(seconds=delay),
+                })
+                self.retried += 1
+
+        await record_delivery_results(db, sent, failures)
+        self.sent += len(sent)
+        self.rounds += 1
+        self.last_round_at = now
+        logger.debug("Mail queue round: %s sent, %s failed of %s", len(sent), len(failures), len(emails))
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "last_round_at": self.last_round_at.isoformat() if self.last_round_at else None,
+            "smtp": self.pool.stats(),
+        }
+
+
+mail_queue = MailQueue(smtp_pool)
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+from app.core.config import settings
+from app.core.metrics import Histogram, LoopLagMonitor, RequestMetrics
+from app.core.watchdog import loop_watchdog
+from app.db.session import pool_telemetry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+request_metrics = RequestMetrics()
+loop_lag_monitor = LoopLagMonitor(settings.METRICS_LOOP_LAG_INTERVAL_SECONDS)
+
+# name -> {"type", "help", "mode", "samples": {labels key: value}}. Gauges
+# from several workers are combined per `mode`; counters and histograms
+# are always summed.
+Families = dict[str, dict[str, Any]]
+
+
+def _labels(**labels: str) -> str:
+    return json.dumps(sorted(labels.items()))
+
+
+def _histogram(histogram: Histogram) -> dict:
+    return {
+        "bounds": list(histogram.bounds),
+        "counts": list(histogram.counts),
+        "sum": histogram.sum,
+        "count": histogram.count,
+    }
+
+
+def collect() -> Families:
+    """This worker's metrics."""
+    families: Families = {}
+
+    def family(name: str, kind: str, help: str, mode: Literal["sum", "max"] = "sum") -> dict:
+        families[name] = {"type": kind, "help": help, "mode": mode, "samples": {}}
+        return families[name]["samples"]
+
+    requests = family("http_requests_total", "counter", "HTTP requests by route template and status code.")
+    durations = family("http_request_duration_seconds", "histogram", "HTTP request latency by route template.")
+    for (method, route), stats in request_metrics.routes.items():
+        for status, count in stats.statuses.items():
+            requests[_labels(method=method, route=route, status=str(status))] = count
+        durations[_labels(method=method, route=route)] = _histogram(stats.latency)
+    family("http_requests_in_flight", "gauge", "HTTP requests being handled.")[_labels()] = request_metrics.in_flight
+
+    checked_out = family("db_pool_checked_out", "gauge", "Connections in use.")
+    idle = family("db_pool_idle", "gauge", "Idle connections in the pool.")
+    overflow = family("db_pool_overflow", "gauge", "Connections open beyond the pool size.")
+    connects = family("db_pool_connects_total", "counter", "Database connections opened.")
+    timeouts = family("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.")
+    invalidations = family("db_pool_invalidations_total", "counter", "Connections invalidated after errors.")
+    waits = family("db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a connection.")
+    for name, telemetry in pool_telemetry.items():
+        pool = telemetry.pool
+        key = _labels(pool=name)
+        checked_out[key] = pool.checkedout() if pool else 0
+        idle[key] = pool.checkedin() if pool else 0
+        overflow[key] = max(pool.overflow(), 0) if pool else 0
+        connects[key] = telemetry.connects
+        timeouts[key] = telemetry.timeouts
+        invalidations[key] = telemetry.invalidations
+        waits[key] = _histogram(telemetry.wait_seconds)
+
+    family("event_loop_lag_seconds", "histogram", "How late the event loop ran a periodic probe.")[_labels()] = (
+        _histogram(loop_lag_monitor.lag)
+    )
+    family("event_loop_lag_last_seconds", "gauge", "Lag of the latest probe, worst worker.", mode="max")[_labels()] = (
+        loop_lag_monitor.last
+    )
+    blocks = family("event_loop_blocks_total", "counter", "Callbacks that held the event loop past the watchdog threshold.")
+    blocked = family("event_loop_blocked_seconds_total", "counter", "Time the event loop was held by those callbacks.")
+    for where, (count, seconds) in loop_watchdog.totals().items():
+        blocks[_labels(where=where)] = count
+        blocked[_labels(where=where)] = seconds
+    return families
+
+
+def merge(snapshots: list[tuple[Families, bool]]) -> Families:
+    """Combine `(families, live)` snapshots of several workers; gauges only count live ones."""
+    merged: Families = {}
+    for families, live in snapshots:
+        for name, family in families.items():
+            if family["type"] == "gauge" and not live:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})["samples"]
+            for key, value in family["samples"].items():
+                current = target.get(key)
+                if current is None:
+                    target[key] = value if family["type"] != "histogram" else {**value, "counts": list(value["counts"])}
+                elif family["type"] == "histogram":
+                    current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                    current["sum"] += value["sum"]
+                    current["count"] += value["count"]
+                elif family["mode"] == "max":
+                    target[key] = max(current, value)
+                else:
+                    target[key] = current + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render(families: Families) -> str:
+    """Prometheus text exposition format."""
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for key, value in sorted(family["samples"].items()):
+            pairs = [tuple(pair) for pair in json.loads(key)]
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(pairs)} {value}")
+                continue
+            running = 0
+            for bound, count in zip(value["bounds"] + [float("inf")], value["counts"]):
+                running += count
+                lines.append(f"{name}_bucket{_format_labels(pairs + [('le', _format_bound(bound))])} {running}")
+            lines.append(f"{name}_sum{_format_labels(pairs)} {value['sum']}")
+            lines.append(f"{name}_count{_format_labels(pairs)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class MultiprocessStore:
+    """
+    Per-worker snapshot files for multi-worker deployments.
+
+    Every worker writes its metrics to `<directory>/<pid>.json` every
+    METRICS_FLUSH_SECONDS and on shutdown, and whichever worker is scraped
+    sums all files. Counters of workers that have exited are kept, so
+    totals never go backwards; their gauges are dropped once the file is
+    marked final or has not been refreshed for three flush intervals.
+    Empty the directory when the whole server is (re)started.
+    """
+
+    def __init__(self, directory: Path, flush_seconds: float):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{os.getpid()}.json"
+
+    def write(self, families: Families, live: bool = True) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f".{os.getpid()}.json.tmp"
+        tmp.write_text(json.dumps({"live": live, "families": families}))
+        os.replace(tmp, self.path)
+
+    def read_all(self) -> list[tuple[Families, bool]]:
+        stale_before = time.time() - 3 * self.flush_seconds
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            try:
+                data = json.loads(path.read_text())
+                fresh = path.stat().st_mtime >= stale_before
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics file {path}: {e}")
+                continue
+            snapshots.append((data["families"], data["live"] and fresh))
+        return snapshots
+
+
+multiprocess_store: Optional[MultiprocessStore] = (
+    MultiprocessStore(Path(settings.METRICS_MULTIPROC_DIR), settings.METRICS_FLUSH_SECONDS)
+    if settings.METRICS_MULTIPROC_DIR else None
+)
+
+
+async def flush_metrics(live: bool = True) -> None:
+    if multiprocess_store is not None:
+        await asyncio.to_thread(multiprocess_store.write, collect(), live)
+
+
+async def exposition() -> str:
+    """What /status/metrics serves: this worker's metrics, or all workers' in multiprocess mode."""
+    if multiprocess_store is None:
+        return render(collect())
+    await flush_metrics()
+    snapshots = await asyncio.to_thread(multiprocess_store.read_all)
+    return render(merge(snapshots))
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+    select_autoescape,
+)
+
+from app.core.config import settings
+from app.models.enums import LanguageEnum
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_TEMPLATES_PATH = Path(__file__).resolve().parents[1] / "resources" / "templates"
+DEFAULT_LANGUAGE = LanguageEnum.en
+
+# Decimal and thousands separators, date format
+_NUMBER_FORMATS = {
+    LanguageEnum.en: (".", ",", "%Y-%m-%d"),
+    LanguageEnum.de: (",", ".", "%d.%m.%Y"),
+}
+
+
+@dataclass
+class RenderedEmail:
+    subject: str
+    text: str
+    html: Optional[str] = None
+
+
+def _money_filter(language: LanguageEnum):
+    decimal, thousands, _ = _NUMBER_FORMATS[language]
+
+    def money(value: float, currency: Any = "") -> str:
+        amount = f"{value:,.2f}".translate({ord(","): thousands, ord("."): decimal})
+        currency = getattr(currency, "value", currency)
+        return f"{amount} {currency}" if currency else amount
+
+    return money
+
+
+def _date_filter(language: LanguageEnum):
+    date_format = _NUMBER_FORMATS[language][2]
+
+    def format_date(value: date) -> str:
+        return value.strftime(date_format)
+
+    return format_date
+
+
+class TemplateService:
+    """
+    Jinja2 templates for emails and documents, compiled once per worker.
+
+    Templates are looked up as `<language>/<name>` in each of
+    `search_paths` (customizations before built-ins), then the same for
+    English, so an override or a missing translation concerns single files.
+    Compiled templates stay in memory, and their bytecode is written to
+    `bytecode_dir` so a fresh worker skips the compile step as well.
+    Loaded templates are checked for a changed source mtime at most every
+    `reload_check_seconds`; only changed files are recompiled.
+    """
+
+    def __init__(self, search_paths: list[Path], bytecode_dir: Optional[Path], reload_check_seconds: float):
+        self.search_paths = search_paths
+        self.bytecode_dir = bytecode_dir
+        self.reload_check_seconds = reload_check_seconds
+        self._envs: dict[LanguageEnum, Environment] = {}
+        self._missing: set[tuple[LanguageEnum, str]] = set()
+        self._lock = threading.Lock()
+        self._bytecode_cache: Optional[FileSystemBytecodeCache] = None
+        self._checked_at = time.monotonic()
+        self.reloads = 0
+
+    def _environment(self, language: LanguageEnum) -> Environment:
+        env = self._envs.get(language)
+        if env is not None:
+            return env
+        with self._lock:
+            if language in self._envs:
+                return self._envs[language]
+            if self._bytecode_cache is None and self.bytecode_dir is not None:
+                self.bytecode_dir.mkdir(parents=True, exist_ok=True)
+                self._bytecode_cache = FileSystemBytecodeCache(str(self.bytecode_dir))
+
+            languages = [language] if language == DEFAULT_LANGUAGE else [language, DEFAULT_LANGUAGE]
+            env = Environment(
+                loader=FileSystemLoader([path / lang.value for lang in languages for path in self.search_paths]),
+                bytecode_cache=self._bytecode_cache,
+                # Reloads are handled in _check_for_changes, not on every lookup
+                auto_reload=False,
+                cache_size=-1,
+                autoescape=select_autoescape(["html", "xml"]),
+                undefined=StrictUndefined,
+                trim_blocks=True,
+                lstrip_blocks=True,
+            )
+            env.filters["money"] = _money_filter(language)
+            env.filters["date"] = _date_filter(language)
+            env.globals.update(sender_name=settings.EMAIL_FROM_NAME, frontend_url=settings.FRONTEND_URL)
+            self._envs[language] = env
+            return env
+
+    def _check_for_changes(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_check_seconds:
+            return
+        self._checked_at = now
+        self._missing.clear()
+        for env in list(self._envs.values()):
+            for key, template in list(env.cache.items()):  # type: ignore[union-attr]
+                if not template.is_up_to_date:
+                    # Templates that extend or include it look it up by
+                    # name on every render, so they pick up the new one
+                    env.cache.pop(key, None)  # type: ignore[union-attr]
+                    self.reloads += 1
+                    logger.info(f"Template {template.name} changed, reloading")
+
+    def get_template(self, name: str, language: LanguageEnum = DEFAULT_LANGUAGE) -> Template:
+        self._check_for_changes()
+        return self._environment(language).get_template(name)
+
+    def render(self, name: str, language: LanguageEnum = DEFAULT_LANGUAGE, **context: Any) -> str:
+        return self.get_template(name, language).render(context)
+
+    def render_email(self, name: str, language: LanguageEnum = DEFAULT_LANGUAGE, **context: Any) -> RenderedEmail:
+        """
+        Render `email/<name>.txt`, whose `subject` block is the subject,
+        and `email/<name>.html` as the HTML part if there is one.
+        """
+        text_template = self.get_template(f"email/{name}.txt", language)
+        subject = "".join(text_template.blocks["subject"](text_template.new_context(context))).strip()
+        text = text_template.render(context)
+
+        html = None
+        html_name = f"email/{name}.html"
+        if (language, html_name) not in self._missing:
+            try:
+                html = self._environment(language).get_template(html_name).render(context)
+            except TemplateNotFound:
+                self._missing.add((language, html_name))
+        return RenderedEmail(subject, text, html)
+
+    def stats(self) -> dict:
+        return {
+            "languages": sorted(language.value for language in self._envs),
+            "templates": sum(len(env.cache) for env in self._envs.values()),  # type: ignore[arg-type]
+            "reloads": self.reloads,
+            "bytecode_dir": str(self.bytecode_dir) if self.bytecode_dir else None,
+        }
+
+
+template_service = TemplateService(
+    search_paths=[Path(settings.FILE_STORAGE_PATH) / "templates", BUILTIN_TEMPLATES_PATH],
+    bytecode_dir=(
+        Path(settings.TEMPLATE_BYTECODE_CACHE_DIR) if settings.TEMPLATE_BYTECODE_CACHE_DIR
+        else Path(settings.FILE_STORAGE_PATH) / "cache" / "templates"
+    ),
+    reload_check_seconds=settings.TEMPLATE_RELOAD_CHECK_SECONDS,
+)
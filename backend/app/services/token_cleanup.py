@@ -0,0 +1,26 @@
+import logging
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.crud.refresh_token import purge_refresh_tokens
+from app.crud.revoked_token import purge_expired_revoked_tokens
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_dead_tokens() -> None:
+    """
+    Remove refresh tokens that can no longer be used and revocation entries
+    for access tokens that have expired anyway.
+
+    Every worker runs this; concurrent runs just find fewer rows to delete.
+    """
+    batch_size = settings.TOKEN_PURGE_BATCH_SIZE
+    async with async_session() as db:
+        refresh_tokens = await purge_refresh_tokens(db, batch_size)
+        revoked_tokens = await purge_expired_revoked_tokens(db, batch_size)
+
+    if refresh_tokens or revoked_tokens:
+        logger.info(
+            f"Purged {refresh_tokens} refresh tokens and {revoked_tokens} revoked access tokens"
+        )
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Literal, Optional
+from uuid import UUID, uuid4
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.client import set_vat_validation_results
+from app.crud.vat_validation_cache import get_cached_validations, store_validations
+from app.db.session import async_session
+from app.services.jobs import load_job
+from app.services.vat_validation import VATValidationResult, normalize_vat_id, validate_vat_id
+from app.utils.vat import is_valid_vat_id
+
+logger = logging.getLogger(__name__)
+
+
+class VATBatchJob:
+    """Progress of one batch revalidation, counted in clients."""
+
+    def __init__(self, total: int):
+        self.id = uuid4().hex
+        self.status: Literal["pending", "running", "done", "failed"] = "pending"
+        self.total = total
+        self.processed = 0
+        self.valid = 0
+        self.invalid = 0
+        self.failed = 0
+        self.cached = 0
+        self.countries: dict[str, dict[str, int]] = defaultdict(lambda: {"valid": 0, "invalid": 0, "failed": 0})
+        self.errors: list[dict[str, Any]] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, vat_id: str, client_ids: list[UUID], result: VATValidationResult) -> None:
+        count = len(client_ids)
+        outcome = "failed" if result.error else "valid" if result.valid else "invalid"
+        setattr(self, outcome, getattr(self, outcome) + count)
+        self.countries[vat_id[:2]][outcome] += count
+        if result.cached:
+            self.cached += count
+        if result.error:
+            self.errors.extend(
+                {"client_id": str(client_id), "ust_id": vat_id, "error": result.error} for client_id in client_ids
+            )
+        self.processed += count
+
+    def snapshot(self, include_errors: bool = True) -> dict:
+        end = self.finished_at or time.time()
+        snapshot = {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "cached": self.cached,
+            "countries": dict(sorted(self.countries.items())),
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+        }
+        if include_errors:
+            snapshot["errors"] = self.errors
+        return snapshot
+
+
+async def _check(vat_id: str) -> tuple[str, VATValidationResult]:
+    return vat_id, await validate_vat_id(vat_id)
+
+
+async def _flush(
+    db: AsyncSession,
+    job: VATBatchJob,
+    by_vat_id: dict[str, list[UUID]],
+    answers: list[tuple[str, VATValidationResult]],
+) -> None:
+    """Write one batch of answers to the clients and the shared cache, in one transaction."""
+    client_rows = []
+    cache_rows = []
+    for vat_id, result in answers:
+        if result.error:
+            # No answer: leave the clients' last known state alone
+            continue
+        client_rows.extend(
+            {"id": client_id, "ust_id_validated": result.valid, "ust_id_checked_at": result.checked_at}
+            for client_id in by_vat_id[vat_id]
+        )
+        if not result.cached and is_valid_vat_id(vat_id):
+            # Only VIES answers; offline rejects are cheap to repeat
+            cache_rows.append({
+                "vat_id": vat_id, "valid": result.valid, "name": result.name or None,
+                "address": result.address or None, "checked_at": result.checked_at,
+            })
+
+    await set_vat_validation_results(db, client_rows)
+    await store_validations(db, cache_rows)
+    await db.commit()
+    for vat_id, result in answers:
+        job.record(vat_id, by_vat_id[vat_id], result)
+
+
+async def run_vat_batch(job: VATBatchJob, targets: list[tuple[UUID, str]], force: bool = False) -> None:
+    """Revalidate each distinct VAT ID of `targets` (`(client_id, ust_id)` pairs) once, writing results in bulk."""
+    job.status = "running"
+    job.started_at = time.time()
+    tasks: list[asyncio.Task] = []
+    try:
+        by_vat_id: dict[str, list[UUID]] = defaultdict(list)
+        for client_id, ust_id in targets:
+            by_vat_id[normalize_vat_id(ust_id)].append(client_id)
+
+        async with async_session() as db:
+            answers: list[tuple[str, VATValidationResult]] = []
+            todo = list(by_vat_id)
+            if not force:
+                now = datetime.now(timezone.utc)
+                for vat_id, entry in (await get_cached_validations(db, todo)).items():
+                    ttl = settings.VIES_CACHE_TTL_SECONDS if entry.valid else settings.VIES_NEGATIVE_CACHE_TTL_SECONDS
+                    if (now - entry.checked_at).total_seconds() < ttl:
+                        answers.append((vat_id, VATValidationResult(
+                            entry.valid, entry.name or "", entry.address or "", entry.checked_at, cached=True
+                        )))
+                fresh = {vat_id for vat_id, _ in answers}
+                todo = [vat_id for vat_id in todo if vat_id not in fresh]
+
+            tasks = [asyncio.create_task(_check(vat_id)) for vat_id in todo]
+            for next_answer in asyncio.as_completed(tasks):
+                answers.append(await next_answer)
+                if len(answers) >= settings.VIES_BATCH_FLUSH_SIZE:
+                    await _flush(db, job, by_vat_id, answers)
+                    answers = []
+            await _flush(db, job, by_vat_id, answers)
+        job.status = "done"
+    except Exception:
+        job.status = "failed"
+        logger.exception(f"VAT batch {job.id} failed after {job.processed} clients")
+        return
+    finally:
+        for task in tasks:
+            task.cancel()
+        job.finished_at = time.time()
+
+    logger.info(
+        f"VAT batch {job.id}: {job.valid} valid, {job.invalid} invalid, {job.failed} failed "
+        f"({job.cached} from cache) in {job.finished_at - job.started_at:.1f}s"
+    )
+
+
+async def follow_job(job_id: str, snapshot: dict, interval: float = 1.0) -> AsyncIterator[bytes]:
+    """NDJSON lines of the job's stored progress every `interval` seconds until it ends."""
+    while True:
+        yield (json.dumps(snapshot) + "\n").encode()
+        if snapshot["status"] in ("done", "failed"):
+            return
+        await asyncio.sleep(interval)
+        # Its own session: the request's is closed once streaming starts
+        async with async_session() as db:
+            snapshot = await load_job(db, "vat_batch", job_id) or snapshot
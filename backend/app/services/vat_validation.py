@@ -1,61 +1,233 @@
 from datetime import datetime, timezone
-from typing import NamedTuple
+from pathlib import Path
+from typing import NamedTuple, Optional
 import asyncio
 import logging
-import time
 
-from zeep import Client
-from zeep.exceptions import Fault, TransportError
+import httpx
+from zeep import AsyncClient
+from zeep.proxy import AsyncServiceProxy
+from zeep.exceptions import Fault
+from zeep.transports import AsyncTransport
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.crud.vat_validation_cache import get_cached_validation, store_validation
+from app.utils.vat import is_valid_vat_id, normalize_vat_id
 
 logger = logging.getLogger(__name__)
 
+VIES_WSDL_PATH = Path(__file__).resolve().parents[1] / "resources" / "vies" / "checkVatService.wsdl"
+VIES_BINDING = "{urn:ec.europa.eu:taxud:vies:services:checkVat}checkVatBinding"
+
 
 class VATValidationResult(NamedTuple):
     valid: bool
     name: str
     address: str
     checked_at: datetime
+    # Set when VIES gave no answer; such results are never cached
+    error: Optional[str] = None
+    cached: bool = False
+
+
+# Faults that mean "ask again later" rather than a bad request
+TRANSIENT_FAULTS = (
+    "MS_UNAVAILABLE",
+    "MS_MAX_CONCURRENT_REQ",
+    "GLOBAL_MAX_CONCURRENT_REQ",
+    "SERVICE_UNAVAILABLE",
+    "TIMEOUT",
+)
 
 
-def _sync_check_vat(vat_id: str, retries: int = 3, delay: float = 1.5) -> VATValidationResult:
-    country_code = vat_id[:2].upper()
-    vat_number = vat_id[2:].replace(" ", "").strip()
-    checked_at = datetime.now(timezone.utc)
+class VIESClient:
+    """
+    Long-lived async client for the VIES checkVat service.
 
-    client = Client(wsdl=settings.VIES_WSDL_URL)
-    last_error = None
+    The WSDL is parsed once per worker, on `start()` or the first call (in
+    a thread, zeep loads it synchronously); calls then share one pooled
+    `httpx.AsyncClient` and back off with `asyncio.sleep`. Pass
+    `http_client` and `service_url` to talk to something other than the
+    real service, e.g. the stub in tests/vies_stub.py.
 
-    for attempt in range(1, retries + 1):
+    Each member state gets its own concurrency cap and circuit breaker, as
+    VIES fails per country (MS_UNAVAILABLE) and rejects callers that send
+    too many parallel requests (MS_MAX_CONCURRENT_REQ).
+    """
+
+    def __init__(
+        self,
+        wsdl: Optional[str] = None,
+        service_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self._wsdl = wsdl
+        self._service_url = service_url
+        self._http_client = http_client
+        self._client: Optional[AsyncClient] = None
+        self._service = None
+        self._lock = asyncio.Lock()
+        # Per member state: concurrency cap and circuit breaker
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    async def _load(self) -> None:
+        wsdl = self._wsdl or settings.VIES_WSDL_URL or str(VIES_WSDL_PATH)
+        http_client = self._http_client or httpx.AsyncClient(
+            timeout=settings.VIES_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.VIES_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.VIES_MAX_CONNECTIONS,
+            ),
+        )
         try:
-            result = client.service.checkVat(
-                countryCode=country_code,
-                vatNumber=vat_number
-            )
-            return VATValidationResult(
-                valid=result["valid"],
-                name=result.get("name", "").strip(),
-                address=result.get("address", "").strip(),
-                checked_at=checked_at,
+            # The sync client only fetches a remote WSDL and its imports,
+            # all of which happens while the client is built
+            with httpx.Client(timeout=settings.VIES_TIMEOUT_SECONDS) as wsdl_client:
+                transport = AsyncTransport(client=http_client, wsdl_client=wsdl_client)
+                client = await asyncio.to_thread(AsyncClient, wsdl, transport=transport)
+        except BaseException:
+            if self._http_client is None:
+                await http_client.aclose()
+            raise
+
+        service_url = self._service_url or settings.VIES_SERVICE_URL
+        if service_url:
+            # AsyncClient.create_service() hands back a sync proxy
+            self._service = AsyncServiceProxy(client, client.wsdl.bindings[VIES_BINDING], address=service_url)
+        else:
+            self._service = client.service
+        self._client = client
+        logger.info(f"VIES client ready (WSDL: {wsdl})")
+
+    async def _get_service(self):
+        if self._service is None:
+            async with self._lock:
+                if self._service is None:
+                    await self._load()
+        return self._service
+
+    async def start(self) -> None:
+        """Parse the WSDL ahead of the first call. Failures are logged; the next call tries again."""
+        try:
+            await self._get_service()
+        except Exception as e:
+            logger.warning(f"VIES client not ready, will retry on first use: {e}")
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._http_client is None:
+            await self._client.transport.aclose()
+        self._client = None
+        self._service = None
+
+    def _country(self, country_code: str) -> tuple[asyncio.Semaphore, CircuitBreaker]:
+        if country_code not in self._breakers:
+            self._slots[country_code] = asyncio.Semaphore(settings.VIES_COUNTRY_CONCURRENCY)
+            self._breakers[country_code] = CircuitBreaker(
+                settings.VIES_BREAKER_THRESHOLD, settings.VIES_BREAKER_COOLDOWN_SECONDS
             )
-        except (Fault, TransportError, Exception) as e:
-            last_error = e
-            if settings.DEBUG:
-                logger.warning(f"[VIES {type(e).__name__}] attempt {attempt}: {e}")
+        return self._slots[country_code], self._breakers[country_code]
 
-            # Only retry for temporary service faults
-            if isinstance(e, Fault) and "MS_UNAVAILABLE" not in str(e).upper():
-                break  # Permanent fault, no retry
+    async def check_vat(
+        self, vat_id: str, retries: Optional[int] = None, delay: Optional[float] = None
+    ) -> VATValidationResult:
+        """
+        Ask VIES about one VAT ID. Never raises: failures come back with
+        `error` set, including right away while the member state's circuit
+        breaker is open.
+        """
+        retries = settings.VIES_RETRIES if retries is None else retries
+        delay = settings.VIES_RETRY_DELAY_SECONDS if delay is None else delay
+        country_code = vat_id[:2].upper()
+        if country_code == "GR":  # VIES knows Greece as EL
+            country_code = "EL"
+        vat_number = vat_id[2:].replace(" ", "").strip()
+        checked_at = datetime.now(timezone.utc)
+        slots, breaker = self._country(country_code)
+        error = None
 
-            time.sleep(delay)
+        for attempt in range(1, retries + 1):
+            async with slots:
+                # Asked once a slot is free, not before queueing for one:
+                # callers waiting behind a failing member state then see
+                # the breaker open and fail without a call
+                if not breaker.allow():
+                    error = f"MS_UNAVAILABLE: VIES calls for {country_code} paused after repeated failures"
+                    break
+                try:
+                    service = await self._get_service()
+                    result = await service.checkVat(countryCode=country_code, vatNumber=vat_number)
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                    if settings.DEBUG:
+                        logger.warning(f"[VIES {type(e).__name__}] {country_code} attempt {attempt}: {e}")
 
-    if settings.DEBUG:
-        logger.error(f"[VIES Failure] All {retries} attempts failed: {last_error}")
-    return VATValidationResult(False, "", "", checked_at)
+                    # Only retry for temporary service faults
+                    if isinstance(e, Fault) and not any(code in str(e).upper() for code in TRANSIENT_FAULTS):
+                        breaker.record_success()  # VIES answered, the request was bad
+                        break  # Permanent fault, no retry
+
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                    return VATValidationResult(
+                        valid=bool(result["valid"]),
+                        name=(result["name"] or "").strip(),
+                        address=(result["address"] or "").strip(),
+                        checked_at=checked_at,
+                    )
+            if attempt < retries:
+                await asyncio.sleep(delay * 2 ** (attempt - 1))
+
+        if settings.DEBUG:
+            logger.error(f"[VIES Failure] {country_code}: {error}")
+        return VATValidationResult(False, "", "", checked_at, error=error)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self._service is not None,
+            "country_concurrency": settings.VIES_COUNTRY_CONCURRENCY,
+            "breakers": {country_code: breaker.stats() for country_code, breaker in sorted(self._breakers.items())},
+        }
+
+
+vies_client = VIESClient()
 
 
 async def validate_vat_id(vat_id: str) -> VATValidationResult:
-    if not vat_id or len(vat_id) < 3:
+    # Malformed IDs and bad check digits never reach VIES
+    if not vat_id or not is_valid_vat_id(vat_id):
         return VATValidationResult(False, "", "", datetime.now(timezone.utc))
 
-    return await asyncio.to_thread(_sync_check_vat, vat_id)
+    return await vies_client.check_vat(vat_id)
+
+
+async def validate_vat_id_cached(db: AsyncSession, vat_id: str, force: bool = False) -> VATValidationResult:
+    """
+    `validate_vat_id` behind the shared `vat_validation_cache` table.
+
+    Answers younger than VIES_CACHE_TTL_SECONDS (valid) or
+    VIES_NEGATIVE_CACHE_TTL_SECONDS (invalid) are served without calling
+    VIES; `force` skips the lookup but still stores the fresh answer.
+    Failed calls (`error` set) are returned as-is and never cached.
+    """
+    vat_id = normalize_vat_id(vat_id)
+    if not is_valid_vat_id(vat_id):
+        # Checked offline, not worth a cache row
+        return VATValidationResult(False, "", "", datetime.now(timezone.utc))
+
+    if not force:
+        entry = await get_cached_validation(db, vat_id)
+        if entry:
+            ttl = settings.VIES_CACHE_TTL_SECONDS if entry.valid else settings.VIES_NEGATIVE_CACHE_TTL_SECONDS
+            age = (datetime.now(timezone.utc) - entry.checked_at).total_seconds()
+            if age < ttl:
+                return VATValidationResult(
+                    entry.valid, entry.name or "", entry.address or "", entry.checked_at, cached=True
+                )
+
+    result = await validate_vat_id(vat_id)
+    if result.error is None:
+        await store_validation(db, vat_id, result.valid, result.name, result.address, result.checked_at)
+    return result
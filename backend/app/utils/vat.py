@@ -0,0 +1,368 @@
+"""
+Offline syntax and check-digit validation of EU VAT IDs (USt-IdNr).
+
+Catches typos before anything is sent to VIES. Passing only means the ID
+is well-formed for its member state; whether it is actually assigned is
+still for VIES to answer.
+"""
+import re
+from datetime import date
+from typing import Callable, Iterable, Optional
+
+
+class InvalidVATID(ValueError):
+    """A VAT ID that no member state could have issued."""
+
+
+_SEPARATORS = re.compile(r"[\s.\-]")
+
+
+def normalize_vat_id(vat_id: str) -> str:
+    """'de 811.193-231' -> 'DE811193231'"""
+    return _SEPARATORS.sub("", vat_id).upper()
+
+
+# ---- Checksum building blocks ----
+
+def _weighted(digits: str, weights: Iterable[int]) -> int:
+    return sum(w * (ord(c) - 48) for w, c in zip(weights, digits))
+
+
+def _luhn(digits: str) -> int:
+    """Luhn sum mod 10; 0 for a number with a valid trailing check digit."""
+    total = 0
+    for i, c in enumerate(reversed(digits)):
+        d = ord(c) - 48
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10
+
+
+def _mod_11_10(digits: str) -> bool:
+    """ISO 7064 MOD 11,10 with the check digit last (DE, HR)."""
+    product = 10
+    for c in digits[:-1]:
+        product = 2 * ((product + ord(c) - 48) % 10 or 10) % 11
+    return (11 - product) % 10 == ord(digits[-1]) - 48
+
+
+def _is_date(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
+
+
+# ---- Member states ----
+# Each check gets the national part (after the country prefix), already
+# matched against the state's pattern below.
+
+def _at(n: str) -> bool:
+    return (6 - _luhn(n[1:8])) % 10 == int(n[8])
+
+
+def _be(n: str) -> bool:
+    n = n.zfill(10)  # Old 9-digit numbers gained a leading 0
+    return n[0] in "01" and (int(n[:8]) + int(n[8:])) % 97 == 0
+
+
+def _bg(n: str) -> bool:
+    if len(n) == 9:  # Legal entities
+        check = _weighted(n, range(1, 9)) % 11
+        if check == 10:
+            check = _weighted(n, range(3, 11)) % 11
+        return check % 10 == int(n[8])
+
+    # Physical persons (EGN), foreigners (PNF) and others
+    last = int(n[9])
+    year, month, day = int(n[:2]), int(n[2:4]), int(n[4:6])
+    if month > 40:
+        year, month = year + 2000, month - 40
+    elif month > 20:
+        year, month = year + 1800, month - 20
+    else:
+        year += 1900
+    if _is_date(year, month, day) and _weighted(n, (2, 4, 8, 5, 10, 9, 7, 3, 6)) % 11 % 10 == last:
+        return True
+    if _weighted(n, (21, 19, 17, 13, 11, 9, 7, 3, 1)) % 10 == last:
+        return True
+    return (11 - _weighted(n, (4, 3, 2, 7, 6, 5, 4, 3, 2))) % 11 == last
+
+
+_CY_ODD = {"0": 1, "1": 0, "2": 5, "3": 7, "4": 9, "5": 13, "6": 15, "7": 17, "8": 19, "9": 21}
+
+
+def _cy(n: str) -> bool:
+    if n.startswith("12"):
+        return False
+    total = sum(_CY_ODD[c] for c in n[0:8:2]) + sum(int(c) for c in n[1:8:2])
+    return chr(65 + total % 26) == n[8]
+
+
+def _cz(n: str) -> bool:
+    if len(n) == 8:  # Legal entities
+        if n[0] == "9":
+            return False
+        check = (11 - _weighted(n, (8, 7, 6, 5, 4, 3, 2))) % 11
+        return (check or 1) % 10 == int(n[7])
+    if len(n) == 9 and n[0] == "6":  # Special cases, first digit not weighted
+        check = _weighted(n[1:], (8, 7, 6, 5, 4, 3, 2)) % 11
+        return (8 - (10 - check) % 11) % 10 == int(n[8])
+
+    return _birth_number(n)
+
+
+def _birth_number(n: str) -> bool:
+    """Czech/Slovak birth number: YYMMDD (+50 on the month for women, +20 since 2004) and a serial."""
+    year, month, day = 1900 + int(n[:2]), int(n[2:4]) % 50 % 20, int(n[4:6])
+    if len(n) == 9:
+        # 9 digits and no check digit until 1953
+        if year >= 1980:
+            year -= 100
+        return year <= 1953 and _is_date(year, month, day)
+    if year < 1954:
+        year += 100
+    return _is_date(year, month, day) and int(n[:9]) % 11 % 10 == int(n[9])
+
+
+def _de(n: str) -> bool:
+    return _mod_11_10(n)
+
+
+def _dk(n: str) -> bool:
+    return _weighted(n, (2, 7, 6, 5, 4, 3, 2, 1)) % 11 == 0
+
+
+def _ee(n: str) -> bool:
+    return _weighted(n, (3, 7, 1, 3, 7, 1, 3, 7, 1)) % 10 == 0
+
+
+def _el(n: str) -> bool:
+    n = n.zfill(9)
+    check = 0
+    for c in n[:8]:
+        check = check * 2 + ord(c) - 48
+    return check * 2 % 11 % 10 == int(n[8])
+
+
+_DNI_LETTERS = "TRWAGMYFPDXBNJZSQVHLCKE"
+
+
+def _es(n: str) -> bool:
+    first, body, last = n[0], n[1:8], n[8]
+    if first.isdigit():  # DNI
+        return _DNI_LETTERS[int(n[:8]) % 23] == last
+    if first in "XYZ":  # NIE, X/Y/Z stand for 0/1/2
+        return _DNI_LETTERS[int(str("XYZ".index(first)) + body) % 23] == last
+    if first in "KLM":  # Special NIF
+        return _DNI_LETTERS[int(body) % 23] == last
+    if first in "ABCDEFGHJNPQRSUVW":  # CIF: Luhn digit or its letter
+        check = (10 - _luhn(body + "0")) % 10
+        return last == str(check) or last == "JABCDEFGHI"[check]
+    return False
+
+
+def _fi(n: str) -> bool:
+    return _weighted(n, (7, 9, 10, 5, 8, 4, 2, 1)) % 11 == 0
+
+
+_FR_KEY_ALPHABET = "0123456789ABCDEFGHJKLMNPQRSTUVWXYZ"
+
+
+def _fr(n: str) -> bool:
+    key, siren = n[:2], n[2:]
+    # Monaco numbers (000...) are not SIRENs
+    if siren[:3] != "000" and _luhn(siren) != 0:
+        return False
+    if key.isdigit():
+        return int(key) == (int(siren) * 100 + 12) % 97
+    # Newer alphanumeric keys
+    if key[0].isdigit():
+        check = _FR_KEY_ALPHABET.index(key[0]) * 24 + _FR_KEY_ALPHABET.index(key[1]) - 10
+    else:
+        check = _FR_KEY_ALPHABET.index(key[0]) * 34 + _FR_KEY_ALPHABET.index(key[1]) - 100
+    return (int(siren) + 1 + check // 11) % 11 == check % 11
+
+
+def _hr(n: str) -> bool:
+    return _mod_11_10(n)
+
+
+def _hu(n: str) -> bool:
+    return _weighted(n, (9, 7, 3, 1, 9, 7, 3, 1)) % 10 == 0
+
+
+_IE_LETTERS = "WABCDEFGHIJKLMNOPQRSTUV"
+
+
+def _ie(n: str) -> bool:
+    if not n[1].isdigit():
+        # Old format 1X23456Y is 0234561Y in the current one
+        n = "0" + n[2:7] + n[0] + n[7]
+    total = _weighted(n, (8, 7, 6, 5, 4, 3, 2))
+    if len(n) == 9:
+        total += 9 * _IE_LETTERS.index(n[8])
+    return _IE_LETTERS[total % 23] == n[7]
+
+
+def _it(n: str) -> bool:
+    # Digits 8-10 are the issuing tax office
+    office = n[7:10]
+    return (
+        n[:7] != "0000000"
+        and ("001" <= office <= "100" or office in ("120", "121", "888", "999"))
+        and _luhn(n) == 0
+    )
+
+
+def _lt(n: str) -> bool:
+    # The digit before the check digit is always 1 for VAT payers
+    if n[-2] != "1":
+        return False
+    body = n[:-1]
+    check = sum((1 + i % 9) * (ord(c) - 48) for i, c in enumerate(body)) % 11
+    if check == 10:
+        check = sum((1 + (i + 2) % 9) * (ord(c) - 48) for i, c in enumerate(body)) % 11
+    return check % 10 == int(n[-1])
+
+
+def _lu(n: str) -> bool:
+    return int(n[:6]) % 89 == int(n[6:])
+
+
+def _lv(n: str) -> bool:
+    if n[0] > "3":  # Legal entities
+        return _weighted(n, (9, 1, 4, 8, 3, 10, 2, 5, 7, 6, 1)) % 11 == 3
+    # Personal codes: DDMMYY plus a century digit, except the date-less
+    # ones starting with 32 issued since 2017
+    if not n.startswith("32"):
+        century = {"0": 1800, "1": 1900, "2": 2000}.get(n[6])
+        if century is None or not _is_date(century + int(n[4:6]), int(n[2:4]), int(n[:2])):
+            return False
+    return (1 + _weighted(n, (10, 5, 8, 4, 2, 1, 6, 3, 7, 9))) % 11 % 10 == int(n[10])
+
+
+def _mt(n: str) -> bool:
+    return _weighted(n, (3, 4, 6, 7, 8, 9, 10, 1)) % 37 == 0
+
+
+def _nl(n: str) -> bool:
+    if int(n[:9]) == 0 or n[10:] == "00":
+        return False
+    # RSIN-based numbers (11-proof), or since 2020 ISO 7064 MOD 97-10
+    # over "NL" + number with letters as 10..35 (N=23, L=21, B=11)
+    if (_weighted(n, (9, 8, 7, 6, 5, 4, 3, 2)) - int(n[8])) % 11 == 0:
+        return True
+    return int("2321" + n[:9] + "11" + n[10:]) % 97 == 1
+
+
+def _pl(n: str) -> bool:
+    check = _weighted(n, (6, 5, 7, 2, 3, 4, 5, 6, 7)) % 11
+    return check == int(n[9])
+
+
+def _pt(n: str) -> bool:
+    check = 11 - _weighted(n, (9, 8, 7, 6, 5, 4, 3, 2)) % 11
+    return check % 11 % 10 == int(n[8])
+
+
+def _ro(n: str) -> bool:
+    body = n[:-1].zfill(9)
+    return 10 * _weighted(body, (7, 5, 3, 2, 1, 7, 5, 3, 2)) % 11 % 10 == int(n[-1])
+
+
+def _se(n: str) -> bool:
+    return _luhn(n[:10]) == 0
+
+
+def _si(n: str) -> bool:
+    check = 11 - _weighted(n, (8, 7, 6, 5, 4, 3, 2)) % 11
+    return (0 if check == 10 else check) == int(n[7])
+
+
+def _sk(n: str) -> bool:
+    if _birth_number(n):
+        return True
+    return n[0] != "0" and n[2] in "234789" and int(n) % 11 == 0
+
+
+def _xi(n: str) -> bool:
+    if len(n) == 5:  # Government departments, health authorities
+        return int(n[2:]) < 500 if n[:2] == "GD" else int(n[2:]) >= 500
+    # 12 digits are a branch suffix on the 9-digit number
+    check = _weighted(n, (8, 7, 6, 5, 4, 3, 2, 10, 1)) % 97
+    if int(n[:3]) >= 100:
+        # Numbers issued since 2010 use the 9755 scheme
+        return check in (0, 42, 55)
+    return check == 0
+
+
+_FORMATS: dict[str, tuple[str, Callable[[str], bool]]] = {
+    "AT": (r"U\d{8}", _at),
+    "BE": (r"[01]?\d{9}", _be),
+    "BG": (r"\d{9,10}", _bg),
+    "CY": (r"\d{8}[A-Z]", _cy),
+    "CZ": (r"\d{8,10}", _cz),
+    "DE": (r"[1-9]\d{8}", _de),
+    "DK": (r"[1-9]\d{7}", _dk),
+    "EE": (r"\d{9}", _ee),
+    "EL": (r"\d{8,9}", _el),
+    "ES": (r"[0-9A-Z]\d{7}[0-9A-Z]", _es),
+    "FI": (r"\d{8}", _fi),
+    "FR": (r"[0-9A-HJ-NP-Z]{2}\d{9}", _fr),
+    "HR": (r"\d{11}", _hr),
+    "HU": (r"\d{8}", _hu),
+    "IE": (r"\d{7}[A-W][A-IW]?|\d[A-Z+*]\d{5}[A-W]", _ie),
+    "IT": (r"\d{11}", _it),
+    "LT": (r"\d{9}|\d{12}", _lt),
+    "LU": (r"\d{8}", _lu),
+    "LV": (r"\d{11}", _lv),
+    "MT": (r"[1-9]\d{7}", _mt),
+    "NL": (r"\d{9}B\d{2}", _nl),
+    "PL": (r"\d{10}", _pl),
+    "PT": (r"[1-9]\d{8}", _pt),
+    "RO": (r"[1-9]\d{1,9}", _ro),
+    "SE": (r"\d{10}01", _se),
+    "SI": (r"[1-9]\d{7}", _si),
+    "SK": (r"\d{10}", _sk),
+    "XI": (r"\d{9}|\d{12}|GD[0-4]\d{2}|HA[5-9]\d{2}", _xi),
+}
+_CHECKS = {country: (re.compile(pattern).fullmatch, check) for country, (pattern, check) in _FORMATS.items()}
+
+# Member states (plus Northern Ireland) that VIES answers for
+VAT_COUNTRIES = frozenset(_CHECKS)
+
+
+def _validate(vat_id: str) -> tuple[str, Optional[str]]:
+    """Normalized ID and the reason it is invalid, if it is."""
+    vat_id = normalize_vat_id(vat_id)
+    country, number = vat_id[:2], vat_id[2:]
+    if country == "GR":  # VIES knows Greece as EL
+        country, vat_id = "EL", "EL" + number
+    checks = _CHECKS.get(country)
+    if checks is None:
+        return vat_id, f"Unknown VAT ID country code '{country}'"
+    matches, check = checks
+    if not matches(number):
+        return vat_id, f"Not a valid {country} VAT ID format"
+    if not check(number):
+        return vat_id, f"Invalid {country} VAT ID check digit"
+    return vat_id, None
+
+
+def check_vat_id(vat_id: str) -> str:
+    """
+    Return `vat_id` normalized ('gr 094014201' -> 'EL094014201') if it is
+    well-formed and its check digits add up; raise `InvalidVATID` if not.
+    """
+    vat_id, error = _validate(vat_id)
+    if error:
+        raise InvalidVATID(error)
+    return vat_id
+
+
+def is_valid_vat_id(vat_id: str) -> bool:
+    """Format and check digits only, without the error message."""
+    return _validate(vat_id)[1] is None
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,11 +8,24 @@ from pathlib import Path
 from app.core.config import settings
 from app.core.logging import init_logging
 from app.core.exceptions import register_exception_handlers
+from app.core.hashing import hashing_pool
+from app.core.background import start_periodic, stop_background_tasks
+from app.core.revocation import revocation_list
+from app.services.token_cleanup import purge_dead_tokens
+from app.services.jobs import purge_finished_jobs
+from app.services.item_suggest import item_suggest_index
+from app.services.vat_validation import vies_client
+from app.services.email import smtp_pool
+from app.services.mail_queue import mail_queue
+from app.services.metrics import flush_metrics, loop_lag_monitor, request_metrics
+from app.core.metrics import MetricsMiddleware
+from app.core.watchdog import loop_watchdog
 from app.routes import autoload_routes
 
 from app.models.enums import RoleEnum
 from app.models.user import UserCreate
-from app.db.session import async_session
+from app.db.session import async_session, read_engine, replica_monitor
+from app.db.query_stats import QueryStats, current_query_stats
 from app.crud.user import get_user_by_email, create_user
 
 logger = logging.getLogger(__name__)
@@ -49,9 +64,41 @@ async def lifespan(app: FastAPI):
             logger.info(f"Default admin created: {user_in.email}")
         else:
             logger.debug(f"Default admin already exists: {existing.email}")
+
+    # Load revoked access tokens before serving, then keep them in sync
+    await revocation_list.refresh()
+    start_periodic("revocation-list", settings.REVOCATION_REFRESH_SECONDS, revocation_list.refresh)
+    start_periodic("token-purge", settings.TOKEN_PURGE_INTERVAL_SECONDS, purge_dead_tokens)
+    start_periodic("job-purge", settings.JOB_PURGE_INTERVAL_SECONDS, purge_finished_jobs)
+    if read_engine is not None:
+        await replica_monitor.check()
+        start_periodic("replica-monitor", settings.READ_REPLICA_CHECK_SECONDS, replica_monitor.check)
+
+    # Item autocomplete index, first load before serving
+    await item_suggest_index.refresh()
+    start_periodic("item-suggest", settings.ITEM_SUGGEST_REFRESH_SECONDS, item_suggest_index.refresh)
+
+    # Parse the VIES WSDL once, not on the first validation request
+    await vies_client.start()
+
+    # Outbound mail is queued by requests and sent from here
+    start_periodic("mail-queue", settings.EMAIL_QUEUE_POLL_SECONDS, mail_queue.drain)
+
+    # Metrics: event loop lag probe, and the per-worker file in multi-worker mode
+    start_periodic("loop-lag", settings.METRICS_LOOP_LAG_INTERVAL_SECONDS, loop_lag_monitor.tick)
+    start_periodic("metrics-flush", settings.METRICS_FLUSH_SECONDS, flush_metrics)
+
+    # Opt-in: report callbacks that block the event loop
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
     yield
     # === Shutdown ===
-    # We don't really need to do any teardown here
+    loop_watchdog.stop()
+    await stop_background_tasks()
+    await flush_metrics(live=False)
+    await vies_client.aclose()
+    await asyncio.to_thread(smtp_pool.close)
+    hashing_pool.shutdown()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -79,14 +126,52 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Log user-agent and IP on each request (for observability)
+    # One access log line per request; sample it with LOG_SAMPLE_RATES
+    access_logger = logging.getLogger("app.access")
+
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
-        logger = logging.getLogger("uvicorn.access")
-        ua = request.headers.get("user-agent", "-")
+        if not access_logger.isEnabledFor(logging.INFO):
+            return await call_next(request)
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
         ip = request.client.host if request.client else "unknown"
-        logger.debug(f"Incoming request: {request.method} {request.url.path} from {ip} - UA: {ua}")
-        return await call_next(request)
+        ua = request.headers.get("user-agent", "-")
+        access_logger.log(
+            logging.WARNING if response.status_code >= 500 else logging.INFO,
+            '%s %s %s %s %sms "%s"', ip, request.method, request.url.path, response.status_code, duration_ms, ua,
+            extra={
+                "client_ip": ip, "method": request.method, "path": request.url.path,
+                "status": response.status_code, "duration_ms": duration_ms, "user_agent": ua,
+            },
+        )
+        return response
+
+    # Count SQL statements per request and report them as Server-Timing.
+    # call_next returns once the headers are ready, before a streamed body
+    # (NDJSON exports, job follow streams) has run its queries, so those
+    # responses get no header rather than a partial count. Only streamed
+    # bodies come without Content-Length, apart from 204/304 with no body.
+    @app.middleware("http")
+    async def track_db_queries(request: Request, call_next):
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            current_query_stats.reset(token)
+        if "content-length" not in response.headers and response.status_code not in (204, 304):
+            return response
+        response.headers["Server-Timing"] = stats.server_timing()
+        logger.debug(
+            "%s %s: %s queries in %s ms", request.method, request.url.path, stats.count, stats.duration_ms,
+            extra={"db_queries": stats.count, "db_time_ms": stats.duration_ms},
+        )
+        return response
+
+    # Outermost, so the latency covers the other middlewares too
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
 
     # Register all routers dynamically
     autoload_routes(app)
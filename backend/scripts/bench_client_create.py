@@ -0,0 +1,86 @@
+"""
+Throughput of POST /clients with 0, 5 and 50 nested contacts.
+
+Run against a live server, e.g.:
+
+    python scripts/bench_client_create.py --base-url http://localhost:8000
+
+Prints requests/s, mean latency and the DB statement count reported in the
+Server-Timing header for each payload size.
+"""
+import argparse
+import asyncio
+import re
+import statistics
+import time
+
+import httpx
+
+
+def make_payload(n_contacts: int, seq: int) -> dict:
+    return {
+        "name": f"Bench Client {seq}",
+        "type": "Client",
+        "contacts": [
+            {
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": f"contact{i}.{seq}@example.com",
+                "is_main_contact": i == 0,
+            }
+            for i in range(n_contacts)
+        ],
+    }
+
+
+async def login(client: httpx.AsyncClient, args) -> dict:
+    r = await client.post(
+        f"{args.prefix}/auth/token",
+        data={"username": args.email, "password": args.password},
+    )
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def run(client: httpx.AsyncClient, args, headers: dict, n_contacts: int):
+    latencies: list[float] = []
+    queries: list[int] = []
+    counter = iter(range(args.requests))
+
+    async def worker():
+        for seq in counter:
+            start = time.perf_counter()
+            r = await client.post(f"{args.prefix}/clients/", json=make_payload(n_contacts, seq), headers=headers)
+            latencies.append(time.perf_counter() - start)
+            r.raise_for_status()
+            match = re.search(r'desc="(\d+) queries"', r.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{n_contacts:>3} contacts: {args.requests / elapsed:8.1f} req/s, "
+        f"mean {statistics.mean(latencies) * 1000:6.1f} ms, "
+        f"queries/request {statistics.median(queries) if queries else 'n/a'}"
+    )
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        headers = await login(client, args)
+        for n_contacts in (0, 5, 50):
+            await run(client, args, headers, n_contacts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="gotta_change_this")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,70 @@
+"""
+Payload size and latency of GET /clients: full vs sparse fieldsets.
+
+Run against a live server with a few hundred clients, e.g.:
+
+    python scripts/bench_client_list.py --base-url http://localhost:8000
+
+Compares the default response (full ClientRead with contacts and
+attachments) with the picker's `fields=id,name,type,is_active` and with a
+single expanded relation.
+"""
+import argparse
+import asyncio
+import re
+import statistics
+import time
+
+import httpx
+
+VARIANTS = {
+    "full": {},
+    "picker": {"fields": "id,name,type,is_active"},
+    "picker+contacts": {"fields": "id,name,type,is_active", "expand": "contacts"},
+}
+
+
+async def login(client: httpx.AsyncClient, args) -> dict:
+    r = await client.post(
+        f"{args.prefix}/auth/token",
+        data={"username": args.email, "password": args.password},
+    )
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def run(client: httpx.AsyncClient, args, headers: dict, name: str, params: dict):
+    latencies: list[float] = []
+    size = queries = 0
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        r = await client.get(f"{args.prefix}/clients", params={"limit": args.limit, **params}, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        r.raise_for_status()
+        size = len(r.content)
+        match = re.search(r'desc="(\d+) queries"', r.headers.get("server-timing", ""))
+        queries = int(match.group(1)) if match else 0
+
+    print(
+        f"{name:>16}: {size / 1024:9.1f} KiB, "
+        f"median {statistics.median(latencies) * 1000:7.1f} ms, "
+        f"{queries} queries"
+    )
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        headers = await login(client, args)
+        for name, params in VARIANTS.items():
+            await run(client, args, headers, name, params)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="gotta_change_this")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""
+Latency of /clients/search on a large seeded client table.
+
+Runs in-process against DATABASE_URL (use a scratch database that has been
+migrated to head):
+
+    python scripts/bench_client_search.py --clients 500000
+
+Seeds `--clients` clients with one contact each (skipped if the table
+already has that many), then runs a mix of full-word, prefix, typo, VAT ID
+and contact-email queries through crud.client.search_clients and prints
+median/p95 latency per query. The target is p95 under 20 ms.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.crud.client import search_clients  # noqa: E402
+from app.db.session import async_session  # noqa: E402
+
+# Pseudo-random company names from a small vocabulary, so queries hit
+# realistic result-set sizes instead of exactly one row
+SEED_CLIENTS_SQL = text("""
+    INSERT INTO client (id, name, type, ust_id, ust_id_validated, notes, dunning_level, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(),
+           (ARRAY['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker'])[1 + g % 8]
+             || ' ' || (ARRAY['Bau', 'Logistik', 'Consulting', 'Software', 'Handel', 'Technik'])[1 + (g / 8) % 6]
+             || ' ' || (ARRAY['GmbH', 'AG', 'KG', 'e.K.'])[1 + (g / 48) % 4] || ' ' || g,
+           'Client', 'DE' || lpad((100000000 + g)::text, 9, '0'), false,
+           'Kunde seit ' || (2000 + g % 25) || ', Ansprechpartner wechselt häufig', 0, true, now(), now()
+    FROM generate_series(1, :n) AS g
+""")
+SEED_CONTACTS_SQL = text("""
+    INSERT INTO contact_person (id, client_id, first_name, last_name, email, is_main_contact, created_at, updated_at)
+    SELECT gen_random_uuid(), c.id, 'Anna', split_part(c.name, ' ', 1),
+           'anna.' || lower(split_part(c.name, ' ', 1)) || '.' || split_part(c.name, ' ', 4) || '@example.com',
+           true, now(), now()
+    FROM client c
+    WHERE NOT EXISTS (SELECT 1 FROM contact_person p WHERE p.client_id = c.id)
+""")
+
+QUERIES = [
+    "Schneider Logistik",   # full words
+    "Schnei Logi",          # prefixes
+    "Schnieder",            # typo, trigram only
+    "DE100012345",          # VAT ID
+    "anna.weber.4711",      # contact email
+    "Kunde seit 2011",      # notes
+]
+
+
+async def seed(clients: int) -> None:
+    async with async_session() as db:
+        existing = (await db.execute(text("SELECT count(*) FROM client"))).scalar_one()
+        if existing >= clients:
+            return
+        print(f"Seeding {clients - existing} clients with contacts...")
+        await db.execute(SEED_CLIENTS_SQL, {"n": clients - existing})
+        await db.execute(SEED_CONTACTS_SQL)
+        await db.commit()
+        await db.execute(text("ANALYZE client"))
+        await db.execute(text("ANALYZE contact_person"))
+
+
+async def bench(query: str, repeat: int, limit: int) -> None:
+    samples = []
+    async with async_session() as db:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = await search_clients(db, query, limit=limit)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{query!r:>24}: {len(results):3} hits, median {statistics.median(samples):6.2f} ms, p95 {p95:6.2f} ms")
+
+
+async def main(args):
+    await seed(args.clients)
+    for query in args.queries or QUERIES:
+        await bench(query, args.repeat, args.limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("queries", nargs="*", help="Queries to run instead of the built-in mix")
+    asyncio.run(main(parser.parse_args()))
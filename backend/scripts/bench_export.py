@@ -0,0 +1,85 @@
+"""
+Peak memory and throughput of the NDJSON export on a large item table.
+
+Runs in-process against DATABASE_URL (use a scratch database):
+
+    python scripts/bench_export.py --rows 1000000
+
+Seeds `--rows` items with generate_series (skipped if the table already has
+that many), then streams the table through the export generator, plain and
+gzipped, discarding the output. Peak RSS should stay close to the baseline
+regardless of `--rows`; `--orm` additionally loads the table as ORM objects
+for comparison (run it last, peak RSS only ever grows).
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from app.db.session import async_session  # noqa: E402
+from app.models.item import Item  # noqa: E402
+from app.services.export import ExportDataset, stream_ndjson  # noqa: E402
+
+SEED_SQL = text("""
+    INSERT INTO item (id, name, description, type, unit, unit_price, cost_price, vat_rate, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench item ' || g, repeat('x', 200), 'service', 'hour', 10, 0, 19, true,
+           now() - make_interval(secs => g), now()
+    FROM generate_series(1, :n) AS g
+""")
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed(rows: int) -> None:
+    async with async_session() as db:
+        existing = (await db.execute(text("SELECT count(*) FROM item"))).scalar_one()
+        if existing >= rows:
+            return
+        print(f"Seeding {rows - existing} items...")
+        await db.execute(SEED_SQL, {"n": rows - existing})
+        await db.commit()
+
+
+async def export(compress: bool, batch_size: int) -> None:
+    size = 0
+    start = time.perf_counter()
+    async for chunk in stream_ndjson(ExportDataset.items, compress=compress, batch_size=batch_size):
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    label = "ndjson.gz" if compress else "ndjson"
+    print(f"{label:>10}: {size / 2**20:8.1f} MiB in {elapsed:6.1f} s, peak RSS {peak_rss_mib():7.1f} MiB")
+
+
+async def load_orm() -> None:
+    start = time.perf_counter()
+    async with async_session() as db:
+        items = (await db.exec(select(Item))).all()
+    elapsed = time.perf_counter() - start
+    print(f"{'orm':>10}: {len(items)} objects in {elapsed:6.1f} s, peak RSS {peak_rss_mib():7.1f} MiB")
+
+
+async def main(args):
+    await seed(args.rows)
+    print(f"{'baseline':>10}: peak RSS {peak_rss_mib():7.1f} MiB")
+    await export(compress=False, batch_size=args.batch_size)
+    await export(compress=True, batch_size=args.batch_size)
+    if args.orm:
+        await load_orm()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--orm", action="store_true", help="Also load the table as ORM objects")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""
+Lookup latency of the in-memory item autocomplete index.
+
+Pure in-process, no database needed:
+
+    python scripts/bench_item_suggest.py --items 200000
+
+Builds the index from synthetic catalog rows and times prefix lookups of
+increasing length, as typed keystroke by keystroke. Every lookup should
+stay well under a millisecond.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.item_suggest import ItemSuggestIndex, Suggestion  # noqa: E402
+
+WORDS = [
+    "Design", "Beratung", "Wartung", "Lizenz", "Schraube", "Kabel", "Server", "Support",
+    "Premium", "Basic", "Stunde", "Paket", "Montage", "Schulung", "Hosting", "Adapter",
+]
+
+
+def main(args):
+    rng = random.Random(42)
+    rows = [
+        Suggestion(
+            uuid4(),
+            " ".join(rng.choices(WORDS, k=3)) + f" {i}",
+            f"SKU-{i:07d}",
+            "piece",
+            Decimal("9.99"),
+            Decimal("19"),
+        )
+        for i in range(args.items)
+    ]
+
+    index = ItemSuggestIndex()
+    start = time.perf_counter()
+    index._rebuild(rows)
+    print(f"Built index: {len(index)} items, {len(index._keys)} keys in {time.perf_counter() - start:.2f}s")
+
+    for query in ["s", "sc", "schu", "schulung", "schulung pa", "sku-00123", "premium basic"]:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = index.search(query, args.limit)
+            samples.append((time.perf_counter() - start) * 1_000_000)
+        print(f"{query!r:>16}: {len(results):2} hits, median {statistics.median(samples):7.1f} µs, max {max(samples):7.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1000)
+    main(parser.parse_args())
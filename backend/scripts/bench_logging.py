@@ -0,0 +1,96 @@
+"""
+Cost of a log call on the calling thread (i.e. the event loop), direct
+handlers vs. the queue pipeline of app/core/logging.py.
+
+Pure in-process; writes to a temporary file and /dev/null:
+
+    python scripts/bench_logging.py --records 100000
+
+`--io-delay-ms` adds a delay to every file write, standing in for a
+slow or busy disk. Also compares a disabled DEBUG call with an f-string
+message against the lazy %-style form.
+"""
+import argparse
+import logging
+import os
+import queue
+import statistics
+import sys
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.logging import _DeferredQueueHandler  # noqa: E402
+
+FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+class SlowFileHandler(RotatingFileHandler):
+    io_delay = 0.0
+
+    def emit(self, record):
+        time.sleep(self.io_delay)
+        super().emit(record)
+
+
+def handlers(directory: str) -> list[logging.Handler]:
+    file_handler = SlowFileHandler(os.path.join(directory, "app.log"), maxBytes=50 * 1024 * 1024, backupCount=1)
+    console_handler = logging.StreamHandler(open(os.devnull, "w"))
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(logging.Formatter(FORMAT))
+    return [file_handler, console_handler]
+
+
+def run(label: str, logger: logging.Logger, records: int) -> None:
+    samples = []
+    for i in range(records):
+        start = time.perf_counter()
+        logger.info("%s %s %s %sms", "GET", "/api/v1/items", 200, i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(
+        f"{label:>8}: {statistics.mean(samples) * 1e6:6.2f} µs mean, "
+        f"p99 {samples[int(len(samples) * 0.99)] * 1e6:6.1f} µs, max {samples[-1] * 1e3:6.2f} ms"
+    )
+
+
+def main(args):
+    SlowFileHandler.io_delay = args.io_delay_ms / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        direct = logging.getLogger("bench.direct")
+        direct.propagate = False
+        direct.setLevel(logging.INFO)
+        direct.handlers = handlers(directory)
+        run("direct", direct, args.records)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers(directory))
+        listener.start()
+        queued = logging.getLogger("bench.queued")
+        queued.propagate = False
+        queued.setLevel(logging.INFO)
+        queued.handlers = [_DeferredQueueHandler(log_queue)]
+        run("queued", queued, args.records)
+        start = time.perf_counter()
+        listener.stop()
+        print(f"{'':>8}  listener drained its backlog in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    method, path, count = "GET", "/api/v1/items", 3
+    for label, call in (
+        ("f-string", lambda: direct.debug(f"{method} {path}: {count} queries")),
+        ("%-style", lambda: direct.debug("%s %s: %s queries", method, path, count)),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.records):
+            call()
+        print(f"{label:>8}: disabled DEBUG call {(time.perf_counter() - start) / args.records * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--io-delay-ms", type=float, default=0.0)
+    main(parser.parse_args())
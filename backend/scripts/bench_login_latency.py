@@ -0,0 +1,74 @@
+"""
+Measure latency of an unrelated GET endpoint while /auth/token is hammered.
+
+Run against a live server, e.g.:
+
+    uvicorn main:app --workers 1 &
+    python scripts/bench_login_latency.py --base-url http://localhost:8000
+
+With bcrypt on the event loop the p99 of /status/health climbs to the cost of
+a few hashes; with the hashing pool it should stay in the low milliseconds.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def hammer_login(client: httpx.AsyncClient, args, stop: asyncio.Event, counts: dict):
+    while not stop.is_set():
+        r = await client.post(
+            f"{args.prefix}/auth/token",
+            data={"username": args.email, "password": args.password},
+        )
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+
+
+async def probe(client: httpx.AsyncClient, args, stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(f"{args.prefix}/status/health")
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(args.probe_interval)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        stop = asyncio.Event()
+        samples: list[float] = []
+        counts: dict[int, int] = {}
+
+        tasks = [asyncio.create_task(hammer_login(client, args, stop, counts)) for _ in range(args.concurrency)]
+        tasks.append(asyncio.create_task(probe(client, args, stop, samples)))
+
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    print(f"login responses: {counts}")
+    print(f"health probes:   {len(samples)}")
+    print(f"  p50 = {statistics.median(samples):.1f} ms")
+    print(f"  p95 = {percentile(samples, 95):.1f} ms")
+    print(f"  p99 = {percentile(samples, 99):.1f} ms")
+    print(f"  max = {max(samples):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="gotta_change_this")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
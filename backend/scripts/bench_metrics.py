@@ -0,0 +1,82 @@
+"""
+Per-request cost of MetricsMiddleware, measured by calling a one-route
+FastAPI app directly through ASGI (no server, no sockets):
+
+    python scripts/bench_metrics.py --requests 5000 --rounds 5
+
+Compares no middleware, the pure ASGI MetricsMiddleware, and the same
+bookkeeping done in a BaseHTTPMiddleware (the `@app.middleware("http")`
+style used for the request log).
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.metrics import UNMATCHED_ROUTE, MetricsMiddleware, RequestMetrics  # noqa: E402
+
+
+def make_app(kind: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    if kind == "asgi":
+        app.add_middleware(MetricsMiddleware, metrics=RequestMetrics())
+    elif kind == "base-http":
+        metrics = RequestMetrics()
+
+        @app.middleware("http")
+        async def record(request: Request, call_next):
+            start = time.perf_counter()
+            response = await call_next(request)
+            route = request.scope.get("route")
+            metrics.observe(
+                request.method, getattr(route, "path_format", UNMATCHED_ROUTE),
+                response.status_code, time.perf_counter() - start,
+            )
+            return response
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/items/{i}", "raw_path": f"/items/{i}".encode(),
+            "query_string": b"", "root_path": "", "headers": [], "server": ("test", 80), "client": ("test", 1),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(args):
+    apps = {kind: make_app(kind) for kind in ("none", "asgi", "base-http")}
+    best = {kind: float("inf") for kind in apps}
+    # Interleaved rounds, best of each, to keep warm-up and noise out
+    for _ in range(args.rounds):
+        for kind, app in apps.items():
+            best[kind] = min(best[kind], await run(app, args.requests))
+    for kind, cost in best.items():
+        print(f"{kind:>10}: {cost * 1e6:7.1f} µs/request, overhead {(cost - best['none']) * 1e6:+.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""
+Page latency of offset vs cursor pagination on a seeded item table.
+
+Runs in-process against DATABASE_URL (use a scratch database):
+
+    python scripts/bench_pagination.py --rows 200000 --depths 0 10000 100000
+
+Seeds `--rows` items with generate_series (skipped if the table already has
+that many), then times one page at each depth, once via `skip` and once via
+a cursor pointing at the same position. Offset latency grows with depth;
+cursor latency should stay flat.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.crud.item import get_items  # noqa: E402
+from app.crud.pagination import encode_cursor  # noqa: E402
+from app.db.session import async_session  # noqa: E402
+
+SEED_SQL = text("""
+    INSERT INTO item (id, name, type, unit, unit_price, cost_price, vat_rate, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench item ' || g, 'service', 'hour', 10, 0, 19, true,
+           now() - make_interval(secs => g), now()
+    FROM generate_series(1, :n) AS g
+""")
+
+
+async def seed(rows: int) -> None:
+    async with async_session() as db:
+        existing = (await db.execute(text("SELECT count(*) FROM item"))).scalar_one()
+        if existing >= rows:
+            return
+        print(f"Seeding {rows - existing} items...")
+        await db.execute(SEED_SQL, {"n": rows - existing})
+        await db.execute(text("ANALYZE item"))
+        await db.commit()
+
+
+async def time_page(repeat: int, **kwargs) -> float:
+    samples = []
+    async with async_session() as db:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await get_items(db, **kwargs)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(args):
+    await seed(args.rows)
+    print(f"{'depth':>8} {'offset ms':>10} {'cursor ms':>10}")
+    for depth in args.depths:
+        cursor = None
+        if depth:
+            # Cursor for the same position: the last row of the page before it
+            async with async_session() as db:
+                previous = await get_items(db, skip=depth - 1, limit=1)
+            cursor = encode_cursor(previous[-1].created_at, previous[-1].id)
+        offset_ms = await time_page(args.repeat, skip=depth, limit=args.limit)
+        cursor_ms = await time_page(args.repeat, skip=0, limit=args.limit, cursor=cursor)
+        print(f"{depth:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+Connection per message vs. the pooled SMTP connections of the mail queue.
+
+Runs against the local SMTP sink (tests/smtp_sink.py), no relay needed:
+
+    python scripts/bench_smtp.py --messages 200 --latency-ms 50
+
+`--latency-ms` is added to the sink's greeting and AUTH, standing in for
+the handshake and login of a real relay.
+"""
+import argparse
+import asyncio
+import smtplib
+import sys
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+from app.services.email import SMTPConnectionPool  # noqa: E402
+from tests.smtp_sink import SMTPSink  # noqa: E402
+
+
+def message(i: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = f"Message {i}"
+    msg["From"] = settings.EMAIL_FROM
+    msg["To"] = f"user{i}@example.com"
+    msg.set_content("Hello")
+    return msg
+
+
+def send_per_message(messages: list[EmailMessage]) -> None:
+    # What services.email used to do for every mail
+    for msg in messages:
+        server = smtplib.SMTP(settings.EMAIL_SERVER, settings.EMAIL_PORT)
+        server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
+        server.send_message(msg)
+        server.quit()
+
+
+async def send_pooled(pool: SMTPConnectionPool, messages: list[EmailMessage], batch_size: int) -> None:
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start:start + batch_size]
+        shares = min(pool.size, len(batch))
+        await asyncio.gather(*(asyncio.to_thread(pool.send_many, batch[i::shares]) for i in range(shares)))
+
+
+async def main(args):
+    sink = SMTPSink(latency=args.latency_ms / 1000)
+    settings.EMAIL_SERVER = "127.0.0.1"
+    settings.EMAIL_PORT = await sink.start()
+    settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+    messages = [message(i) for i in range(args.messages)]
+
+    start = time.perf_counter()
+    await asyncio.to_thread(send_per_message, messages)
+    elapsed = time.perf_counter() - start
+    print(f"per message: {args.messages / elapsed:7.1f} msg/s, {sink.connections} connections")
+
+    connections = sink.connections
+    pool = SMTPConnectionPool(size=args.connections, max_messages=1000, idle_seconds=60)
+    start = time.perf_counter()
+    await send_pooled(pool, messages, args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"     pooled: {args.messages / elapsed:7.1f} msg/s, {sink.connections - connections} connections")
+
+    await asyncio.to_thread(pool.close)
+    await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Render throughput of the template service (app/services/templates.py).
+
+Pure in-process, no database needed:
+
+    python scripts/bench_templates.py --emails 10000
+
+Renders payment reminders (subject, text and HTML part, alternating
+English and German) through the shared service, and for comparison
+through a fresh Environment per email, which compiles every template
+again. Also times the first render of a new worker with an empty and
+with a filled bytecode cache.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.models.enums import CurrencyEnum, LanguageEnum  # noqa: E402
+from app.services.templates import BUILTIN_TEMPLATES_PATH, TemplateService  # noqa: E402
+
+
+def contexts(count: int) -> list[tuple[LanguageEnum, dict]]:
+    items = []
+    for i in range(count):
+        invoice = SimpleNamespace(
+            number=f"INV-2026-{i:05d}",
+            issue_date=date(2026, 1, 1) + timedelta(days=i % 300),
+            due_date=date(2026, 1, 15) + timedelta(days=i % 300),
+            total=100 + i * 1.37,
+            currency=CurrencyEnum.EUR,
+        )
+        items.append((
+            LanguageEnum.de if i % 2 else LanguageEnum.en,
+            dict(
+                client_name=f"Client {i} GmbH & Co. KG", invoice=invoice, amount_due=invoice.total + 5,
+                dunning_level=i % 3 + 1, dunning_fee=5.0 if i % 3 else 0.0, pay_within_days=7,
+            ),
+        ))
+    return items
+
+
+def new_service(cache_dir) -> TemplateService:
+    return TemplateService([BUILTIN_TEMPLATES_PATH], Path(cache_dir) if cache_dir else None, reload_check_seconds=5)
+
+
+def run(label: str, items, render) -> None:
+    start = time.perf_counter()
+    size = 0
+    for language, context in items:
+        email = render(language, context)
+        size += len(email.text) + len(email.html or "")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:>14}: {len(items):,} emails in {elapsed:.2f}s, {len(items) / elapsed:,.0f} emails/s, "
+        f"{elapsed / len(items) * 1e6:.0f} µs each ({size / len(items):,.0f} bytes)"
+    )
+
+
+def main(args):
+    items = contexts(args.emails)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ("cold, no cache", "cold, bytecode"):
+            start = time.perf_counter()
+            new_service(cache_dir).render_email("payment_reminder", LanguageEnum.en, **items[0][1])
+            print(f"{label:>14}: first render {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        service = new_service(cache_dir)
+        run("shared", items, lambda language, context: service.render_email("payment_reminder", language, **context))
+
+    run(
+        "compile each",
+        items[:args.compile_emails],
+        lambda language, context: new_service(None).render_email("payment_reminder", language, **context),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=10_000)
+    parser.add_argument("--compile-emails", type=int, default=500, help="emails for the compile-per-email run")
+    main(parser.parse_args())
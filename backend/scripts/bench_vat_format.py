@@ -0,0 +1,63 @@
+"""
+Throughput of the offline VAT ID check (app/utils/vat.py).
+
+Pure in-process, no database or network needed:
+
+    python scripts/bench_vat_format.py --ids 1000000
+
+Validates random IDs shaped like each member state's format (so most
+fail on the check digit, as typos do), then the same number of
+well-formed ones, and reports IDs per second for each.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.vat import is_valid_vat_id  # noqa: E402
+
+# One template per member state; digits are randomized, letters kept
+TEMPLATES = [
+    "ATU13585627", "BE0403019261", "BG175074752", "CY10259033P", "CZ25123891",
+    "DE136695976", "DK13585628", "EE100931558", "EL094259216", "ESA13585625",
+    "FI20774740", "FR40303265045", "HR33392005961", "HU12892312", "IE6433435F",
+    "IT00743110157", "LT119511515", "LU15027442", "LV40003521600", "MT11679112",
+    "NL004495445B01", "PL8567346215", "PT501964843", "RO18547290", "SE123456789701",
+    "SI50223054", "SK2022749619", "XI980780684",
+]
+
+
+def random_ids(count: int, rng: random.Random) -> list[str]:
+    ids = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        ids.append(template[:2] + "".join(rng.choice("0123456789") if c.isdigit() else c for c in template[2:]))
+    return ids
+
+
+def run(label: str, ids: list[str]) -> None:
+    start = time.perf_counter()
+    valid = sum(map(is_valid_vat_id, ids))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:>12}: {len(ids):,} IDs ({valid:,} valid) in {elapsed:.2f}s, "
+        f"{len(ids) / elapsed:,.0f} IDs/s, {elapsed / len(ids) * 1e6:.2f} µs each"
+    )
+
+
+def main(args):
+    rng = random.Random(42)
+    ids = random_ids(args.ids, rng)
+    run("random", ids)
+
+    well_formed = [vat_id for vat_id in ids if is_valid_vat_id(vat_id)]
+    run("well-formed", (well_formed * (args.ids // max(len(well_formed), 1) + 1))[:args.ids])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=1_000_000)
+    main(parser.parse_args())
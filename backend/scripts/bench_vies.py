@@ -0,0 +1,89 @@
+"""
+VIES call latency: a zeep client per call (the old code path) vs the
+long-lived async client.
+
+Runs the stub VIES server from tests/vies_stub.py on a local port, no
+network or database needed:
+
+    python scripts/bench_vies.py --calls 200 --concurrency 20 --latency-ms 50
+
+The per-call path parses the WSDL and opens a new connection for every
+check and needs a thread per in-flight call; the shared client should
+add little on top of the stub's own latency.
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+from zeep import Client
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.vat_validation import VIES_BINDING, VIES_WSDL_PATH, VIESClient  # noqa: E402
+from tests.vies_stub import create_app  # noqa: E402
+
+
+def start_stub(latency: float) -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_app(latency), port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/checkVatService"
+
+
+def per_call_check(service_url: str, vat_id: str) -> None:
+    client = Client(wsdl=str(VIES_WSDL_PATH))
+    client.create_service(VIES_BINDING, service_url).checkVat(countryCode=vat_id[:2], vatNumber=vat_id[2:])
+
+
+async def run(label: str, check, calls: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await check(f"DE{100000000 + i * 10 + 1}")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    print(
+        f"{label:>10}: median {statistics.median(samples):7.1f} ms, "
+        f"p95 {samples[int(len(samples) * 0.95) - 1]:7.1f} ms, {calls / elapsed:7.1f} calls/s"
+    )
+
+
+async def main(args) -> None:
+    service_url = start_stub(args.latency_ms / 1000)
+
+    await run(
+        "per-call",
+        lambda vat_id: asyncio.to_thread(per_call_check, service_url, vat_id),
+        args.calls,
+        args.concurrency,
+    )
+
+    vies = VIESClient(service_url=service_url)
+    await vies.start()
+    await run("shared", vies.check_vat, args.calls, args.concurrency)
+    await vies.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated VIES response time")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,60 @@
+"""
+Bulk import clients (and their contacts) from a CSV or JSON file.
+
+Runs in-process against DATABASE_URL, same code path as
+POST /admin/import/clients:
+
+    python scripts/import_clients.py tenant.csv --errors rejected.json
+
+JSON files hold an array of clients shaped like the POST /clients body. CSV
+files hold one client per row; `contact_*` columns (contact_first_name,
+contact_email, ...) describe that client's contact person. Progress is
+printed while the import runs; rejected rows are written to `--errors`.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.bulk_import import ImportJob, parse_records, run_import  # noqa: E402
+
+
+def print_progress(job: ImportJob) -> None:
+    s = job.snapshot()
+    print(
+        f"\r{s['processed']}/{s['total']} rows, {s['clients_created']} clients, "
+        f"{s['contacts_created']} contacts, {s['failed_rows']} rejected, {s['elapsed_seconds']:.1f}s",
+        end="",
+        flush=True,
+    )
+
+
+async def main(args) -> int:
+    path = Path(args.file)
+    fmt = args.format or ("json" if path.suffix.lower() == ".json" else "csv")
+    records = parse_records(path.read_bytes(), fmt)
+
+    job = ImportJob(total=len(records))
+    task = asyncio.create_task(run_import(job, records, args.chunk_size))
+    while not task.done():
+        print_progress(job)
+        await asyncio.wait({task}, timeout=1)
+    print_progress(job)
+    print()
+
+    if job.errors:
+        Path(args.errors).write_text(json.dumps(job.errors, indent=2))
+        print(f"{len(job.errors)} rejected rows written to {args.errors}")
+    return 0 if job.status == "done" else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=["csv", "json"], help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Defaults to IMPORT_CHUNK_SIZE")
+    parser.add_argument("--errors", default="import_errors.json", help="Where to write the error report")
+    sys.exit(asyncio.run(main(parser.parse_args())))
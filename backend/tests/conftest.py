@@ -1,5 +1,6 @@
 import sys
 import os
+import re
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import pytest
 from httpx import AsyncClient, ASGITransport
@@ -41,4 +42,22 @@ async def admin_token(client):
 def auth_headers(admin_token):
     return {
         "Authorization": f"Bearer {admin_token}"
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail if a response issued more SQL statements than allowed, e.g.
+    `assert_max_queries(response, 3)`. Reads the count from the
+    Server-Timing header set by the query-tracking middleware.
+    """
+    def check(response, limit: int):
+        match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers.get("server-timing", ""))
+        assert match, "Response has no db Server-Timing entry"
+        count = int(match.group(1))
+        request = response.request
+        assert count <= limit, (
+            f"{request.method} {request.url.path} issued {count} queries (max {limit})"
+        )
+        return count
+    return check
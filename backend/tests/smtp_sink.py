@@ -0,0 +1,126 @@
+"""
+Local SMTP sink, for tests and benchmarks. Accepts any AUTH and keeps
+every message in memory instead of delivering it.
+
+Answers by recipient:
+
+    reject...@  550, refused for good
+    defer...@   451, try again later
+    otherwise   accepted
+
+`latency` is added to the greeting and to AUTH, standing in for the
+TCP/TLS handshake and login of a real relay. Run standalone:
+
+    python -m tests.smtp_sink --port 8025 --latency-ms 50
+"""
+import argparse
+import asyncio
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+
+
+class SMTPSink:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages: list[EmailMessage] = []
+        self.connections = 0
+        self.logins = 0
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        self.disconnect_all()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def disconnect_all(self) -> None:
+        """Drop every open session, like a relay timing out idle clients."""
+        for writer in list(self._writers):
+            writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+
+        def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+
+        recipients: list[str] = []
+        try:
+            await asyncio.sleep(self.latency)
+            reply("220 smtp-sink ready")
+            while line := await reader.readline():
+                command = line.decode().strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    reply("250-smtp-sink")
+                    reply("250-AUTH PLAIN LOGIN")
+                    reply("250 8BITMIME")
+                elif verb == "HELO":
+                    reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    await asyncio.sleep(self.latency)
+                    self.logins += 1
+                    reply("235 Authentication successful")
+                elif verb == "MAIL":
+                    recipients = []
+                    reply("250 OK")
+                elif verb == "RCPT":
+                    address = command.split(":", 1)[1].strip().strip("<>")
+                    if address.startswith("reject"):
+                        reply("550 No such user")
+                    elif address.startswith("defer"):
+                        reply("451 Try again later")
+                    else:
+                        recipients.append(address)
+                        reply("250 OK")
+                elif verb == "DATA":
+                    if not recipients:
+                        reply("554 No valid recipients")
+                    else:
+                        reply("354 End data with <CR><LF>.<CR><LF>")
+                        await writer.drain()
+                        data = bytearray()
+                        while (chunk := await reader.readline()) not in (b".\r\n", b""):
+                            data += chunk[1:] if chunk.startswith(b"..") else chunk
+                        self.messages.append(message_from_bytes(bytes(data), policy=policy.default))
+                        reply("250 OK queued")
+                elif verb == "RSET":
+                    recipients = []
+                    reply("250 OK")
+                elif verb == "NOOP":
+                    reply("250 OK")
+                elif verb == "QUIT":
+                    reply("221 Bye")
+                    break
+                else:
+                    reply("502 Command not implemented")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def main(args):
+    sink = SMTPSink(latency=args.latency_ms / 1000)
+    await sink.start(port=args.port)
+    print(f"SMTP sink on 127.0.0.1:{sink.port}")
+    while True:
+        await asyncio.sleep(10)
+        print(f"{len(sink.messages)} messages, {sink.connections} connections, {sink.logins} logins")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    asyncio.run(main(parser.parse_args()))
@@ -1,5 +1,14 @@
+import json
 import pytest
-from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import update
+
+from app.db.session import async_session
+from app.models.background_job import BackgroundJob
+from app.services.bulk_import import ImportJob
+from app.services.jobs import register_job
 
 BASE_URL = "/api/v1/clients"
 
@@ -76,6 +85,25 @@ async def test_list_clients_paginated(client, auth_headers):
     assert isinstance(r.json(), list)
 
 
+@pytest.mark.anyio
+async def test_list_clients_sparse_fields(client, auth_headers, assert_max_queries):
+    await test_create_client_with_contacts(client, auth_headers)
+
+    r = await client.get(BASE_URL + "?fields=name,type,is_active&limit=5", headers=auth_headers)
+    assert r.status_code == 200
+    assert set(r.json()[0]) == {"id", "name", "type", "is_active"}
+    # One column-only select, plus at most the user lookup
+    assert_max_queries(r, 2)
+
+    r = await client.get(BASE_URL + "?fields=name&expand=contacts&limit=5", headers=auth_headers)
+    assert r.status_code == 200
+    assert set(r.json()[0]) == {"id", "name", "contacts"}
+    assert_max_queries(r, 3)
+
+    r = await client.get(BASE_URL + "?fields=password", headers=auth_headers)
+    assert r.status_code == 400
+
+
 @pytest.mark.anyio
 async def test_update_client_valid(client, auth_headers):
     r = await client.post(BASE_URL + "/", json={"name": "UpdateMe", "type": "Client"}, headers=auth_headers)
@@ -177,3 +205,111 @@ async def test_attachment_invalid_id(client, auth_headers):
 
     d = await client.delete(f"{BASE_URL}/attachments/00000000-0000-0000-0000-000000000000", headers=auth_headers)
     assert d.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_client_endpoints_query_budget(client, auth_headers, assert_max_queries):
+    payload = {
+        "name": "Query Budget",
+        "type": "Client",
+        "contacts": [{"first_name": "Ada", "last_name": "Lovelace"}],
+    }
+    r = await client.post(BASE_URL + "/", json=payload, headers=auth_headers)
+    assert r.status_code == 201
+    assert len(r.json()["contacts"]) == 1
+    # Client and contact inserts, plus at most the user lookup
+    assert_max_queries(r, 3)
+
+    r = await client.get(f"{BASE_URL}/{r.json()['id']}", headers=auth_headers)
+    assert r.status_code == 200
+    # Client row plus one selectinload per relationship, plus at most the user lookup
+    assert_max_queries(r, 4)
+
+
+@pytest.mark.anyio
+async def test_bulk_import_clients(client, auth_headers):
+    records = [
+        {"name": "Import A", "contacts": [{"first_name": "Ada", "last_name": "Lovelace"}]},
+        {"name": "Import B"},
+        {"type": "Client"},
+    ]
+    files = {"file": ("clients.json", json.dumps(records), "application/json")}
+    r = await client.post("/api/v1/admin/import/clients", files=files, headers=auth_headers)
+    assert r.status_code == 202
+    job_id = r.json()["id"]
+
+    r = await client.get(f"/api/v1/admin/import/jobs/{job_id}", headers=auth_headers)
+    assert r.status_code == 200
+    job = r.json()
+    assert job["status"] == "done"
+    assert job["clients_created"] == 2
+    assert job["contacts_created"] == 1
+    assert [e["row"] for e in job["errors"]] == [3]
+
+
+@pytest.mark.anyio
+async def test_import_job_of_dead_worker(client, auth_headers):
+    # A job another worker was running when it went away
+    job = ImportJob(total=10)
+    job.status = "running"
+    async with async_session() as db:
+        await register_job(db, "client_import", job)
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id)  # type: ignore[arg-type]
+            .values(updated_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+        )
+        await db.commit()
+
+    r = await client.get(f"/api/v1/admin/import/jobs/{job.id}", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json()["status"] == "failed"
+    assert "stopped reporting" in r.json()["error"]
+
+    r = await client.get(f"/api/v1/admin/import/jobs/{uuid4().hex}", headers=auth_headers)
+    assert r.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_search_clients(client, auth_headers):
+    tag = uuid4().hex[:8]
+    payload = {
+        "name": f"Searchable {tag} GmbH",
+        "notes": "Prefers invoices by email",
+        "contacts": [{"first_name": "Grace", "last_name": f"Hopper{tag}", "email": f"grace.{tag}@example.com"}],
+    }
+    r = await client.post(BASE_URL + "/", json=payload, headers=auth_headers)
+    client_id = r.json()["id"]
+
+    r = await client.get(BASE_URL + f"/search?q=searchab {tag}", headers=auth_headers)
+    assert r.status_code == 200
+    hit = r.json()[0]
+    assert hit["id"] == client_id
+    assert "<mark>" in hit["highlights"]["name"]
+
+    # Matches through the contact person only
+    r = await client.get(BASE_URL + f"/search?q=hopper{tag}", headers=auth_headers)
+    assert r.status_code == 200
+    hit = next(h for h in r.json() if h["id"] == client_id)
+    assert "<mark>" in hit["highlights"]["contact"]
+
+    r = await client.get(BASE_URL + "/search?q=x", headers=auth_headers)
+    assert r.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_search_highlights_are_escaped(client, auth_headers):
+    tag = uuid4().hex[:8]
+    payload = {
+        "name": f"<script>alert(1)</script> Evil{tag} & Co",
+        "notes": f"Evil{tag} <img src=x onerror=alert(1)>",
+    }
+    r = await client.post(BASE_URL + "/", json=payload, headers=auth_headers)
+    client_id = r.json()["id"]
+
+    r = await client.get(BASE_URL + f"/search?q=evil{tag}", headers=auth_headers)
+    assert r.status_code == 200
+    hit = next(h for h in r.json() if h["id"] == client_id)
+    assert hit["highlights"]["name"] == f"&lt;script&gt;alert(1)&lt;/script&gt; <mark>Evil{tag}</mark> &amp; Co"
+    assert "<img" not in hit["highlights"]["notes"]
+    assert f"<mark>Evil{tag}</mark>" in hit["highlights"]["notes"]
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import Settings, settings
+from app.db.session import engine, pool_telemetry
+from app.db.telemetry import InstrumentedQueuePool, PoolTelemetry, instrument_engine
+from app.routes.system.runtime import pool_stats
+
+
+class FakeConnection:
+    """Stands in for an asyncpg connection; the pool never talks to a server."""
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def close(self) -> None:
+        pass
+
+    def terminate(self) -> None:
+        pass
+
+
+async def fake_connect() -> FakeConnection:
+    return FakeConnection()
+
+
+@pytest.fixture
+async def small_pool():
+    telemetry = PoolTelemetry("test")
+    test_engine = create_async_engine(
+        "postgresql+asyncpg://test@localhost/test",
+        poolclass=InstrumentedQueuePool.for_telemetry(telemetry),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+        async_creator=fake_connect,
+        # No server: skip the dialect's first-connect queries
+        _initialize=False,
+    )
+    instrument_engine(test_engine.sync_engine, telemetry)
+    yield test_engine, telemetry
+    await test_engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_pool_checkout_timeout_is_counted(small_pool):
+    test_engine, telemetry = small_pool
+
+    first = await test_engine.connect()
+    second = await test_engine.connect()  # The one overflow connection
+    with pytest.raises(PoolTimeoutError):
+        await test_engine.connect()
+
+    stats = telemetry.snapshot()
+    assert stats["timeouts"] == 1
+    assert stats["connects"] == 2
+    assert stats["overflow_opened"] == 1
+    assert (stats["checked_out"], stats["idle"], stats["overflow"]) == (2, 0, 1)
+
+    # Every checkout is timed, the failed one waited out pool_timeout
+    wait = stats["wait_seconds"]
+    assert wait["count"] == 3
+    assert wait["sum"] >= 0.05
+    buckets = {b["le"]: b["count"] for b in wait["buckets"]}
+    assert buckets[0.025] == 2 and buckets["+Inf"] == 3
+
+    await first.invalidate()
+    await first.close()
+    await second.close()
+    stats = telemetry.snapshot()
+    assert stats["invalidations"] == 1
+    assert stats["checked_out"] == 0
+
+
+@pytest.mark.anyio
+async def test_pool_stats_shape():
+    stats = await pool_stats(None)
+    assert set(stats) == set(pool_telemetry)
+    assert set(stats["primary"]) == {
+        "pool_size", "max_overflow", "checked_out", "idle", "overflow",
+        "connects", "invalidations", "overflow_opened", "timeouts", "wait_seconds",
+    }
+    assert stats["primary"]["pool_size"] == settings.DB_POOL_SIZE
+    assert set(stats["primary"]["wait_seconds"]) == {"count", "sum", "buckets"}
+
+
+def test_pool_pre_ping_is_off_by_default():
+    # Recycling handles stale connections; a ping would cost a round trip per checkout
+    assert Settings.model_fields["DB_POOL_PRE_PING"].default is False
+    assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING
@@ -0,0 +1,187 @@
+import asyncio
+from datetime import datetime, timezone
+from email.message import EmailMessage
+
+import pytest
+from sqlmodel import col, delete, select
+
+from app.core.config import settings
+from app.crud.outbound_email import enqueue_email
+from app.db.session import async_session
+from app.models.outbound_email import OutboundEmail
+from app.services.email import SMTPConnectionPool, is_permanent_failure
+from app.services.mail_queue import MailQueue
+from tests.smtp_sink import SMTPSink
+
+
+def message(to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "Test"
+    msg["From"] = settings.EMAIL_FROM
+    msg["To"] = to
+    msg.set_content("Hello")
+    return msg
+
+
+@pytest.fixture
+async def smtp_sink(monkeypatch):
+    sink = SMTPSink()
+    port = await sink.start()
+    monkeypatch.setattr(settings, "EMAIL_SERVER", "127.0.0.1")
+    monkeypatch.setattr(settings, "EMAIL_PORT", port)
+    monkeypatch.setattr(settings, "EMAIL_USE_TLS", False)
+    monkeypatch.setattr(settings, "EMAIL_USE_SSL", False)
+    yield sink
+    await sink.stop()
+
+
+@pytest.fixture
+async def smtp_pool(smtp_sink):
+    pool = SMTPConnectionPool(size=2, max_messages=100, idle_seconds=60)
+    yield pool
+    await asyncio.to_thread(pool.close)
+
+
+@pytest.mark.anyio
+async def test_smtp_pool_reuses_connection(smtp_sink, smtp_pool):
+    for batch in range(3):
+        results = await asyncio.to_thread(smtp_pool.send_many, [message(f"user{i}@example.com") for i in range(5)])
+        assert results == [None] * 5
+
+    assert len(smtp_sink.messages) == 15
+    assert smtp_sink.connections == 1
+    assert smtp_sink.logins == 1
+    assert smtp_pool.stats()["reused"] == 2
+
+
+@pytest.mark.anyio
+async def test_smtp_pool_refused_recipient(smtp_sink, smtp_pool):
+    results = await asyncio.to_thread(smtp_pool.send_many, [
+        message("reject@example.com"), message("defer@example.com"), message("ok@example.com"),
+    ])
+
+    assert is_permanent_failure(results[0])
+    assert not is_permanent_failure(results[1])
+    assert results[2] is None
+    # Refusals don't cost the session
+    assert smtp_sink.connections == 1
+    assert [msg["To"] for msg in smtp_sink.messages] == ["ok@example.com"]
+
+
+@pytest.mark.anyio
+async def test_smtp_pool_replaces_dropped_connection(smtp_sink, smtp_pool):
+    await asyncio.to_thread(smtp_pool.send_many, [message("a@example.com")])
+    smtp_sink.disconnect_all()
+
+    results = await asyncio.to_thread(smtp_pool.send_many, [message("b@example.com")])
+
+    assert results == [None]
+    assert smtp_sink.connections == 2
+
+
+@pytest.mark.anyio
+async def test_smtp_pool_unreachable_server(smtp_sink, smtp_pool):
+    await smtp_sink.stop()
+
+    results = await asyncio.to_thread(smtp_pool.send_many, [message("a@example.com"), message("b@example.com")])
+
+    assert all(isinstance(result, OSError) and not is_permanent_failure(result) for result in results)
+
+
+@pytest.mark.anyio
+async def test_smtp_pool_unexpected_error(smtp_sink, smtp_pool):
+    # Not a message at all: fails on its own, the rest still goes out
+    results = await asyncio.to_thread(smtp_pool.send_many, [message("a@example.com"), None, message("b@example.com")])
+
+    assert results[0] is None and results[2] is None
+    assert is_permanent_failure(results[1])
+    # The connection it left in an unknown state was replaced, the new one parked
+    assert smtp_sink.connections == 2
+    assert smtp_pool.stats()["idle"] == 1
+
+
+@pytest.mark.anyio
+async def test_mail_queue_message_that_cannot_be_built(smtp_sink, smtp_pool):
+    emails = [
+        OutboundEmail(to_address="a@example.com", subject="Invoice\nRE-2024-001", body_text="Hello"),
+        OutboundEmail(to_address="b@example.com", subject="Invoice", body_text="Hello"),
+    ]
+
+    results = await MailQueue(smtp_pool)._send(emails)
+
+    assert isinstance(results[0], ValueError) and is_permanent_failure(results[0])
+    assert results[1] is None
+    assert [msg["To"] for msg in smtp_sink.messages] == ["b@example.com"]
+
+
+@pytest.mark.anyio
+async def test_outbound_mail_queue(smtp_sink, smtp_pool):
+    async with async_session() as db:
+        await db.exec(delete(OutboundEmail))  # type: ignore[call-overload]
+        await db.commit()
+        for i in range(5):
+            await enqueue_email(db, f"user{i}@example.com", f"Mail {i}", "Hello", "<p>Hello</p>")
+        await enqueue_email(db, "reject@example.com", "Mail", "Hello")
+        await enqueue_email(db, "defer@example.com", "Mail", "Hello")
+
+    queue = MailQueue(smtp_pool)
+    await queue.drain()
+
+    assert sorted(msg["To"] for msg in smtp_sink.messages) == [f"user{i}@example.com" for i in range(5)]
+    assert smtp_sink.logins <= smtp_pool.size
+    html = smtp_sink.messages[0].get_body(("html",))
+    assert html is not None and "<p>Hello</p>" in html.get_content()
+
+    async with async_session() as db:
+        rows = {row.to_address: row for row in (await db.exec(select(OutboundEmail))).all()}
+    assert rows["user0@example.com"].status == "sent"
+    assert rows["reject@example.com"].status == "failed"
+    deferred = rows["defer@example.com"]
+    assert deferred.status == "pending"
+    assert deferred.attempts == 1
+    assert "451" in deferred.last_error
+    assert deferred.next_attempt_at > datetime.now(timezone.utc)
+
+    # Nothing is due until the backoff has passed
+    await queue.drain()
+    assert len(smtp_sink.messages) == 5
+    assert queue.stats()["sent"] == 5
+
+
+@pytest.mark.anyio
+async def test_outbound_mail_queue_gives_up_on_expired_leases(smtp_sink, smtp_pool):
+    async with async_session() as db:
+        await db.exec(delete(OutboundEmail))  # type: ignore[call-overload]
+        await db.commit()
+        email = await enqueue_email(db, "user@example.com", "Mail", "Hello")
+        # Claimed for the last time by a round that never recorded an outcome
+        email.attempts = settings.EMAIL_MAX_ATTEMPTS
+        db.add(email)
+        await db.commit()
+
+    queue = MailQueue(smtp_pool)
+    await queue.drain()
+
+    assert smtp_sink.messages == []
+    assert queue.stats()["failed"] == 1
+    async with async_session() as db:
+        row = (await db.exec(select(OutboundEmail))).one()
+    assert row.status == "failed"
+
+
+@pytest.mark.anyio
+async def test_outbound_forgot_password(client, smtp_sink, smtp_pool):
+    async with async_session() as db:
+        await db.exec(delete(OutboundEmail))  # type: ignore[call-overload]
+        await db.commit()
+
+    for email in (settings.DEFAULT_ADMIN_EMAIL, "nobody@example.com"):
+        response = await client.post(f"{settings.API_PREFIX}/auth/forgot-password", json={"email": email})
+        assert response.status_code == 202
+
+    async with async_session() as db:
+        queued = (await db.exec(select(OutboundEmail).where(col(OutboundEmail.status) == "pending"))).all()
+    assert [email.to_address for email in queued] == [settings.DEFAULT_ADMIN_EMAIL]
+
+    await MailQueue(smtp_pool).drain()
+    assert "/reset-password?token=" in smtp_sink.messages[0].get_content()
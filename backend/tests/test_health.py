@@ -0,0 +1,28 @@
+import pytest
+
+BASE_URL = "/api/v1/status"
+
+
+@pytest.mark.anyio
+async def test_liveness(client):
+    r = await client.get(f"{BASE_URL}/live")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+
+@pytest.mark.anyio
+async def test_readiness_probes_database(client):
+    r = await client.get(f"{BASE_URL}/ready")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["ready"] is True
+    assert data["database"] == "ok"
+    assert data["latency_percentiles_ms"]["samples"] >= 1
+
+
+@pytest.mark.anyio
+async def test_readiness_result_is_cached(client):
+    first = (await client.get(f"{BASE_URL}/ready")).json()
+    second = (await client.get(f"{BASE_URL}/ready")).json()
+    # Within READINESS_CACHE_SECONDS the same check result is served
+    assert first["latency_ms"] == second["latency_ms"]
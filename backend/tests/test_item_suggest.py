@@ -0,0 +1,81 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services.item_suggest import ItemSuggestIndex, Suggestion
+
+
+def make(name: str, external_id=None) -> Suggestion:
+    return Suggestion(uuid4(), name, external_id, "hour", Decimal("10.00"), Decimal("19"))
+
+
+def test_suggest_matches_name_word_and_external_id():
+    index = ItemSuggestIndex()
+    design = make("Design Package", "SKU-1234")
+    consulting = make("Consulting Hour")
+    index._rebuild([design, consulting])
+
+    assert index.search("des") == [design]
+    assert index.search("PACK") == [design]
+    assert index.search("sku-12") == [design]
+    assert index.search("hour") == [consulting]
+    assert index.search("x") == []
+    assert index.search("  ") == []
+
+
+def test_suggest_ranks_name_prefix_first_and_limits():
+    index = ItemSuggestIndex()
+    word_match = make("Premium Support")
+    name_match = make("Support Plan")
+    index._rebuild([word_match, name_match, *(make(f"Support {i}") for i in range(20))])
+
+    results = index.search("support", limit=5)
+    assert len(results) == 5
+    assert word_match not in results
+    assert all(r.name.startswith("Support") for r in results)
+
+
+def test_suggest_upsert_and_remove():
+    index = ItemSuggestIndex()
+    item = make("Old Name")
+    index.upsert(item)
+    assert index.search("old") == [item]
+
+    renamed = item._replace(name="New Name")
+    index.upsert(renamed)
+    assert index.search("old") == []
+    assert index.search("new") == [renamed]
+
+    index.upsert(renamed, is_active=False)
+    assert index.search("new") == []
+    assert len(index) == 0
+
+    index.upsert(renamed)
+    index.remove(renamed.id)
+    assert index.search("new") == []
+    assert index._keys == []
+
+
+@pytest.mark.anyio
+async def test_suggest_local_changes_survive_a_rebuild():
+    index = ItemSuggestIndex()
+    removed, renamed = make("Removed Item"), make("Renamed Item")
+    bulk = [(make(f"Bulk {i}"), True) for i in range(ItemSuggestIndex.REBUILD_THRESHOLD)]
+
+    async def edit_while_rebuilding():
+        # The rebuild's thread is running on copies taken before these
+        await asyncio.sleep(0)
+        index.remove(removed.id)
+        index.upsert(renamed._replace(name="Fresh Name"))
+
+    await asyncio.gather(
+        index.apply([(removed, True), (renamed, True), *bulk]),
+        edit_while_rebuilding(),
+    )
+
+    assert len(index) == len(bulk) + 1
+    assert index.search("removed") == []
+    assert index.search("renamed") == []
+    assert [s.id for s in index.search("fresh")] == [renamed.id]
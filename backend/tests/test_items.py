@@ -1,6 +1,8 @@
+import gzip
+import json
 import pytest
 from decimal import Decimal
-from uuid import UUID
+from uuid import UUID, uuid4
 
 BASE_URL = "/api/v1/items"
 
@@ -30,7 +32,7 @@ async def test_create_item_full(client, auth_headers):
         "unit_price": "999.99",
         "cost_price": "400.50",
         "vat_rate": "7.0",
-        "external_id": "SKU-1234",
+        "external_id": f"SKU-{uuid4().hex[:8]}",
         "is_active": True,
     }
     r = await client.post(BASE_URL + "/", json=payload, headers=auth_headers)
@@ -58,6 +60,26 @@ async def test_list_items_pagination(client, auth_headers):
     assert isinstance(r.json(), list)
 
 
+@pytest.mark.anyio
+async def test_list_items_cursor_pagination(client, auth_headers):
+    for _ in range(3):
+        await test_create_item_minimal(client, auth_headers)
+
+    r = await client.get(BASE_URL + "?limit=2", headers=auth_headers)
+    assert r.status_code == 200
+    first_page = [i["id"] for i in r.json()]
+    cursor = r.headers["x-next-cursor"]
+
+    r = await client.get(BASE_URL + f"?limit=2&cursor={cursor}", headers=auth_headers)
+    assert r.status_code == 200
+    second_page = [i["id"] for i in r.json()]
+    assert second_page
+    assert not set(first_page) & set(second_page)
+
+    r = await client.get(BASE_URL + "?cursor=not-a-cursor", headers=auth_headers)
+    assert r.status_code == 400
+
+
 @pytest.mark.anyio
 async def test_get_item_valid(client, auth_headers):
     item_id = await test_create_item_minimal(client, auth_headers)
@@ -90,7 +112,7 @@ async def test_update_item_full_overwrite(client, auth_headers):
         "unit_price": 300,
         "cost_price": 150,
         "vat_rate": 0,
-        "external_id": "SKU-NEW",
+        "external_id": f"SKU-{uuid4().hex[:8]}",
         "is_active": False,
     }
     r = await client.patch(f"{BASE_URL}/{item_id}", json=payload, headers=auth_headers)
@@ -122,3 +144,56 @@ async def test_delete_item_valid(client, auth_headers):
 async def test_delete_item_invalid(client, auth_headers):
     r = await client.delete(f"{BASE_URL}/00000000-0000-0000-0000-000000000000", headers=auth_headers)
     assert r.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_export_items_ndjson(client, auth_headers):
+    item_id = await test_create_item_minimal(client, auth_headers)
+
+    r = await client.get("/api/v1/admin/export/items", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert item_id in {row["id"] for row in rows}
+
+    r = await client.get("/api/v1/admin/export/items?gzip=true", headers=auth_headers)
+    assert r.status_code == 200
+    assert gzip.decompress(r.content).decode().count("\n") >= len(rows)
+
+
+@pytest.mark.anyio
+async def test_upsert_items_by_external_id(client, auth_headers):
+    sku = f"SYNC-{uuid4().hex[:8]}"
+    items = [
+        {"external_id": f"{sku}-1", "name": "Widget", "unit_price": "10.00", "vat_rate": "19"},
+        {"external_id": f"{sku}-2", "name": "Gadget", "unit_price": "20.00", "vat_rate": "19"},
+    ]
+    r = await client.post(BASE_URL + "/upsert", json=items, headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json() == {"inserted": 2, "updated": 0, "unchanged": 0}
+
+    items[1]["unit_price"] = "25.00"
+    r = await client.post(BASE_URL + "/upsert", json=items, headers=auth_headers)
+    assert r.json() == {"inserted": 0, "updated": 1, "unchanged": 1}
+
+    r = await client.get(BASE_URL + f"/suggest?q={sku.lower()}", headers=auth_headers)
+    prices = {s["external_id"]: Decimal(s["unit_price"]) for s in r.json()}
+    assert prices == {f"{sku}-1": Decimal("10"), f"{sku}-2": Decimal("25")}
+
+    r = await client.post(BASE_URL + "/", json={**items[0], "name": "Clash"}, headers=auth_headers)
+    assert r.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_suggest_items(client, auth_headers):
+    name = f"Suggestible {uuid4().hex[:8]}"
+    r = await client.post(BASE_URL + "/", json={"name": name, "unit_price": 5}, headers=auth_headers)
+    item_id = r.json()["id"]
+
+    r = await client.get(BASE_URL + f"/suggest?q={name[:15].lower()}", headers=auth_headers)
+    assert r.status_code == 200
+    assert item_id in [s["id"] for s in r.json()]
+
+    await client.delete(f"{BASE_URL}/{item_id}", headers=auth_headers)
+    r = await client.get(BASE_URL + f"/suggest?q={name.lower()}", headers=auth_headers)
+    assert item_id not in [s["id"] for s in r.json()]
@@ -0,0 +1,79 @@
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from app.core.logging import JSONFormatter, SamplingFilter, _DeferredQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.get_ident())
+        self.lines.append(self.format(record))
+
+
+def make_logger(name, *handlers):
+    logger = logging.getLogger(name)
+    logger.handlers = list(handlers)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_json_formatter():
+    handler = ListHandler()
+    handler.setFormatter(JSONFormatter())
+    logger = make_logger("test.json", handler)
+
+    logger.info("%s %s", "GET", "/items", extra={"status": 200, "duration_ms": 1.5})
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("failed")
+
+    first, second = (json.loads(line) for line in handler.lines)
+    assert first["message"] == "GET /items"
+    assert first["logger"] == "test.json"
+    assert first["level"] == "INFO"
+    assert first["status"] == 200 and first["duration_ms"] == 1.5
+    assert first["time"].endswith("+00:00")
+    assert "ZeroDivisionError" in second["exc_info"]
+
+
+def test_sampling_filter():
+    handler = ListHandler()
+    logger = make_logger("test.sampled", handler)
+    sampler = SamplingFilter(0.1)
+    logger.addFilter(sampler)
+
+    for i in range(2000):
+        logger.info("request %s", i)
+    logger.warning("always kept")
+
+    assert 100 < len(handler.lines) < 300
+    assert sampler.dropped == 2000 - (len(handler.lines) - 1)
+    assert handler.lines[-1] == "always kept"
+
+
+def test_queue_handler_formats_on_listener_thread():
+    handler = ListHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    logger = make_logger("test.queued", _DeferredQueueHandler(log_queue))
+
+    items = ["a"]
+    logger.info("items: %s", items)
+    # The message keeps the arguments as they were when logged
+    items.append("b")
+    listener.stop()
+
+    assert handler.lines == ["INFO items: ['a']"]
+    assert threading.get_ident() not in handler.threads
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+
+from app.core.metrics import UNMATCHED_ROUTE, LoopLagMonitor, MetricsMiddleware, RequestMetrics
+from app.services.metrics import MultiprocessStore, collect, merge, render
+
+
+@pytest.fixture
+def metered_app():
+    metrics = RequestMetrics()
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(404)
+        return {"id": item_id}
+
+    @app.post("/jobs", status_code=202)
+    async def start_job(background_tasks: BackgroundTasks):
+        background_tasks.add_task(run_job)
+        return {}
+
+    async def run_job():
+        # The response is out; the request must already be accounted for
+        seen_in_job.append(metrics.in_flight)
+        await asyncio.sleep(0.3)
+
+    seen_in_job: list[int] = []
+    app.state.seen_in_job = seen_in_job
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app, metrics
+
+
+@pytest.mark.anyio
+async def test_requests_are_labeled_by_route_template(metered_app):
+    app, metrics = metered_app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        for item_id in (1, 2, 3, 0):
+            await client.get(f"/items/{item_id}")
+        await client.get("/wp-login.php")
+        await client.request("PROPFIND", "/items/1")
+
+    items = metrics.routes[("GET", "/items/{item_id}")]
+    assert items.statuses == {200: 3, 404: 1}
+    assert items.latency.count == 4
+    assert metrics.routes[("GET", UNMATCHED_ROUTE)].statuses == {404: 1}
+    assert ("OTHER", "/items/{item_id}") in metrics.routes
+    assert metrics.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_background_tasks_are_not_request_time(metered_app):
+    app, metrics = metered_app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/jobs")
+
+    assert response.status_code == 202
+    assert app.state.seen_in_job == [0]
+    jobs = metrics.routes[("POST", "/jobs")]
+    assert jobs.statuses == {202: 1}
+    assert jobs.latency.count == 1 and jobs.latency.sum < 0.3
+    assert metrics.in_flight == 0
+
+
+def test_render_prometheus_text():
+    text = render(collect())
+    assert "# TYPE http_requests_total counter" in text
+    assert "# TYPE event_loop_lag_seconds histogram" in text
+    assert 'db_pool_checked_out{pool="primary"} 0' in text
+    assert 'event_loop_lag_seconds_bucket{le="+Inf"}' in text
+
+
+def families(requests: int, in_flight: int, lag: float) -> dict:
+    labels = json.dumps([["method", "GET"], ["route", "/items/{item_id}"], ["status", "200"]])
+    return {
+        "http_requests_total": {"type": "counter", "help": "", "mode": "sum", "samples": {labels: requests}},
+        "http_requests_in_flight": {"type": "gauge", "help": "", "mode": "sum", "samples": {"[]": in_flight}},
+        "event_loop_lag_last_seconds": {"type": "gauge", "help": "", "mode": "max", "samples": {"[]": lag}},
+        "event_loop_lag_seconds": {"type": "histogram", "help": "", "mode": "sum", "samples": {"[]": {
+            "bounds": [0.01, 0.1], "counts": [requests, 1, 0], "sum": 0.05, "count": requests + 1,
+        }}},
+    }
+
+
+def test_merge_workers():
+    merged = merge([(families(10, 2, 0.02), True), (families(5, 1, 0.3), True), (families(7, 4, 0.9), False)])
+    text = render(merged)
+
+    # Counters of a finished worker still count, its gauges don't
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 22' in text
+    assert "http_requests_in_flight 3" in text
+    assert "event_loop_lag_last_seconds 0.3" in text
+    assert 'event_loop_lag_seconds_bucket{le="0.1"} 25' in text
+    assert "event_loop_lag_seconds_count 25" in text
+
+
+def test_multiprocess_store(tmp_path):
+    store = MultiprocessStore(tmp_path, flush_seconds=5)
+    store.write(families(10, 2, 0.02))
+    (tmp_path / "1.json").write_text(json.dumps({"live": True, "families": families(5, 1, 0.3)}))
+    (tmp_path / "2.json").write_text(json.dumps({"live": False, "families": families(1, 9, 0.9)}))
+
+    text = render(merge(store.read_all()))
+    assert 'status="200"} 16' in text
+    assert "http_requests_in_flight 3" in text
+
+
+@pytest.mark.anyio
+async def test_loop_lag_monitor():
+    monitor = LoopLagMonitor(interval=0.01)
+    await monitor.tick()
+    time.sleep(0.06)  # a blocking call holding the loop
+    await monitor.tick()
+
+    assert monitor.lag.count == 1
+    assert 0.04 < monitor.last < 0.5
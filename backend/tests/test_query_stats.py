@@ -0,0 +1,56 @@
+import httpx
+import pytest
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from app.db.query_stats import current_query_stats
+from main import create_app
+
+
+def run_queries(count: int) -> None:
+    # What the engine hooks do per statement
+    current_query_stats.get().count += count
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+
+    @app.get("/test/plain")
+    async def plain():
+        run_queries(2)
+        return {"ok": True}
+
+    @app.delete("/test/empty", status_code=204)
+    async def empty():
+        run_queries(1)
+        return Response(status_code=204)
+
+    @app.get("/test/stream")
+    async def stream():
+        run_queries(1)
+
+        async def rows():
+            for _ in range(3):
+                run_queries(1)
+                yield b"{}\n"
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.mark.anyio
+async def test_server_timing_counts_queries(app, assert_max_queries):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert assert_max_queries(await client.get("/test/plain"), 2) == 2
+        assert assert_max_queries(await client.delete("/test/empty"), 1) == 1
+
+
+@pytest.mark.anyio
+async def test_streamed_responses_have_no_server_timing(app):
+    # The header would go out before the body's queries run
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/test/stream")
+    assert response.text == "{}\n" * 3
+    assert "server-timing" not in response.headers
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlmodel import col, delete, select
+
+from app.core.config import settings
+from app.crud.refresh_token import create_refresh_token, get_refresh_token, purge_refresh_tokens, rotate_refresh_token
+from app.crud.user import create_user, delete_user, get_user_by_email
+from app.db.session import async_session
+from app.models.refresh_token import RefreshToken
+from app.models.user import UserCreate
+from app.services.token_cleanup import purge_dead_tokens
+
+
+def token_row(expires_in: timedelta, revoked: bool = False) -> RefreshToken:
+    return RefreshToken(
+        user_id=uuid4(),
+        token=str(uuid4()),
+        expires_at=datetime.now(timezone.utc) + expires_in,
+        revoked=revoked,
+    )
+
+
+@pytest.fixture
+async def admin_refresh_token():
+    async with async_session() as db:
+        admin = await get_user_by_email(db, settings.DEFAULT_ADMIN_EMAIL)
+        return (await create_refresh_token(db, admin.id)).token
+
+
+@pytest.mark.anyio
+async def test_rotate_refresh_token(admin_refresh_token):
+    async with async_session() as db:
+        email, new_token = await rotate_refresh_token(db, admin_refresh_token)
+    assert email == settings.DEFAULT_ADMIN_EMAIL
+    assert new_token.token != admin_refresh_token
+
+    async with async_session() as db:
+        assert (await get_refresh_token(db, admin_refresh_token)).revoked
+        assert not (await get_refresh_token(db, new_token.token)).revoked
+
+        # The old token is spent
+        assert await rotate_refresh_token(db, admin_refresh_token) is None
+
+
+@pytest.mark.anyio
+async def test_rotate_refuses_expired_token_and_inactive_user():
+    async with async_session() as db:
+        admin = await get_user_by_email(db, settings.DEFAULT_ADMIN_EMAIL)
+        expired = token_row(timedelta(seconds=-1))
+        expired.user_id = admin.id
+        db.add(expired)
+        inactive = await create_user(db, UserCreate(
+            email=f"inactive-{uuid4().hex[:8]}@example.com", password="password123",
+            first_name="In", last_name="Active", is_active=False,
+        ))
+        inactive_id = inactive.id
+        # A refused rotation rolls back, so keep plain values around
+        expired_token = expired.token
+        inactive_token = (await create_refresh_token(db, inactive_id)).token
+
+        assert await rotate_refresh_token(db, expired_token) is None
+        assert await rotate_refresh_token(db, inactive_token) is None
+        assert not (await get_refresh_token(db, inactive_token)).revoked
+        await delete_user(db, inactive_id)
+
+
+@pytest.mark.anyio
+async def test_purge_refresh_tokens_in_batches():
+    async with async_session() as db:
+        await purge_refresh_tokens(db, batch_size=1000)
+        dead = [token_row(timedelta(seconds=-1)) for _ in range(3)]
+        dead += [token_row(timedelta(days=1), revoked=True) for _ in range(2)]
+        live = [token_row(timedelta(days=1)) for _ in range(2)]
+        live_ids = [token.id for token in live]
+        db.add_all(dead + live)
+        await db.commit()
+
+        assert await purge_refresh_tokens(db, batch_size=2) == 5
+
+        ids = live_ids + [token.id for token in dead]
+        left = (await db.exec(select(RefreshToken.id).where(col(RefreshToken.id).in_(ids)))).all()
+        assert sorted(left) == sorted(live_ids)
+        await db.exec(delete(RefreshToken).where(col(RefreshToken.id).in_(live_ids)))  # type: ignore[call-overload]
+        await db.commit()
+
+
+@pytest.mark.anyio
+async def test_purge_dead_tokens(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "TOKEN_PURGE_BATCH_SIZE", 2)
+    async with async_session() as db:
+        await purge_refresh_tokens(db, batch_size=1000)
+        db.add_all([token_row(timedelta(seconds=-1)) for _ in range(5)])
+        await db.commit()
+
+    caplog.set_level("INFO", logger="app.services.token_cleanup")
+    await purge_dead_tokens()
+    assert "Purged 5 refresh tokens" in caplog.text
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import session as db_session
+from app.db.replica import ReplicaMonitor
+
+
+def replica_status(**overrides):
+    status = dict(in_recovery=True, receiving=True, streaming=True, caught_up=True, replay_age=600.0)
+    return SimpleNamespace(**{**status, **overrides})
+
+
+class FakeEngine:
+    """Answers the status query with `status`, or raises it if it is an exception."""
+
+    def __init__(self, status):
+        self.status = status
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        if isinstance(self.status, Exception):
+            raise self.status
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        return SimpleNamespace(one=lambda: self.status)
+
+
+async def check(status) -> ReplicaMonitor:
+    monitor = ReplicaMonitor(FakeEngine(status), max_lag_seconds=10)
+    await monitor.check()
+    return monitor
+
+
+@pytest.mark.anyio
+async def test_replica_streaming_and_caught_up_is_current():
+    # An idle primary: nothing replayed for ten minutes, but nothing to replay
+    monitor = await check(replica_status())
+    assert monitor.usable
+    assert monitor.lag_seconds == 0
+    assert monitor.last_error is None
+
+
+@pytest.mark.anyio
+async def test_replica_lagging():
+    monitor = await check(replica_status(caught_up=False, replay_age=3.0))
+    assert monitor.usable and monitor.lag_seconds == 3.0
+
+    monitor = await check(replica_status(caught_up=False, replay_age=30.0))
+    assert not monitor.usable and monitor.lag_seconds == 30.0
+
+
+@pytest.mark.anyio
+async def test_replica_with_disconnected_wal_receiver():
+    # Replayed all it received, so the LSNs match, but it's falling behind
+    monitor = await check(replica_status(streaming=False, replay_age=600.0))
+    assert not monitor.usable
+    assert monitor.lag_seconds == 600.0
+    assert monitor.stats()["streaming"] is False
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status, error", [
+    (replica_status(in_recovery=False), "Not a standby"),
+    (replica_status(receiving=False), "not received any WAL"),
+    (replica_status(caught_up=False, replay_age=None), "not replayed"),
+    (ConnectionRefusedError("Connection refused"), "Connection refused"),
+])
+async def test_replica_unusable(status, error):
+    monitor = await check(status)
+    assert not monitor.usable
+    assert monitor.lag_seconds is None
+    assert error in monitor.last_error
+
+
+@pytest.mark.anyio
+async def test_read_session_falls_back_to_primary(monkeypatch):
+    replica_factory = lambda: "replica session"  # noqa: E731
+    monkeypatch.setattr(db_session, "async_read_session", replica_factory)
+
+    monkeypatch.setattr(db_session.replica_monitor, "usable", True)
+    assert db_session.read_session_factory() is replica_factory
+
+    monkeypatch.setattr(db_session.replica_monitor, "usable", False)
+    assert db_session.read_session_factory() is db_session.async_session
+    async for session in db_session.get_read_session():
+        assert session.bind is db_session.engine
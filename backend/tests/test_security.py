@@ -0,0 +1,181 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+
+from app.core.hashing import HashingPool
+from app.core.security import hash_password, verify_password
+
+
+@pytest.mark.anyio
+async def test_hash_and_verify_password():
+    hashed = await hash_password("s3cret-password")
+    assert await verify_password("s3cret-password", hashed)
+    assert not await verify_password("wrong-password", hashed)
+
+
+@pytest.mark.anyio
+async def test_hashing_does_not_block_event_loop():
+    pool = HashingPool(max_workers=1, max_queue=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await pool.run(time.sleep, 0.2)
+    task.cancel()
+    pool.shutdown()
+
+    # The loop kept running while the worker was busy
+    assert ticks >= 5
+
+
+@pytest.mark.anyio
+async def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(max_workers=1, max_queue=1)
+    jobs = [asyncio.create_task(pool.run(time.sleep, 0.2)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    assert pool.stats()["queue_depth"] == 1
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(time.sleep, 0)
+    assert exc.value.status_code == 503
+
+    await asyncio.gather(*jobs)
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    pool.shutdown()
+
+
+def test_ttl_cache_expiry_lru_and_counters():
+    from app.core.cache import TTLCache
+
+    cache: TTLCache[int] = TTLCache(max_entries=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used entry
+    assert cache.get("b") is None
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    time.sleep(0.06)
+    assert cache.get("c") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert stats["invalidations"] == 1
+
+
+def test_revoked_access_token_is_rejected():
+    from datetime import datetime, timedelta, timezone
+    from app.core.security import create_access_token, decode_access_token
+    from app.core.revocation import revocation_list
+
+    token = create_access_token({"sub": "someone@example.com", "scope": "auth"})
+    payload = decode_access_token(token)
+    assert payload["jti"]
+
+    revocation_list.add(payload["jti"], datetime.now(timezone.utc) + timedelta(minutes=5))
+    with pytest.raises(HTTPException) as exc:
+        decode_access_token(token)
+    assert exc.value.status_code == 401
+
+
+def test_revocation_list_prunes_expired_entries():
+    from datetime import datetime, timedelta, timezone
+    from app.core.revocation import RevocationList
+
+    revocations = RevocationList()
+    revocations.add("expired", datetime.now(timezone.utc) - timedelta(seconds=1))
+    revocations.add("active", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    assert not revocations.is_revoked("expired")
+    assert revocations.is_revoked("active")
+    assert not revocations.is_revoked(None)
+
+    revocations.prune()
+    assert len(revocations) == 1
+
+
+API = "/api/v1"
+
+
+async def login_new_user(client, auth_headers, role="Accountant"):
+    from uuid import uuid4
+
+    email = f"principal-{uuid4().hex[:8]}@example.com"
+    r = await client.post(f"{API}/admin/users/", headers=auth_headers, json={
+        "email": email, "password": "password123", "first_name": "Cached", "last_name": "User", "role": role,
+    })
+    assert r.status_code == 201
+    user_id = r.json()["id"]
+    r = await client.post(f"{API}/auth/token", data={"username": email, "password": "password123"})
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    # Fills this worker's principal cache
+    assert (await client.get(f"{API}/auth/me", headers=headers)).status_code == 200
+    return user_id, email, headers
+
+
+@pytest.mark.anyio
+async def test_cached_principal_needs_no_query(client, auth_headers, assert_max_queries):
+    _, _, headers = await login_new_user(client, auth_headers)
+    r = await client.get(f"{API}/auth/me", headers=headers)
+    assert r.status_code == 200
+    assert_max_queries(r, 0)
+
+
+@pytest.mark.anyio
+async def test_user_changes_invalidate_cached_principal(client, auth_headers):
+    from app.core.security import principal_cache
+
+    user_id, email, headers = await login_new_user(client, auth_headers, role="Admin")
+    assert (await client.get(f"{API}/admin/users", headers=headers)).status_code == 200
+
+    # Role change
+    r = await client.patch(f"{API}/admin/users/{user_id}", headers=auth_headers, json={"role": "Accountant"})
+    assert r.status_code == 200
+    assert (await client.get(f"{API}/admin/users", headers=headers)).status_code == 403
+
+    # Password change
+    r = await client.post(f"{API}/auth/change-password", headers=headers, json={
+        "old_password": "password123", "new_password": "password456",
+    })
+    assert r.status_code == 204
+    assert principal_cache.get(email) is None
+
+    # Deactivation
+    assert (await client.get(f"{API}/auth/me", headers=headers)).status_code == 200
+    r = await client.patch(f"{API}/admin/users/{user_id}", headers=auth_headers, json={"is_active": False})
+    assert r.status_code == 200
+    assert (await client.get(f"{API}/auth/me", headers=headers)).status_code == 401
+
+    # Deletion
+    await client.patch(f"{API}/admin/users/{user_id}", headers=auth_headers, json={"is_active": True})
+    assert (await client.get(f"{API}/auth/me", headers=headers)).status_code == 200
+    assert (await client.delete(f"{API}/admin/users/{user_id}", headers=auth_headers)).status_code == 204
+    assert (await client.get(f"{API}/auth/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_change_password_ignores_stale_cached_hash(client, auth_headers):
+    from app.core.security import principal_cache
+
+    _, email, headers = await login_new_user(client, auth_headers)
+    stale = principal_cache.get(email)
+    change = {"old_password": "password123", "new_password": "password456"}
+    assert (await client.post(f"{API}/auth/change-password", headers=headers, json=change)).status_code == 204
+
+    # As on a worker that still caches the user from before the change
+    principal_cache.set(email, stale)
+    change = {"old_password": "password123", "new_password": "password789"}
+    r = await client.post(f"{API}/auth/change-password", headers=headers, json=change)
+    assert r.status_code == 403
@@ -0,0 +1,98 @@
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from jinja2 import UndefinedError
+
+from app.models.enums import CurrencyEnum, LanguageEnum
+from app.services.templates import BUILTIN_TEMPLATES_PATH, TemplateService
+
+
+def reminder_context(**overrides):
+    invoice = SimpleNamespace(
+        number="INV-2026-0042", issue_date=date(2026, 9, 1), due_date=date(2026, 9, 15),
+        total=1234.5, currency=CurrencyEnum.EUR,
+    )
+    context = dict(
+        client_name="Müller & Söhne", invoice=invoice, amount_due=1239.5,
+        dunning_level=1, dunning_fee=0.0, pay_within_days=7,
+    )
+    context.update(overrides)
+    return context
+
+
+@pytest.fixture
+def templates(tmp_path):
+    overrides = tmp_path / "templates"
+    (overrides / "en" / "email").mkdir(parents=True)
+    return TemplateService([overrides, BUILTIN_TEMPLATES_PATH], tmp_path / "cache", reload_check_seconds=0)
+
+
+def write(path, content, mtime_offset=0):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + mtime_offset))
+
+
+def test_render_email_per_language(templates):
+    en = templates.render_email("payment_reminder", LanguageEnum.en, **reminder_context(dunning_level=2, dunning_fee=5))
+    assert en.subject == "Reminder 2: invoice INV-2026-0042"
+    assert "1,234.50 EUR" in en.text and "2026-09-15" in en.text and "5.00 EUR" in en.text
+    assert "Müller &amp; Söhne" in en.html
+
+    de = templates.render_email("payment_reminder", LanguageEnum.de, **reminder_context())
+    assert de.subject == "Zahlungserinnerung: Rechnung INV-2026-0042"
+    assert "1.234,50 EUR" in de.text and "15.09.2026" in de.text
+    assert "Gebühr" not in de.text
+    assert '<html lang="de">' in de.html
+    # No German text base: falls back to the English one
+    assert de.text.endswith("-- \nAcounting")
+
+
+def test_render_email_without_html_part(templates):
+    email = templates.render_email("password_reset", reset_url="https://app/reset?token=t", valid_minutes=15)
+    assert email.subject == "Password Reset"
+    assert "https://app/reset?token=t" in email.text
+    assert email.html is None
+
+
+def test_missing_variable_fails(templates):
+    with pytest.raises(UndefinedError):
+        templates.render_email("password_reset", reset_url="https://app/reset")
+
+
+def test_override_and_hot_reload(templates, tmp_path):
+    template = tmp_path / "templates" / "en" / "email" / "password_reset.txt"
+    write(template, '{% extends "email/base.txt" %}{% block subject %}Reset v1{% endblock %}')
+    assert templates.render_email("password_reset").subject == "Reset v1"
+
+    # Unchanged file: the compiled template is reused
+    first = templates.get_template("email/password_reset.txt")
+    assert templates.get_template("email/password_reset.txt") is first
+    assert templates.reloads == 0
+
+    write(template, '{% extends "email/base.txt" %}{% block subject %}Reset v2{% endblock %}', mtime_offset=5)
+    assert templates.render_email("password_reset").subject == "Reset v2"
+    assert templates.reloads == 1
+
+
+def test_reload_check_is_throttled(templates, tmp_path):
+    templates.reload_check_seconds = 3600
+    template = tmp_path / "templates" / "en" / "email" / "password_reset.txt"
+    write(template, '{% extends "email/base.txt" %}{% block subject %}Reset v1{% endblock %}')
+    templates.render_email("password_reset")
+
+    write(template, '{% extends "email/base.txt" %}{% block subject %}Reset v2{% endblock %}', mtime_offset=5)
+    assert templates.render_email("password_reset").subject == "Reset v1"
+
+
+def test_bytecode_cache_is_shared(templates, tmp_path):
+    templates.render_email("payment_reminder", **reminder_context())
+    cached = set((tmp_path / "cache").iterdir())
+    assert cached
+
+    # A second worker loads the same bytecode instead of compiling
+    other = TemplateService(templates.search_paths, tmp_path / "cache", reload_check_seconds=0)
+    assert other.render_email("payment_reminder", **reminder_context()).text
+    assert set((tmp_path / "cache").iterdir()) == cached
@@ -0,0 +1,69 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.client import ClientCreate, ClientUpdate
+from app.utils.vat import VAT_COUNTRIES, InvalidVATID, check_vat_id, is_valid_vat_id
+
+# One well-formed ID per member state (plus Northern Ireland), some in
+# older or less common formats
+VALID_IDS = [
+    "ATU13585627", "BE0403019261", "BG175074752", "CY10259033P", "CZ25123891",
+    "DE136695976", "DE811193231", "DK13585628", "EE100931558", "EL094259216",
+    "ESA13585625", "ESX5253868R", "FI20774740", "FR40303265045", "FRK7399859412",
+    "HR33392005961", "HU12892312", "IE6433435F", "IE8Z49289F", "IT00743110157",
+    "LT119511515", "LU15027442", "LV40003521600", "MT11679112", "NL004495445B01",
+    "NL000099998B57", "PL8567346215", "PT501964843", "RO18547290", "SE123456789701",
+    "SI50223054", "SK2022749619", "XI980780684",
+]
+
+
+def test_valid_ids_cover_every_country():
+    assert {vat_id[:2] for vat_id in VALID_IDS} == VAT_COUNTRIES
+
+
+@pytest.mark.parametrize("vat_id", VALID_IDS)
+def test_valid_vat_ids(vat_id):
+    assert check_vat_id(vat_id) == vat_id
+
+
+@pytest.mark.parametrize("vat_id", VALID_IDS)
+def test_changed_check_digit_is_rejected(vat_id):
+    last = vat_id[-1]
+    swapped = str((int(last) + 1) % 10) if last.isdigit() else chr((ord(last) - 64) % 26 + 65)
+    if vat_id.startswith("NL"):
+        # The suffix is a branch number, change the check digit before the B
+        tampered = vat_id[:10] + str((int(vat_id[10]) + 1) % 10) + vat_id[11:]
+    else:
+        tampered = vat_id[:-1] + swapped
+    assert not is_valid_vat_id(tampered)
+
+
+@pytest.mark.parametrize("vat_id, message", [
+    ("DE81119323", "format"),        # too short
+    ("DE011193231", "format"),       # leading zero
+    ("ATE13585627", "format"),       # U prefix missing
+    ("XX123456789", "country code"),
+    ("", "country code"),
+    ("DE811193232", "check digit"),
+])
+def test_invalid_vat_ids(vat_id, message):
+    with pytest.raises(InvalidVATID, match=message):
+        check_vat_id(vat_id)
+
+
+def test_vat_id_normalization():
+    assert check_vat_id(" de 811.193-231") == "DE811193231"
+    # VIES knows Greece as EL
+    assert check_vat_id("GR094259216") == "EL094259216"
+
+
+def test_client_schemas_check_ust_id():
+    assert ClientCreate(name="A", ust_id="de 136 695 976").ust_id == "DE136695976"
+    # Non-EU tax numbers pass unchecked
+    assert ClientUpdate(ust_id="CHE-116.281.710").ust_id == "CHE116281710"
+    assert ClientUpdate().ust_id is None
+
+    with pytest.raises(ValidationError, match="check digit"):
+        ClientCreate(name="A", ust_id="DE136695977")
+    with pytest.raises(ValidationError):
+        ClientUpdate(ust_id="FR1234")
@@ -1,5 +1,40 @@
+import asyncio
+import json
+import random
+
+import httpx
 import pytest
-from app.services.vat_validation import validate_vat_id
+from datetime import datetime, timezone
+
+from app.db.session import async_session
+from app.services import vat_validation
+from app.services.vat_validation import (
+    VATValidationResult,
+    VIESClient,
+    normalize_vat_id,
+    validate_vat_id,
+    validate_vat_id_cached,
+)
+from app.utils.vat import is_valid_vat_id
+from tests.vies_stub import create_app
+
+
+def de_vat_id(last_digit: str) -> str:
+    """A random DE VAT ID with a valid check digit, ending in `last_digit` (the stub keys on it)."""
+    while True:
+        vat_id = f"DE{random.randint(10_000_000, 99_999_999)}{last_digit}"
+        if is_valid_vat_id(vat_id):
+            return vat_id
+
+
+@pytest.fixture
+async def vies_stub():
+    stub = create_app()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)) as http_client:
+        vies = VIESClient(service_url="http://vies-stub/checkVatService", http_client=http_client)
+        yield vies, stub
+        await vies.aclose()
+
 
 @pytest.mark.anyio
 async def test_validate_vat_id_real():
@@ -10,3 +45,142 @@ async def test_validate_vat_id_real():
     assert result.valid is True
     assert "SAP" in result.name.upper()
     assert result.address != ""
+
+
+def test_normalize_vat_id():
+    assert normalize_vat_id("de 811.193-231") == "DE811193231"
+
+
+@pytest.mark.anyio
+async def test_validate_vat_id_cached(monkeypatch):
+    calls = []
+
+    async def fake_vies(vat_id):
+        calls.append(vat_id)
+        if vat_id.endswith("0"):
+            return VATValidationResult(False, "", "", datetime.now(timezone.utc), error="MS_UNAVAILABLE")
+        return VATValidationResult(vat_id.endswith("1"), "Test GmbH", "Berlin", datetime.now(timezone.utc))
+
+    monkeypatch.setattr(vat_validation, "validate_vat_id", fake_vies)
+    valid, invalid, unavailable = de_vat_id("1"), de_vat_id("2"), de_vat_id("0")
+
+    async with async_session() as db:
+        # Valid: second lookup (differently formatted) comes from the cache
+        first = await validate_vat_id_cached(db, valid)
+        second = await validate_vat_id_cached(db, f"de {valid[2:5]} {valid[5:]}")
+        assert first.valid and not first.cached
+        assert second.valid and second.cached and second.name == "Test GmbH"
+
+        # Invalid IDs are cached too
+        await validate_vat_id_cached(db, invalid)
+        assert (await validate_vat_id_cached(db, invalid)).cached
+
+        # Service errors are not
+        assert (await validate_vat_id_cached(db, unavailable)).error
+        assert not (await validate_vat_id_cached(db, unavailable)).cached
+
+        # force bypasses the cache
+        assert not (await validate_vat_id_cached(db, valid, force=True)).cached
+
+        # Malformed IDs are answered offline
+        assert not (await validate_vat_id_cached(db, "DE123")).valid
+
+    assert calls == [valid, invalid, unavailable, unavailable, valid]
+
+
+@pytest.mark.anyio
+async def test_vies_client_against_stub(vies_stub):
+    vies, stub = vies_stub
+
+    result = await vies.check_vat("DE123456781")
+    assert result.valid and result.error is None
+    assert result.name == "STUB COMPANY 123456781"
+    soap_client = vies._client
+
+    result = await vies.check_vat("DE123456782")
+    assert not result.valid and result.error is None
+    # WSDL parsed once, client reused
+    assert vies._client is soap_client
+
+    # Temporary faults are retried, permanent ones are not
+    result = await vies.check_vat("DE123456780", retries=3, delay=0)
+    assert result.error and "MS_UNAVAILABLE" in result.error
+    result = await vies.check_vat("DEABC", retries=3, delay=0)
+    assert result.error and "INVALID_INPUT" in result.error
+
+    assert stub.state.calls == ["DE123456781", "DE123456782"] + ["DE123456780"] * 3 + ["DEABC"]
+
+
+@pytest.mark.anyio
+async def test_malformed_vat_id_skips_vies(vies_stub, monkeypatch):
+    vies, stub = vies_stub
+    monkeypatch.setattr(vat_validation, "vies_client", vies)
+
+    result = await validate_vat_id("DE811193232")
+    assert not result.valid and result.error is None
+    assert (await validate_vat_id(de_vat_id("1"))).valid
+    assert len(stub.state.calls) == 1
+
+
+@pytest.mark.anyio
+async def test_vies_circuit_breaker(vies_stub, monkeypatch):
+    monkeypatch.setattr(vat_validation.settings, "VIES_BREAKER_THRESHOLD", 2)
+    vies, stub = vies_stub
+
+    # Two failed attempts open the breaker for DE, the third is not sent
+    result = await vies.check_vat("DE123456780", retries=3, delay=0)
+    assert "paused" in result.error
+    assert len(stub.state.calls) == 2
+    assert (await vies.check_vat("DE123456781")).error
+    assert vies.stats()["breakers"]["DE"]["state"] == "open"
+
+    # Other member states are unaffected
+    assert (await vies.check_vat("AT123456781")).valid
+    assert len(stub.state.calls) == 3
+
+
+@pytest.mark.anyio
+async def test_vies_circuit_breaker_stops_queued_calls(vies_stub, monkeypatch):
+    monkeypatch.setattr(vat_validation.settings, "VIES_BREAKER_THRESHOLD", 3)
+    monkeypatch.setattr(vat_validation.settings, "VIES_COUNTRY_CONCURRENCY", 1)
+    vies, stub = vies_stub
+
+    # Like a batch run: all IDs of a failing member state queue up at once
+    results = await asyncio.gather(*(vies.check_vat(f"DE1234567{i:02}0", delay=0) for i in range(50)))
+
+    assert all(result.error for result in results)
+    assert len(stub.state.calls) <= 3
+    assert vies.stats()["breakers"]["DE"]["state"] == "open"
+
+
+@pytest.mark.anyio
+async def test_batch_validate_clients(client, auth_headers, vies_stub, monkeypatch):
+    vies, _ = vies_stub
+    monkeypatch.setattr(vat_validation, "vies_client", vies)
+    monkeypatch.setattr(vat_validation.settings, "VIES_RETRY_DELAY_SECONDS", 0)
+
+    client_ids = []
+    for suffix in "120":
+        r = await client.post(
+            "/api/v1/clients/",
+            json={"name": f"VAT {suffix}", "type": "Client", "ust_id": de_vat_id(suffix)},
+            headers=auth_headers,
+        )
+        client_ids.append(r.json()["id"])
+
+    r = await client.post(
+        "/api/v1/clients/validate-vat", json={"client_ids": client_ids, "force": True}, headers=auth_headers
+    )
+    assert r.status_code == 202
+    job_id = r.json()["id"]
+
+    r = await client.get(f"/api/v1/clients/validate-vat/jobs/{job_id}?follow=true", headers=auth_headers)
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    job = json.loads(r.text.splitlines()[-1])
+    assert job["status"] == "done"
+    assert (job["valid"], job["invalid"], job["failed"]) == (1, 1, 1)
+    assert [e["client_id"] for e in job["errors"]] == [client_ids[2]]
+
+    r = await client.get(f"/api/v1/clients/{client_ids[0]}", headers=auth_headers)
+    assert r.json()["ust_id_validated"] is True
+    assert r.json()["ust_id_checked_at"] is not None
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.watchdog import LoopWatchdog
+
+
+@pytest.fixture
+async def watchdog():
+    watchdog = LoopWatchdog(threshold=0.03, interval=0.01)
+    watchdog.start()
+    yield watchdog
+    watchdog.stop()
+
+
+def hold_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+async def settle():
+    # The block is reported by the watchdog thread once the loop is back
+    await asyncio.sleep(0.1)
+
+
+@pytest.mark.anyio
+async def test_no_blocks_on_a_responsive_loop(watchdog):
+    for _ in range(30):
+        await asyncio.sleep(0.005)
+    assert watchdog.blocks == 0
+
+
+@pytest.mark.anyio
+async def test_blocking_background_task(watchdog, caplog):
+    async def drain():
+        hold_the_loop(0.2)
+
+    await asyncio.create_task(drain(), name="mail-queue")
+    await asyncio.create_task(drain())
+    await settle()
+
+    assert watchdog.blocks == 2
+    # Labeled by coroutine, so unnamed tasks ("Task-<n>") don't add series
+    where = "task test_blocking_background_task.<locals>.drain"
+    count, seconds = watchdog.totals()[where]
+    assert count == 2 and 0.2 < seconds < 1
+    assert watchdog.recent[0]["where"] == f"{where} (mail-queue)"
+    assert "hold_the_loop" in watchdog.recent[-1]["stack"][-1]
+
+    # Full stack once, then a short line for the same stack
+    full, repeat = (r for r in caplog.records if r.name == "app.core.watchdog" and r.levelname == "WARNING")
+    assert "hold_the_loop" in full.getMessage()
+    assert "same stack" in repeat.getMessage()
+
+
+@pytest.mark.anyio
+async def test_blocking_request_is_labeled_with_route(watchdog):
+    app = FastAPI()
+
+    @app.get("/reports/{report_id}")
+    async def report(report_id: int):
+        hold_the_loop(0.2)
+        return {"id": report_id}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/reports/7")
+    await settle()
+
+    assert response.status_code == 200
+    assert list(watchdog.totals()) == ["GET /reports/{report_id}"]
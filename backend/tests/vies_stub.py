@@ -0,0 +1,88 @@
+"""
+Stub of the VIES checkVat SOAP service, for tests and latency benchmarks.
+
+Answers from the VAT number alone:
+
+    ...0        MS_UNAVAILABLE fault (retried by the client)
+    ...2        not valid
+    non-digits  INVALID_INPUT fault
+    otherwise   valid, name "STUB COMPANY <number>"
+
+Run standalone and point the app at it:
+
+    VIES_STUB_LATENCY_MS=80 uvicorn tests.vies_stub:app --port 8089
+    VIES_SERVICE_URL=http://127.0.0.1:8089/checkVatService
+"""
+import asyncio
+import os
+import re
+from datetime import date
+from xml.sax.saxutils import escape
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.services.vat_validation import VIES_WSDL_PATH
+
+ENVELOPE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+    "<soap:Body>{}</soap:Body></soap:Envelope>"
+)
+RESPONSE = (
+    '<checkVatResponse xmlns="urn:ec.europa.eu:taxud:vies:services:checkVat:types">'
+    "<countryCode>{country}</countryCode><vatNumber>{number}</vatNumber>"
+    "<requestDate>{today}</requestDate><valid>{valid}</valid>"
+    "<name>{name}</name><address>{address}</address></checkVatResponse>"
+)
+FAULT = "<soap:Fault><faultcode>soap:Server</faultcode><faultstring>{}</faultstring></soap:Fault>"
+
+
+def _field(body: str, name: str) -> str:
+    match = re.search(rf"<(?:\w+:)?{name}>([^<]*)</(?:\w+:)?{name}>", body)
+    return match.group(1) if match else ""
+
+
+def create_app(latency: float = 0.0) -> Starlette:
+    async def wsdl(request: Request) -> Response:
+        return Response(VIES_WSDL_PATH.read_bytes(), media_type="text/xml")
+
+    async def check_vat(request: Request) -> Response:
+        body = (await request.body()).decode()
+        country, number = _field(body, "countryCode"), _field(body, "vatNumber")
+        request.app.state.calls.append(country + number)
+        if latency:
+            await asyncio.sleep(latency)
+
+        if not number.isdigit():
+            fault, status = "INVALID_INPUT", 500
+        elif number.endswith("0"):
+            fault, status = "MS_UNAVAILABLE", 500
+        else:
+            fault, status = None, 200
+
+        if fault:
+            content = ENVELOPE.format(FAULT.format(fault))
+        else:
+            valid = not number.endswith("2")
+            content = ENVELOPE.format(RESPONSE.format(
+                country=escape(country),
+                number=escape(number),
+                today=date.today().isoformat(),
+                valid="true" if valid else "false",
+                name=f"STUB COMPANY {number}" if valid else "---",
+                address="Teststrasse 1\n10115 Berlin" if valid else "---",
+            ))
+        return Response(content, status_code=status, media_type="text/xml")
+
+    stub = Starlette(routes=[
+        Route("/checkVatService.wsdl", wsdl),
+        Route("/checkVatService", check_vat, methods=["POST"]),
+    ])
+    # VAT IDs asked for, in order
+    stub.state.calls = []
+    return stub
+
+
+app = create_app(float(os.environ.get("VIES_STUB_LATENCY_MS", "0")) / 1000)